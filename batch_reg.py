@@ -0,0 +1,176 @@
+import glob
+import logging
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from reg_metrics import add_metrics_arguments, metrics_from_args
+from gen_all_reg import add_backend_arguments, backend_options
+
+# 配置日志记录
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+SPEC_SUFFIXES = (".md", ".xml", ".json")
+
+def collect_specs(patterns):
+    """
+    展开目录和通配符，收集所有寄存器描述文件（.md/.xml/.json）。
+
+    Args:
+        patterns (list): 目录、文件路径或通配符模式列表。目录会被递归搜索。
+
+    Returns:
+        list: 去重并排序后的规格文件绝对路径列表。
+    """
+    specs = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths = glob.glob(os.path.join(pattern, "**", "*"), recursive=True)
+        else:
+            paths = glob.glob(pattern, recursive=True)
+        for path in paths:
+            if os.path.isfile(path) and path.endswith(SPEC_SUFFIXES):
+                specs.add(os.path.abspath(path))
+    return sorted(specs)
+
+def output_dirs_for(specs, output_root):
+    """
+    为每个规格文件分配确定的输出目录：<output_root>/<相对于公共父目录的路径，去掉后缀>。
+
+    Args:
+        specs (list): 规格文件绝对路径列表。
+        output_root (str): 输出根目录。
+
+    Returns:
+        dict: 规格文件路径到输出目录的映射。
+    """
+    if not specs:
+        return {}
+    common = os.path.commonpath([os.path.dirname(spec) for spec in specs])
+    return {
+        spec: os.path.join(output_root, os.path.splitext(os.path.relpath(spec, common))[0])
+        for spec in specs
+    }
+
+def process_spec(spec_file, output_dir, options):
+    """
+    在工作进程中处理单个规格文件：解析并生成全部输出文件。.xml 文件与 gen_all_reg 相同，由 ipxact_reg 导入后生成。
+
+    Args:
+        spec_file (str): 规格文件路径。
+        output_dir (str): 该文件的输出目录。
+        options (dict): 生成选项（start_address、address_step、apb_data_width、base_address、backends、cache_file，
+            以及 gen_all_reg.BACKEND_OPTIONS 中的各后端选项，例如 decode、bus、read_pipeline、template_dir）。
+
+    Returns:
+        list: 写出的文件路径列表。
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    cache = None
+    if options.get("cache_file"):
+        from reg_cache import RegisterModelCache
+        cache = RegisterModelCache(options["cache_file"])
+
+    try:
+        from gen_all_reg import BACKEND_OPTIONS, load_register_data, generate_all
+        data = load_register_data(spec_file, options["start_address"], options["address_step"], cache)
+        outputs = generate_all(data, backends=options.get("backends"), output_dir=output_dir,
+                               apb_data_width=options["apb_data_width"], base_address=options["base_address"], jobs=1,
+                               **{name: options[name] for name in BACKEND_OPTIONS if name in options})
+        return list(outputs.values())
+    finally:
+        if cache is not None:
+            cache.close()
+
+def _run_one(spec_file, output_dir, options):
+    """工作进程入口：捕获异常并以 (是否成功, 输出文件或错误信息) 的形式返回结果。"""
+    try:
+        return True, process_spec(spec_file, output_dir, options)
+    except Exception as e:
+        return False, f"{type(e).__name__}: {e}"
+
+def _init_worker(log_level):
+    logging.getLogger().setLevel(log_level)
+
+def run_batch(specs, output_root, options, jobs=None, log_level=logging.WARNING):
+    """
+    使用进程池并行处理多个规格文件。
+
+    Args:
+        specs (list): 规格文件路径列表。
+        output_root (str): 输出根目录。
+        options (dict): 生成选项，见 process_spec。
+        jobs (int, optional): 工作进程数。如果为 None，则使用 CPU 核数。
+        log_level (int): 工作进程的日志级别，默认为 WARNING。
+
+    Returns:
+        list: 与 specs 顺序一致的 (规格文件, 输出目录, 是否成功, 输出文件列表或错误信息) 列表。
+    """
+    output_dirs = output_dirs_for(specs, output_root)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(log_level,)) as executor:
+        futures = [executor.submit(_run_one, spec, output_dirs[spec], options) for spec in specs]
+        return [(spec, output_dirs[spec], *future.result()) for spec, future in zip(specs, futures)]
+
+def print_summary(results):
+    """打印每个文件的处理结果和汇总信息，返回失败的文件数。"""
+    failed = 0
+    for spec, output_dir, ok, detail in results:
+        if ok:
+            print(f"[ OK ] {spec} -> {output_dir} ({len(detail)} 个文件)")
+        else:
+            failed += 1
+            print(f"[FAIL] {spec}: {detail}")
+    print(f"共 {len(results)} 个文件，成功 {len(results) - failed} 个，失败 {failed} 个")
+    return failed
+
+def main():
+    # 创建命令行参数解析器
+    parser = argparse.ArgumentParser(description="并行批量处理目录或通配符匹配的寄存器描述文件（.md/.xml/.json）。")
+    parser.add_argument("inputs", nargs="+", help="目录、文件或通配符（例如 'specs/**/*.md'），目录会被递归搜索")
+    parser.add_argument("--output_dir", help="输出根目录，每个文件输出到其下与输入相对路径对应的子目录，默认为 batch_output", default="batch_output")
+    parser.add_argument("--jobs", type=int, help="工作进程数，默认为 CPU 核数", default=None)
+    parser.add_argument("--backends", nargs="+", choices=["cheader", "ral", "rtl", "ctest", "host"], help="Markdown/JSON 输入需要生成的后端，默认为全部", default=None)
+    parser.add_argument("--start_address", type=lambda x: int(x, 0), help="起始地址，默认为 0", default=0)
+    parser.add_argument("--address_step", type=int, help="地址步进，默认为 4", default=4)
+    parser.add_argument("--apb_data_width", type=int, help="APB 数据宽度，默认为 32", default=32)
+    parser.add_argument("--base_address", help="寄存器基地址，默认为 0x10000000", default="0x10000000")
+    add_backend_arguments(parser)
+    parser.add_argument("--cache_file", help="寄存器模型缓存文件的路径。如果省略，则不使用缓存。", default=None)
+    parser.add_argument("--verbose", action="store_true", help="输出工作进程的 INFO 日志")
+    add_metrics_arguments(parser)
+
+    # 解析命令行参数
+    args = parser.parse_args()
+    metrics = metrics_from_args("batch_reg", args)
+
+    with metrics.phase("collect"):
+        specs = collect_specs(args.inputs)
+    if not specs:
+        logging.error(f"错误：未找到任何寄存器描述文件：{' '.join(args.inputs)}")
+        return 1
+
+    options = {
+        "start_address": args.start_address,
+        "address_step": args.address_step,
+        "apb_data_width": args.apb_data_width,
+        "base_address": args.base_address,
+        "backends": args.backends,
+        "cache_file": args.cache_file,
+        **backend_options(args),
+    }
+    log_level = logging.INFO if args.verbose else logging.WARNING
+
+    logging.info(f"开始批量处理 {len(specs)} 个文件")
+    # 各文件在工作进程中处理，process 阶段为整个进程池的耗时，CPU 时间和内存只包含主进程
+    with metrics.phase("process"):
+        results = run_batch(specs, args.output_dir, options, args.jobs, log_level)
+    failed = print_summary(results)
+    metrics.count("specs", len(specs))
+    metrics.count("failed", failed)
+    metrics.count("files_written", sum(len(detail) for _, _, ok, detail in results if ok))
+    metrics.finish()
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
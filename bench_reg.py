@@ -0,0 +1,268 @@
+import gc
+import json
+import logging
+import argparse
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from synth_spec import synthetic_registers, write_specs
+
+# 配置日志记录
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+BENCH_FORMAT_VERSION = 1
+DEFAULT_SIZES = (100, 1000, 10000)
+# 与基线相比，耗时或峰值内存超过该倍数视为性能回退
+DEFAULT_TOLERANCE = 1.5
+
+# 被测阶段，名称与被调用的函数相同
+STAGES = (
+    "markdown_to_json", "parse_xml", "generate_verilog", "generate_ral_model",
+    "generate_cheader", "generate_ctest_code", "generate_struct_code", "generate_test_code",
+)
+
+def prepare_inputs(num_registers, num_fields, sparsity, seed, work_dir):
+    """
+    生成一组合成规格文件，并预先构建各后端所需的输入，使计时只覆盖被测阶段本身。
+
+    Args:
+        num_registers (int): 寄存器数量。
+        num_fields (int): 每个寄存器的字段数量。
+        sparsity (float): 地址稀疏度。
+        seed (int): 随机数种子。
+        work_dir (str): 存放规格文件和输出文件的目录。
+
+    Returns:
+        dict: 规格文件路径及预先构建的寄存器模型。
+    """
+    from reg_model import RegisterMap
+    from xml_to_struct_and_test import parse_xml
+
+    data = synthetic_registers(num_registers, num_fields, sparsity, seed)
+    paths = write_specs(data, os.path.join(work_dir, f"synth_{num_registers}x{num_fields}"))
+    xml_registers, xml_module_name = parse_xml(paths["xml"])
+    return {
+        "paths": paths,
+        "json_out": os.path.join(work_dir, "bench_output.json"),
+        "registers": RegisterMap.from_dict(data),
+        "xml_registers": xml_registers,
+        "xml_module_name": xml_module_name,
+    }
+
+def stage_functions(inputs):
+    """
+    返回各被测阶段的无参调用。后端阶段直接调用 generate_* 函数，与各脚本的实际调用相同。
+
+    Args:
+        inputs (dict): prepare_inputs 的返回值。
+
+    Returns:
+        dict: 阶段名称到无参函数的映射。
+    """
+    from md2json_reg import markdown_to_json
+    from xml_to_struct_and_test import parse_xml, generate_struct_code, generate_test_code
+    from json2rtl_reg import generate_verilog
+    from json2ral_reg import generate_ral_model
+    from json2cheader_reg import generate_cheader
+    from json2ctest_reg import generate_ctest_code
+
+    registers = inputs["registers"]
+    module_name = registers.module_name
+    xml_registers = inputs["xml_registers"]
+    xml_module_name = inputs["xml_module_name"]
+    return {
+        "markdown_to_json": lambda: markdown_to_json(inputs["paths"]["md"], inputs["json_out"]),
+        "parse_xml": lambda: parse_xml(inputs["paths"]["xml"]),
+        "generate_verilog": lambda: generate_verilog(module_name, registers, 32),
+        "generate_ral_model": lambda: generate_ral_model(module_name, registers),
+        "generate_cheader": lambda: generate_cheader(module_name, registers),
+        "generate_ctest_code": lambda: generate_ctest_code(module_name, registers, "0x10000000"),
+        "generate_struct_code": lambda: generate_struct_code(xml_registers, xml_module_name),
+        "generate_test_code": lambda: generate_test_code(xml_registers, xml_module_name, "0x10000000"),
+    }
+
+def measure(func, repeat=3):
+    """
+    测量单个阶段：多次运行取最短的墙钟时间和对应的 CPU 时间，再单独运行一次用 tracemalloc 记录峰值内存。
+
+    Args:
+        func (callable): 被测的无参函数。
+        repeat (int): 计时运行次数，默认为 3。
+
+    Returns:
+        dict: seconds、cpu_seconds、peak_bytes 和 output_chars（返回值为字符串时的长度）。
+    """
+    # 被测函数自身的 INFO 日志会影响计时，测量期间屏蔽
+    logging.disable(logging.INFO)
+    try:
+        return _measure(func, repeat)
+    finally:
+        logging.disable(logging.NOTSET)
+
+def _measure(func, repeat):
+    best = None
+    result = None
+    for _ in range(max(repeat, 1)):
+        gc.collect()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        result = func()
+        wall = time.perf_counter() - wall
+        cpu = time.process_time() - cpu
+        if best is None or wall < best[0]:
+            best = (wall, cpu)
+        del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": best[0],
+        "cpu_seconds": best[1],
+        "peak_bytes": peak,
+        "output_chars": len(result) if isinstance(result, str) else None,
+    }
+
+def scaling_exponent(points):
+    """
+    用最小二乘法拟合 log(耗时) 与 log(寄存器数) 的斜率，1 表示线性增长，2 表示平方增长。
+
+    Args:
+        points (list): (寄存器数, 耗时) 列表。
+
+    Returns:
+        float | None: 斜率。点数少于 2 时返回 None。
+    """
+    points = [(math.log(n), math.log(max(t, 1e-9))) for n, t in points if n > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if var == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+
+def run_benchmarks(sizes=DEFAULT_SIZES, num_fields=8, sparsity=0.0, seed=0, repeat=3, stages=STAGES):
+    """
+    在不同规模的合成规格上运行各阶段并记录耗时和峰值内存。
+
+    Args:
+        sizes (iterable): 寄存器数量列表。
+        num_fields (int): 每个寄存器的字段数量，默认为 8。
+        sparsity (float): 地址稀疏度，默认为 0。
+        seed (int): 随机数种子，默认为 0。
+        repeat (int): 每个阶段的计时运行次数，默认为 3。
+        stages (iterable): 需要运行的阶段，默认为全部。
+
+    Returns:
+        dict: 可写为 JSON 的基准测试结果。
+    """
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench_reg_") as work_dir:
+        for size in sizes:
+            inputs = prepare_inputs(size, num_fields, sparsity, seed, work_dir)
+            functions = stage_functions(inputs)
+            for stage in stages:
+                metrics = measure(functions[stage], repeat)
+                results.append({"stage": stage, "registers": size, "fields": num_fields, "sparsity": sparsity, **metrics})
+                logging.info(f"{stage:<22} N={size:<8} {metrics['seconds']:.4f} 秒  峰值内存 {metrics['peak_bytes'] / 2**20:.1f} MB")
+
+    scaling = {}
+    for stage in stages:
+        scaling[stage] = scaling_exponent([(r["registers"], r["seconds"]) for r in results if r["stage"] == stage])
+
+    return {
+        "version": BENCH_FORMAT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "parameters": {"sizes": list(sizes), "fields": num_fields, "sparsity": sparsity, "seed": seed, "repeat": repeat},
+        "results": results,
+        "scaling": scaling,
+    }
+
+def compare_with_baseline(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    将本次结果与基线逐项比较（阶段、寄存器数、字段数和稀疏度都相同的项）。
+
+    Args:
+        report (dict): run_benchmarks 的返回值。
+        baseline (dict): 之前保存的基准测试结果。
+        tolerance (float): 耗时或峰值内存超过基线该倍数时视为回退，默认为 1.5。
+
+    Returns:
+        list: (阶段, 寄存器数, 指标, 基线值, 本次值, 比值) 回退项列表。
+    """
+    def key(result):
+        return result["stage"], result["registers"], result["fields"], result["sparsity"]
+
+    previous = {key(result): result for result in baseline.get("results", [])}
+    regressions = []
+    for result in report["results"]:
+        old = previous.get(key(result))
+        if old is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if old[metric] and result[metric] / old[metric] > tolerance:
+                regressions.append((result["stage"], result["registers"], metric, old[metric], result[metric], result[metric] / old[metric]))
+    return regressions
+
+def print_report(report):
+    """按阶段打印各规模的耗时和拟合的增长指数。"""
+    sizes = report["parameters"]["sizes"]
+    print(f"{'阶段':<22}" + "".join(f"{f'N={size}':>14}" for size in sizes) + f"{'增长指数':>10}")
+    for stage, exponent in report["scaling"].items():
+        seconds = {r["registers"]: r["seconds"] for r in report["results"] if r["stage"] == stage}
+        row = "".join(f"{seconds[size]:>13.4f}s" if size in seconds else f"{'-':>14}" for size in sizes)
+        print(f"{stage:<22}{row}{'-' if exponent is None else f'{exponent:.2f}':>10}")
+
+def main():
+    # 创建命令行参数解析器
+    parser = argparse.ArgumentParser(description="在合成寄存器规格上测量各阶段的耗时和峰值内存，并可与基线比较。")
+    parser.add_argument("--sizes", nargs="+", type=int, help="寄存器数量列表，默认为 100 1000 10000", default=list(DEFAULT_SIZES))
+    parser.add_argument("--fields", type=int, help="每个寄存器的字段数量，默认为 8", default=8)
+    parser.add_argument("--sparsity", type=float, help="地址稀疏度，默认为 0", default=0.0)
+    parser.add_argument("--seed", type=int, help="随机数种子，默认为 0", default=0)
+    parser.add_argument("--repeat", type=int, help="每个阶段的计时运行次数，默认为 3", default=3)
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), help="需要运行的阶段，默认为全部", default=list(STAGES))
+    parser.add_argument("--output", help="结果 JSON 文件的路径。如果省略，则不保存。", default=None)
+    parser.add_argument("--baseline", help="基线结果 JSON 文件的路径。如果提供，则报告超过容差的回退项。", default=None)
+    parser.add_argument("--tolerance", type=float, help=f"相对基线的容差倍数，默认为 {DEFAULT_TOLERANCE}", default=DEFAULT_TOLERANCE)
+
+    # 解析命令行参数
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.sizes, args.fields, args.sparsity, args.seed, args.repeat, args.stages)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+        logging.info(f"基准测试结果已写入 '{args.output}'")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(report, baseline, args.tolerance)
+        for stage, size, metric, old, new, ratio in regressions:
+            print(f"[回退] {stage} N={size} {metric}: {old:.4g} -> {new:.4g}（{ratio:.2f} 倍）")
+        if regressions:
+            return 1
+        logging.info(f"与基线 '{args.baseline}' 相比没有超过 {args.tolerance} 倍的回退")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+import json
+import logging
+import argparse
+import importlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from reg_model import RegisterMap
+from reg_emit import emit_to_file, emit_if_changed
+from reg_metrics import NULL_METRICS, add_metrics_arguments, metrics_from_args
+
+# 配置日志记录
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# 后端名称 -> (模块名, 流式生成函数名, 默认输出文件名)
+# 后端模块在首次使用时才导入，未选择的后端不产生任何导入开销
+BACKENDS = {
+    "cheader": ("json2cheader_reg", "iter_cheader", "{module_name}.h"),
+    "ral": ("json2ral_reg", "iter_ral", "ral_{module_name}.sv"),
+    "rtl": ("json2rtl_reg", "iter_verilog", "{module_name}.v"),
+    "ctest": ("json2ctest_reg", "iter_ctest_code", "{module_name}_test.c"),
+    "host": ("json2ctest_reg", "iter_host_shim", "{module_name}_host.h"),
+}
+
+# 各后端的生成选项（generate_all 的关键字参数），由 add_backend_arguments 添加到命令行
+BACKEND_OPTIONS = ("decode", "read_pipeline", "wait_states", "bus", "skid_buffer", "ctest_style", "ral_hdl_path", "emit_jobs", "template_dir")
+
+def load_register_data(input_file, start_address=0, address_step=4, cache=None, metrics=NULL_METRICS):
+    """
+    读取寄存器描述文件。Markdown 文件在内存中直接解析，IP-XACT 文件由 ipxact_reg 转换，
+    二进制中间文件（.regb）由 reg_binary 读取，其他文件按 JSON 读取。
+
+    Args:
+        input_file (str): Markdown、IP-XACT、二进制中间文件或 JSON 文件的路径。
+        start_address (int): Markdown 解析的起始地址，默认为 0。
+        address_step (int): Markdown 解析的地址步进，默认为 4。
+        cache (RegisterModelCache, optional): 寄存器模型缓存。命中时直接使用缓存的模型，不再解析 Markdown 或 IP-XACT。
+        metrics (Metrics): 指标记录器，默认不记录。
+
+    Returns:
+        dict | RegisterMap: 包含 MODULE_NAME 和 REGISTERS 的寄存器数据；二进制中间文件直接返回 RegisterMap。
+    """
+    if input_file.endswith(".regb"):
+        from reg_binary import load_binary_register_map
+        return load_binary_register_map(input_file, metrics)
+
+    if input_file.endswith(".md"):
+        from md2json_reg import parse_markdown
+        # Markdown 逐行读取和解析同时进行，因此只有一个 parse 阶段
+        with metrics.phase("parse"):
+            if cache is not None:
+                return cache.load(input_file, parse_markdown, start_address=start_address, address_step=address_step)
+            return parse_markdown(input_file, start_address, address_step)
+
+    if input_file.endswith(".xml"):
+        from ipxact_reg import import_ipxact
+        if cache is not None:
+            with metrics.phase("parse"):
+                return cache.load(input_file, import_ipxact)
+        return import_ipxact(input_file, metrics=metrics)
+
+    with metrics.phase("read"):
+        with open(input_file, 'r', encoding='utf-8') as f:
+            text = f.read()
+    with metrics.phase("parse"):
+        return json.loads(text)
+
+def iter_backend(backend, registers, apb_data_width=32, base_address="0x10000000", decode="auto", ctest_style="unrolled",
+                 ral_hdl_path=None, read_pipeline="auto", wait_states=0, bus="apb", skid_buffer=False, emit_jobs=1, template_dir=None,
+                 include_files=None):
+    """
+    使用指定后端逐段生成代码。
+
+    Args:
+        backend (str): 后端名称，取值见 BACKENDS。
+        registers (RegisterMap): 寄存器集合。
+        apb_data_width (int): APB 数据宽度，rtl 后端和带后门路径的 ral 后端使用。
+        base_address (str): 寄存器基地址，ctest 和 host 后端使用。
+        decode (str): 地址译码方式，rtl 后端和带后门路径的 ral 后端使用。
+        ctest_style (str): 测试代码风格（unrolled 或 table），仅 ctest 后端使用。
+        ral_hdl_path (str, optional): RTL 模块实例的层次路径，仅 ral 后端使用。如果提供，则生成后门访问路径。
+        read_pipeline (str): RTL 读数据流水方式，仅 rtl 后端使用。
+        wait_states (int): RTL 每次传输额外插入的等待周期数，仅 rtl 后端使用。
+        bus (str): RTL 总线接口（apb 或 axi4lite），仅 rtl 后端使用。
+        skid_buffer (bool): RTL AXI4-Lite 接口是否插入 skid buffer，仅 rtl 后端使用。
+        emit_jobs (int): 按寄存器并行生成的进程数，rtl 和 ral 后端使用，输出与串行相同。
+        template_dir (str, optional): 用户模板目录，其中的同名模板优先于内置模板，cheader、ctest、rtl 和 ral 后端使用。
+        include_files (dict, optional): cheader 和 host 后端的输出文件路径，ctest 后端按文件名包含，默认为各自的默认文件名。
+
+    Returns:
+        iterator: 代码片段生成器。
+    """
+    module_file, func_name, _ = BACKENDS[backend]
+    generate = getattr(importlib.import_module(module_file), func_name)
+    module_name = registers.module_name
+
+    if backend == "rtl":
+        return generate(module_name, registers, apb_data_width, decode, read_pipeline, wait_states, bus, skid_buffer, emit_jobs, template_dir)
+    if backend == "ctest":
+        include_files = include_files or {}
+        return generate(module_name, registers, base_address, ctest_style, template_dir, include_files.get("cheader"), include_files.get("host"))
+    if backend == "host":
+        return generate(module_name, registers, base_address)
+    if backend == "ral":
+        return generate(module_name, registers, ral_hdl_path, apb_data_width, decode, emit_jobs, template_dir)
+    return generate(module_name, registers, template_dir)
+
+def generate_all(data, output_files=None, backends=None, output_dir=".", apb_data_width=32, base_address="0x10000000", jobs=None, decode="auto", metrics=NULL_METRICS, only_changed=False,
+                 ctest_style="unrolled", ral_hdl_path=None, read_pipeline="auto", wait_states=0, bus="apb", skid_buffer=False,
+                 emit_jobs=1, template_dir=None):
+    """
+    使用同一份内存中的寄存器模型驱动所有后端，并发地边生成边写入输出文件。
+
+    Args:
+        data (dict | RegisterMap): 寄存器数据或已构建的寄存器集合。
+        output_files (dict, optional): 后端名称到输出文件路径的映射，未指定的后端使用默认文件名。
+        backends (list, optional): 需要生成的后端名称列表。如果为 None，则生成全部后端。
+        output_dir (str): 默认文件名所在的输出目录，默认为当前目录。
+        apb_data_width (int): APB 数据宽度，默认为 32。
+        base_address (str): 寄存器基地址，默认为 "0x10000000"。
+        jobs (int, optional): 并发线程数。如果为 None，则每个后端一个线程。
+        decode (str): RTL 地址译码方式，默认为 auto。
+        metrics (Metrics): 指标记录器，默认不记录。各后端分别记录 emit:<后端> 和 write:<后端> 阶段。
+        only_changed (bool): 是否只重写内容发生变化的输出文件，默认为 False。
+        ctest_style (str): 测试代码风格，unrolled 逐个寄存器展开，table 生成描述符表和测试循环，默认为 unrolled。
+        ral_hdl_path (str, optional): RTL 模块实例的层次路径。如果提供，则 RAL 生成与 RTL 一致的后门访问路径。
+        read_pipeline (str): RTL 读数据流水方式，默认为 auto 根据寄存器数量自动选择。
+        wait_states (int): RTL 每次传输额外插入的等待周期数，默认为 0。
+        bus (str): RTL 总线接口，apb 或 axi4lite，默认为 apb。
+        skid_buffer (bool): RTL AXI4-Lite 接口是否插入 skid buffer，默认为 False。
+        emit_jobs (int): RTL 和 RAL 后端按寄存器并行生成的进程数，输出与串行相同，默认为 1（串行），0 表示使用 CPU 核数。
+        template_dir (str, optional): 用户模板目录，其中的同名模板优先于内置模板，默认为只使用内置模板。
+
+    Returns:
+        dict: 后端名称到已写入文件路径的映射。
+    """
+    output_files = output_files or {}
+    backends = list(BACKENDS) if backends is None else backends
+
+    # 寄存器模型只构建一次，所有后端共享
+    with metrics.phase("model"):
+        registers = data if isinstance(data, RegisterMap) else RegisterMap.from_dict(data)
+    metrics.count_registers(registers)
+    module_name = registers.module_name
+
+    def output_path(backend):
+        return output_files.get(backend) or os.path.join(output_dir, BACKENDS[backend][2].format(module_name=module_name))
+
+    # 测试 C 代码按实际的文件名包含 C 头文件和主机仿真头文件
+    include_files = {backend: output_path(backend) for backend in ("cheader", "host")}
+
+    def run(backend):
+        output_file = output_path(backend)
+        chunks = iter_backend(backend, registers, apb_data_width, base_address, decode, ctest_style, ral_hdl_path,
+                              read_pipeline, wait_states, bus, skid_buffer, emit_jobs, template_dir, include_files)
+        if only_changed:
+            if not emit_if_changed(chunks, output_file, metrics=metrics, name=backend):
+                logging.info(f"{backend} 输出未改变，跳过 '{output_file}'")
+                return output_file
+        else:
+            emit_to_file(chunks, output_file, metrics=metrics, name=backend)
+        logging.info(f"{backend} 输出已写入 '{output_file}'")
+        return output_file
+
+    # 输出文件所在的目录不存在时先创建
+    for directory in {os.path.dirname(output_path(backend)) for backend in backends}:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=jobs or len(backends) or 1) as executor:
+        futures = {backend: executor.submit(run, backend) for backend in backends}
+        return {backend: future.result() for backend, future in futures.items()}
+
+def add_backend_arguments(parser):
+    """为命令行参数解析器添加各后端的生成选项（见 BACKEND_OPTIONS），gen_all_reg、batch_reg 和 reg_service watch 共用。"""
+    parser.add_argument("--decode", choices=["auto", "flat", "direct", "banked"], help="RTL 地址译码方式，默认为 auto 根据地址分布自动选择", default="auto")
+    parser.add_argument("--read_pipeline", choices=["auto", "none", "decode", "full"], help="RTL 读数据流水方式：none、decode（读 1 个等待周期）、full（读 2 个等待周期），默认为 auto 根据寄存器数量自动选择", default="auto")
+    parser.add_argument("--wait_states", type=int, help="RTL 每次传输额外插入的等待周期数，默认为 0", default=0)
+    parser.add_argument("--bus", choices=["apb", "axi4lite"], help="RTL 总线接口：apb 或 axi4lite，默认为 apb", default="apb")
+    parser.add_argument("--skid_buffer", action="store_true", help="RTL AXI4-Lite 接口在 AW、W、AR 通道插入 skid buffer")
+    parser.add_argument("--ctest_style", choices=["unrolled", "table"], help="测试 C 代码风格：unrolled 逐个寄存器展开，table 生成描述符表和测试循环，默认为 unrolled", default="unrolled")
+    parser.add_argument("--ral_hdl_path", help="RTL 模块实例的层次路径（例如 tb_top.u_dut）。如果提供，则 RAL 生成后门访问路径，默认为不生成。", default=None)
+    parser.add_argument("--emit_jobs", type=int, help="RTL 和 RAL 后端按寄存器并行生成的进程数，输出与串行相同，默认为 1（串行），0 表示使用 CPU 核数", default=1)
+    parser.add_argument("--template_dir", help="用户模板目录，其中的同名模板优先于内置模板（可用 reg_template.py export 导出内置模板后修改），默认为只使用内置模板", default=None)
+
+def backend_options(args):
+    """从命令行参数中取出各后端的生成选项，返回可直接传给 generate_all 的关键字参数字典。"""
+    return {name: getattr(args, name) for name in BACKEND_OPTIONS}
+
+def main(argv=None, cache=None):
+    """
+    命令行入口。
+
+    Args:
+        argv (list, optional): 命令行参数。如果为 None，则使用 sys.argv。
+        cache (optional): 具有 load(input_file, parse, **options) 方法的寄存器模型缓存，
+            例如 reg_service 常驻进程中的内存 LRU 缓存。提供时忽略 --cache_file。
+    """
+    # 创建命令行参数解析器
+    parser = argparse.ArgumentParser(description="解析一次寄存器描述文件（Markdown、IP-XACT 或 JSON），生成全部输出文件。")
+    parser.add_argument("input_file", help="Markdown、IP-XACT（.xml）、二进制中间文件（.regb）或 JSON 文件的路径")
+    parser.add_argument("--json_file", help="JSON 文件的路径。输入为 Markdown 或 IP-XACT 时写出中间 JSON 文件，默认为不写出。", default=None)
+    parser.add_argument("--binary_file", help="二进制中间文件（.regb）的路径。如果提供，则同时写出可 mmap 查询的二进制中间文件。", default=None)
+    parser.add_argument("--cheader_file", help="C 语言头文件的路径。如果省略，则使用 MODULE_NAME 作为文件名。", default=None)
+    parser.add_argument("--ral_file", help="RAL 模型文件的路径。如果省略，则使用 MODULE_NAME 加 ral_ 前缀命名。", default=None)
+    parser.add_argument("--verilog_file", help="Verilog 文件的路径。如果省略，则使用 MODULE_NAME 作为文件名。", default=None)
+    parser.add_argument("--test_code_file", help="测试 C 代码文件的路径。如果省略，则使用 MODULE_NAME_test.c。", default=None)
+    parser.add_argument("--host_shim_file", help="测试 C 代码的主机仿真头文件路径。如果省略，则使用 MODULE_NAME_host.h。", default=None)
+    parser.add_argument("--output_dir", help="默认文件名所在的输出目录，默认为当前目录", default=".")
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), help="需要生成的后端，默认为全部", default=None)
+    parser.add_argument("--start_address", type=lambda x: int(x, 0), help="起始地址，默认为 0", default=0)
+    parser.add_argument("--address_step", type=int, help="地址步进，默认为 4", default=4)
+    parser.add_argument("--apb_data_width", type=int, help="APB 数据宽度，默认为 32", default=32)
+    parser.add_argument("--base_address", help="寄存器基地址，默认为 0x10000000", default="0x10000000")
+    add_backend_arguments(parser)
+    parser.add_argument("--jobs", type=int, help="并发线程数，默认为每个后端一个线程", default=None)
+    parser.add_argument("--only_changed", action="store_true", help="只重写内容发生变化的输出文件，未改变的文件保持原有修改时间")
+    parser.add_argument("--cache_file", help="寄存器模型缓存文件的路径，例如 build/reg_cache.sqlite。如果省略，则不使用缓存。", default=None)
+    add_metrics_arguments(parser)
+
+    # 解析命令行参数
+    args = parser.parse_args(argv)
+    metrics = metrics_from_args("gen_all_reg", args)
+
+    try:
+        if cache is not None:
+            data = load_register_data(args.input_file, args.start_address, args.address_step, cache, metrics)
+        elif args.cache_file:
+            from reg_cache import RegisterModelCache
+            with RegisterModelCache(args.cache_file) as cache:
+                data = load_register_data(args.input_file, args.start_address, args.address_step, cache, metrics)
+        else:
+            data = load_register_data(args.input_file, args.start_address, args.address_step, metrics=metrics)
+
+        # JSON 和二进制中间文件在 generate_all 之前写出，所在目录需要先创建
+        for directory in {args.output_dir, *(os.path.dirname(path) for path in (args.json_file, args.binary_file) if path)}:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        if args.json_file:
+            with metrics.phase("write:json"):
+                with open(args.json_file, 'w', encoding='utf-8') as f:
+                    json.dump(data.to_dict() if isinstance(data, RegisterMap) else data, f, ensure_ascii=False, indent=4)
+            logging.info(f"JSON 文件已写入 '{args.json_file}'")
+
+        if args.binary_file:
+            from reg_binary import write_binary
+            write_binary(data, args.binary_file, metrics)
+            logging.info(f"二进制中间文件已写入 '{args.binary_file}'")
+
+        output_files = {
+            "cheader": args.cheader_file,
+            "ral": args.ral_file,
+            "rtl": args.verilog_file,
+            "ctest": args.test_code_file,
+            "host": args.host_shim_file,
+        }
+        output_files = {backend: path for backend, path in output_files.items() if path}
+
+        generate_all(data, output_files, args.backends, args.output_dir, args.apb_data_width, args.base_address, args.jobs,
+                     metrics=metrics, only_changed=args.only_changed, **backend_options(args))
+        logging.info(f"'{args.input_file}' 的全部输出已生成")
+        metrics.finish()
+
+    except FileNotFoundError as e:
+        logging.error(f"错误：文件 '{e.filename}' 未找到。")
+        raise SystemExit(1)
+    except Exception as e:
+        logging.exception(f"发生错误：{e}")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
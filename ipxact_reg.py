@@ -0,0 +1,446 @@
+import xml.etree.ElementTree as ET
+import io
+import re
+import json
+import mmap
+import logging
+import argparse
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from reg_model import parse_int
+from reg_metrics import NULL_METRICS, add_metrics_arguments, metrics_from_args
+
+# 配置日志记录
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# 需要读取文本的容器子元素：父元素 -> 子元素名称集合（寄存器内部的元素在寄存器结束时统一读取）
+_CONTAINER_VALUES = {
+    "memoryMap": {"name"},
+    "addressBlock": {"name", "baseAddress"},
+    "registerFile": {"addressOffset"},
+}
+
+# IP-XACT 访问类型 -> md2json 寄存器/字段类型
+IPXACT_ACCESS_TYPES = {"read-write": "RW", "read-only": "RO", "write-only": "WO", "read-writeOnce": "RW", "writeOnce": "WO"}
+# 字段 modifiedWriteValue -> 字段访问类型
+IPXACT_MODIFIED_WRITE_ACCESS = {"oneToClear": "W1C", "oneToSet": "W1S"}
+
+# 文件小于该大小时顺序解析，避免进程池的启动开销
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+# 根元素开始标签（跳过 XML 声明、注释和 DOCTYPE）
+_ROOT_TAG_RE = re.compile(rb"<([A-Za-z_][\w.:-]*)[^>]*>")
+# addressBlock 开始、结束和自闭合标签
+_BLOCK_TAG_RE = re.compile(rb"<(/)?(?:[A-Za-z_][\w.-]*:)?addressBlock\b[^>]*?(/)?>")
+
+class IpxactField:
+    """IP-XACT 寄存器字段。access 未给出时继承寄存器的访问类型。"""
+
+    __slots__ = ("name", "desc", "bit_offset", "bit_width", "access", "reset", "modified_write")
+
+    def __init__(self, name, bit_offset, bit_width, access=None, reset=0, desc="", modified_write=None):
+        self.name = name
+        self.desc = desc
+        self.bit_offset = bit_offset
+        self.bit_width = bit_width
+        self.access = access
+        self.reset = reset
+        self.modified_write = modified_write
+
+    def __repr__(self):
+        return f"IpxactField({self.name!r}, [{self.bit_offset + self.bit_width - 1}:{self.bit_offset}])"
+
+class IpxactRegister:
+    """
+    IP-XACT 寄存器及其所在的存储映射和地址块。
+
+    offset 为寄存器在地址块内的偏移（包括所在 registerFile 的偏移），base_address 为地址块的 baseAddress，
+    address 为 base_address + offset，即在存储映射中的地址。
+    """
+
+    __slots__ = ("name", "desc", "offset", "address", "base_address", "size", "access", "reset", "fields", "block", "memory_map")
+
+    def __init__(self, name, offset, address, size=32, access="unknown", reset=0, fields=(), desc="", block=None, memory_map=None,
+                 base_address=0):
+        self.name = name
+        self.desc = desc
+        self.offset = offset
+        self.address = address
+        self.base_address = base_address
+        self.size = size
+        self.access = access
+        self.reset = reset
+        self.fields = list(fields)
+        self.block = block
+        self.memory_map = memory_map
+
+    def __repr__(self):
+        return f"IpxactRegister({self.name!r}, 0x{self.address:x}, block={self.block!r}, memory_map={self.memory_map!r})"
+
+def _local_name(tag, cache={}):
+    """去掉 ElementTree 标签中的 {命名空间} 前缀，结果按标签缓存。"""
+    name = cache.get(tag)
+    if name is None:
+        name = cache[tag] = tag.rsplit("}", 1)[-1]
+    return name
+
+def _children(elem):
+    """返回 本地名称 -> 子元素 的映射，同名子元素保留第一个。"""
+    values = {}
+    for child in elem:
+        values.setdefault(_local_name(child.tag), child)
+    return values
+
+def _reset_value(children):
+    """读取 reset/value（1685-2009 及寄存器级复位值）或 resets/reset/value（1685-2014 字段复位值）。"""
+    reset = children.get("reset")
+    if reset is None and "resets" in children:
+        reset = next(iter(children["resets"]), None)
+    if reset is None:
+        return None
+    for child in reset:
+        if _local_name(child.tag) == "value":
+            return parse_int((child.text or "").strip())
+    return None
+
+def _text(children, name, default=None):
+    elem = children.get(name)
+    if elem is None:
+        return default
+    return (elem.text or "").strip()
+
+def _parse_register(elem, base_address, register_offset, block, memory_map):
+    """由完整的 register 元素构建 IpxactRegister。"""
+    children = _children(elem)
+    access = _text(children, "access") or "unknown"
+    fields = []
+    for child in elem:
+        if _local_name(child.tag) != "field":
+            continue
+        values = _children(child)
+        fields.append(IpxactField(
+            _text(values, "name", ""),
+            parse_int(_text(values, "bitOffset")),
+            parse_int(_text(values, "bitWidth"), 1),
+            _text(values, "access") or access,
+            _reset_value(values) or 0,
+            _text(values, "description", ""),
+            _text(values, "modifiedWriteValue") or None,
+        ))
+
+    # 寄存器没有复位值时由各字段的复位值拼接
+    reset = _reset_value(children)
+    if reset is None:
+        reset = 0
+        for field in fields:
+            reset |= (field.reset & ((1 << field.bit_width) - 1)) << field.bit_offset
+
+    offset = register_offset + parse_int(_text(children, "addressOffset"))
+    return IpxactRegister(
+        _text(children, "name", ""),
+        offset,
+        base_address + offset,
+        parse_int(_text(children, "size"), 32),
+        access,
+        reset,
+        fields,
+        _text(children, "description", ""),
+        block,
+        memory_map,
+        base_address,
+    )
+
+def iter_ipxact_registers(xml_file):
+    """
+    使用 iterparse 流式解析 IP-XACT 文件，逐个生成所有存储映射、所有地址块中的寄存器。
+
+    每个寄存器解析完成后立即从树中移除，内存占用只与单个寄存器的大小有关，与文件大小无关。
+    同时支持 IEEE 1685-2009（spirit）和 1685-2014（ipxact）命名空间。
+    addressBlock 不在 memoryMap 内时（例如 test.xml 的写法），使用最近一个 memoryMap 的名称。
+
+    Args:
+        xml_file (str): IP-XACT XML 文件的路径。
+
+    Yields:
+        IpxactRegister: 寄存器及其字段、地址块和存储映射信息。
+    """
+    elements = []  # 当前打开的元素（不含寄存器内部），用于在解析完成后从父元素中移除
+    tags = []  # 与 elements 对应的本地标签名
+    memory_map = None  # 最近一个 memoryMap 的名称
+    block = {}  # 当前 addressBlock 的 name、baseAddress
+    register_files = []  # 当前所在 registerFile 的偏移
+    register = None  # 正在读取的 register 元素，其内部事件直接跳过
+
+    for event, elem in ET.iterparse(xml_file, events=("start", "end")):
+        if register is not None and elem is not register:
+            continue
+
+        if event == "start":
+            tag = _local_name(elem.tag)
+            elements.append(elem)
+            tags.append(tag)
+            if tag == "register":
+                register = elem
+            elif tag == "addressBlock":
+                block = {}
+            elif tag == "registerFile":
+                register_files.append(0)
+            continue
+
+        elements.pop()
+        tag = tags.pop()
+        parent = tags[-1] if tags else None
+
+        if tag == "register":
+            yield _parse_register(elem, parse_int(block.get("baseAddress")), sum(register_files), block.get("name"), memory_map)
+            register = None
+        elif tag in _CONTAINER_VALUES.get(parent, ()):
+            text = (elem.text or "").strip()
+            if parent == "memoryMap":
+                memory_map = text
+            elif parent == "addressBlock":
+                block[tag] = text
+            else:
+                register_files[-1] = parse_int(text)
+        elif tag == "registerFile":
+            register_files.pop()
+
+        # 处理完毕的元素从父元素中移除，释放内存
+        if elements:
+            elements[-1].remove(elem)
+
+def _split_address_blocks(xml_file):
+    """
+    预扫描 XML 文件，找出每个 addressBlock 的字节范围及其所在的存储映射，用于并行解析。
+
+    addressBlock 的位置由正则表达式查找，存储映射名称由去掉所有 addressBlock 后的骨架文档解析得到。
+    文件结构无法可靠拆分时（例如注释中出现 addressBlock 标签）返回 None，由调用方退回顺序解析。
+
+    Args:
+        xml_file (str): IP-XACT XML 文件的路径。
+
+    Returns:
+        tuple | None: (根元素之前及根元素开始标签, 根元素结束标签, [(起始偏移, 结束偏移, 存储映射名称), ...])。
+    """
+    with open(xml_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        root = _ROOT_TAG_RE.search(data)
+        if root is None:
+            return None
+
+        spans = []
+        start = None
+        for m in _BLOCK_TAG_RE.finditer(data, root.end()):
+            if m.group(1):
+                if start is None:
+                    return None
+                spans.append((start, m.end()))
+                start = None
+            elif start is not None:
+                return None
+            elif m.group(2):
+                spans.append((m.start(), m.end()))
+            else:
+                start = m.start()
+        if start is not None or not spans:
+            return None
+
+        # 骨架文档：每个 addressBlock 替换为空的占位元素，只解析存储映射结构
+        pieces = []
+        position = 0
+        for span_start, span_end in spans:
+            pieces.append(data[position:span_start])
+            pieces.append(b"<addressBlock/>")
+            position = span_end
+        pieces.append(data[position:])
+        header = data[:root.end()]
+        footer = b"</" + root.group(1) + b">"
+
+    memory_maps = []
+    tags = []
+    memory_map = None
+    try:
+        for event, elem in ET.iterparse(io.BytesIO(b"".join(pieces)), events=("start", "end")):
+            tag = _local_name(elem.tag)
+            if event == "start":
+                tags.append(tag)
+                continue
+            tags.pop()
+            if tag == "name" and tags and tags[-1] == "memoryMap":
+                memory_map = (elem.text or "").strip()
+            elif tag == "addressBlock":
+                memory_maps.append(memory_map)
+    except ET.ParseError:
+        return None
+    if len(memory_maps) != len(spans):
+        return None
+
+    return header, footer, [(s, e, m) for (s, e), m in zip(spans, memory_maps)]
+
+def _import_block(xml_file, header, footer, start, end):
+    """工作进程入口：解析单个 addressBlock 并转换为 (地址块名称, 地址块基地址, 寄存器数据) 列表。"""
+    with open(xml_file, 'rb') as f:
+        f.seek(start)
+        block = f.read(end - start)
+    registers = []
+    for register in iter_ipxact_registers(io.BytesIO(header + block + footer)):
+        model = register_to_model(register)
+        if model is not None:
+            registers.append((register.block, register.base_address, model))
+    return registers
+
+def register_to_model(register):
+    """
+    将 IpxactRegister 转换为 md2json_reg 生成的 JSON 中的寄存器信息。ADDRESS 为寄存器在存储映射中的地址，
+    由 import_ipxact 换算为相对偏移。
+
+    字段按 bitOffset 排序并记录 LSB；没有字段的寄存器生成一个覆盖整个寄存器的 DATA 字段。
+    字段的 modifiedWriteValue 为 oneToClear/oneToSet 时 ACCESS 为 W1C/W1S。
+
+    Args:
+        register (IpxactRegister): IP-XACT 寄存器。
+
+    Returns:
+        dict | None: 寄存器信息。访问类型为 reserved 的寄存器返回 None。
+    """
+    if register.access == "reserved":
+        return None
+
+    reg_type = IPXACT_ACCESS_TYPES.get(register.access, "RW")
+    fields = sorted(register.fields, key=lambda field: field.bit_offset)
+    if not fields:
+        fields = [IpxactField("DATA", 0, register.size, register.access, register.reset, register.desc)]
+
+    model_fields = []
+    field_reset = 0
+    for field in fields:
+        field_type = IPXACT_ACCESS_TYPES.get(field.access, reg_type)
+        field_reset |= (field.reset & ((1 << field.bit_width) - 1)) << field.bit_offset
+        model_fields.append({
+            "NAME": field.name,
+            "LSB": field.bit_offset,
+            "WIDTH": field.bit_width,
+            "RESET": hex(field.reset),
+            "TYPE": field_type,
+            "ACCESS": IPXACT_MODIFIED_WRITE_ACCESS.get(field.modified_write, field_type),
+            "DESC": field.desc,
+        })
+
+    model = {
+        "REG_NAME": register.name,
+        "DESC": register.desc,
+        "REG_TYPE": reg_type,
+        "ADDRESS": hex(register.address),
+        "FIELDS": model_fields,
+        "WIDTH": register.size,
+    }
+    # 寄存器级复位值与字段复位值不一致时（例如字段未覆盖的位有复位值）单独记录
+    if register.reset != field_reset:
+        model["RESET_VALUE"] = hex(register.reset)
+    return model
+
+def import_ipxact(xml_file, jobs=None, metrics=NULL_METRICS):
+    """
+    将 IP-XACT 文件转换为与 md2json_reg 相同格式的寄存器数据，供 json2* 各后端直接使用。
+
+    文件包含多个 addressBlock 且足够大时，各地址块在独立的进程中并行解析和转换，结果按文档顺序拼接，
+    与顺序解析完全相同。寄存器名称在多个地址块中重复时加上地址块名称前缀。
+
+    与 Markdown 规格一致，寄存器地址 ADDRESS 为相对于基地址的偏移：地址块的 baseAddress 只用于确定各地址块
+    之间的相对位置，地址相对于所有地址块中最低的 baseAddress。基地址由各后端的 --base_address 给出。
+
+    Args:
+        xml_file (str): IP-XACT XML 文件的路径。
+        jobs (int, optional): 并行解析的进程数。如果为 None，则使用 CPU 核数；为 1 时顺序解析。
+        metrics (Metrics): 指标记录器，默认不记录。
+
+    Returns:
+        dict: 包含 MODULE_NAME 和 REGISTERS 的寄存器数据。
+    """
+    with metrics.phase("parse"):
+        jobs = jobs or os.cpu_count() or 1
+        split = None
+        if jobs > 1 and os.path.getsize(xml_file) >= PARALLEL_MIN_BYTES:
+            split = _split_address_blocks(xml_file)
+
+        registers = None
+        if split is not None and len(split[2]) > 1:
+            header, footer, blocks = split
+            try:
+                with ProcessPoolExecutor(max_workers=min(jobs, len(blocks))) as executor:
+                    futures = [executor.submit(_import_block, xml_file, header, footer, start, end) for start, end, _ in blocks]
+                    registers = [item for future in futures for item in future.result()]
+                memory_map = blocks[0][2]
+            except ET.ParseError as e:
+                # 地址块片段无法单独解析（例如命名空间声明在 memoryMap 上），退回顺序解析
+                logging.warning(f"无法并行解析 '{xml_file}' 的地址块（{e}），改为顺序解析")
+                registers = None
+
+        if registers is None:
+            registers = []
+            memory_map = None
+            for register in iter_ipxact_registers(xml_file):
+                if memory_map is None:
+                    memory_map = register.memory_map
+                model = register_to_model(register)
+                if model is not None:
+                    registers.append((register.block, register.base_address, model))
+
+    # 地址换算为相对于最低 baseAddress 的偏移
+    base_address = min((base for _, base, _ in registers), default=0)
+    if base_address:
+        for _, _, model in registers:
+            model["ADDRESS"] = hex(parse_int(model["ADDRESS"]) - base_address)
+
+    # 多个地址块中的同名寄存器加上地址块名称前缀，避免生成的端口和类名冲突
+    names = Counter(model["REG_NAME"] for _, _, model in registers)
+    for block, _, model in registers:
+        if names[model["REG_NAME"]] > 1 and block:
+            model["REG_NAME"] = f"{block}_{model['REG_NAME']}"
+
+    module_name = (memory_map or os.path.splitext(os.path.basename(xml_file))[0]).split('_')[0]
+    return {"MODULE_NAME": module_name, "REGISTERS": [model for _, _, model in registers]}
+
+def summarize(xml_file):
+    """
+    统计 IP-XACT 文件中每个存储映射和地址块的寄存器数量。
+
+    Args:
+        xml_file (str): IP-XACT XML 文件的路径。
+
+    Returns:
+        dict: (存储映射, 地址块) 到寄存器数量的映射，按出现顺序排列。
+    """
+    counts = {}
+    for register in iter_ipxact_registers(xml_file):
+        key = (register.memory_map, register.block)
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+if __name__ == "__main__":
+    # 创建命令行参数解析器
+    parser = argparse.ArgumentParser(description="将 IP-XACT 文件转换为与 md2json_reg 相同格式的 JSON 文件，或列出各存储映射和地址块中的寄存器数量。")
+    parser.add_argument("xml_file", help="IP-XACT XML 文件的路径")
+    parser.add_argument("json_file", nargs="?", help="JSON 文件的路径，默认为 output.json", default="output.json")
+    parser.add_argument("--binary_file", help="二进制中间文件（.regb）的路径。如果提供，则同时写出。", default=None)
+    parser.add_argument("--jobs", type=int, help="并行解析地址块的进程数，默认为 CPU 核数", default=None)
+    parser.add_argument("--summary", action="store_true", help="只列出各存储映射和地址块中的寄存器数量，不写出 JSON 文件")
+    add_metrics_arguments(parser)
+
+    # 解析命令行参数
+    args = parser.parse_args()
+
+    if args.summary:
+        for (memory_map, block), count in summarize(args.xml_file).items():
+            print(f"{memory_map or '-'} / {block or '-'}: {count} 个寄存器")
+    else:
+        metrics = metrics_from_args("ipxact_reg", args)
+        data = import_ipxact(args.xml_file, args.jobs, metrics)
+        with metrics.phase("write"):
+            with open(args.json_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=4)
+        logging.info(f"已将 {len(data['REGISTERS'])} 个寄存器写入 '{args.json_file}'")
+        if args.binary_file:
+            from reg_binary import write_binary
+            write_binary(data, args.binary_file, metrics)
+            logging.info(f"二进制中间文件已写入 '{args.binary_file}'")
+        metrics.finish()
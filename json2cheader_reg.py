@@ -1,37 +1,35 @@
-import json
 import logging
 import argparse
 import os
+from reg_model import load_register_map, as_registers
+from reg_emit import render, emit_to_file
+from reg_template import load_template
+from reg_metrics import NULL_METRICS, add_metrics_arguments, metrics_from_args
 
 # 配置日志记录
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def json_to_cheader(json_file="output.json", cheader_file=None):
+def json_to_cheader(json_file="output.json", cheader_file=None, metrics=NULL_METRICS, template_dir=None):
     """
     将 JSON 文件转换为 C 语言头文件代码。
 
     Args:
         json_file (str): JSON 文件的路径，默认为 "output.json"。
         cheader_file (str, optional): C 语言头文件的路径。如果为 None，则使用 MODULE_NAME 作为文件名，默认为 None。
+        metrics (Metrics): 指标记录器，默认不记录。
+        template_dir (str, optional): 用户模板目录，其中的同名模板优先于内置模板。
     """
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        registers = load_register_map(json_file, metrics)
 
-        module_name = data["MODULE_NAME"]
+        module_name = registers.module_name
 
         # 如果 cheader_file 为 None，则使用 MODULE_NAME 作为文件名
         if cheader_file is None:
             cheader_file = f"{module_name}.h"
 
-        registers = data["REGISTERS"]
-
-        # 生成 C 语言头文件代码
-        cheader_code = generate_cheader(module_name, registers)
-
-        # 写入 C 语言头文件
-        with open(cheader_file, 'w', encoding='utf-8') as f:
-            f.write(cheader_code)
+        # 边生成边写入 C 语言头文件
+        emit_to_file(iter_cheader(module_name, registers, template_dir), cheader_file, metrics=metrics)
 
         logging.info("JSON 文件 '{}' 已成功转换为 C 语言头文件 '{}'".format(json_file, cheader_file))
 
@@ -40,82 +38,68 @@ def json_to_cheader(json_file="output.json", cheader_file=None):
     except Exception as e:
         logging.exception(f"发生错误：{e}")
 
-def generate_cheader(module_name, registers):
+def generate_cheader(module_name, registers, template_dir=None):
     """
     根据模块名称和寄存器信息生成 C 语言头文件。
 
     Args:
         module_name (str): 模块名称。
-        registers (list): 寄存器信息列表。
+        registers (RegisterMap | list): 寄存器集合（Register 对象或 JSON 寄存器字典列表）。
+        template_dir (str, optional): 用户模板目录，其中的同名模板优先于内置模板。
 
     Returns:
         str: 生成的 C 语言头文件代码。
     """
+    return render(iter_cheader(module_name, registers, template_dir))
+
+def iter_cheader(module_name, registers, template_dir=None):
+    """
+    逐段生成 C 语言头文件，调用方可以边生成边写入文件。
+    文件内容由模板 cheader.h.tpl 定义，字段读写函数由其引用的 cheader_accessors.h.tpl 逐个寄存器生成。
 
-    # 头文件保护
-    header_guard = f"""
-#ifndef {module_name.upper()}_H
-#define {module_name.upper()}_H
-"""
-
-    # 头文件注释
-    header_comment = f"""
-/*------------------------------- MODULE_NAME: {module_name.upper()} -----------------------*/
-"""
-
-    # 结构体定义开始
-    struct_definition_start = f"""
-typedef struct
-{{
-"""
-
-    # 结构体成员定义
-    struct_members = ""
-    for register in registers:
-        reg_name = register["REG_NAME"].upper()
-        reg_type = register["REG_TYPE"]
-        reg_address = int(register["ADDRESS"], 16)  # 将地址转换为整数
-        reg_desc = register["DESC"]
-
-        if reg_type == "RO":
-            access_type = "__I"  # 只读
-            reg_address_hex = register["ADDRESS"]
-        else:
-            access_type = "__IO"  # 读写
-            reg_address_hex = register["ADDRESS"]
-
-        struct_members += f"    {access_type} uint32_t {reg_name}; /* Offset: {reg_address_hex} ({reg_type}) {reg_desc} Register */\n"
-
-    # 结构体定义结束
-    struct_definition_end = f"""
-}} {module_name.upper()}_TypeDef;
-"""
-
-    # 地址偏移宏定义
-    address_offset_macros = ""
-    for register in registers:
-        reg_name = register["REG_NAME"].upper()
-        reg_address = int(register["ADDRESS"], 16)
-        address_offset_macros += f"#define {module_name.upper()}_{reg_name}_OFFSET (0x{reg_address:X})\n"
-
-    # 头文件保护结束
-    header_guard_end = f"""
-#endif /* {module_name.upper()}_H */
-"""
-
-    # 将所有部分组合在一起
-    cheader_code = header_guard + header_comment + struct_definition_start + struct_members + struct_definition_end + address_offset_macros + header_guard_end
-
-    return cheader_code
+    Args:
+        module_name (str): 模块名称。
+        registers (RegisterMap | list): 寄存器集合（Register 对象或 JSON 寄存器字典列表）。
+        template_dir (str, optional): 用户模板目录，其中的同名模板优先于内置模板。
+
+    Yields:
+        str: C 语言头文件代码片段。
+    """
+    registers = as_registers(registers)
+    yield from load_template("cheader.h.tpl", template_dir, __name__)(module_name, registers)
+
+def header_fields(register):
+    """
+    返回需要生成位置和掩码宏的字段：跳过名称以 reserved 开头的保留字段和重名字段。
+
+    Args:
+        register (Register): 寄存器对象。
+
+    Returns:
+        list: Field 对象列表。
+    """
+    fields = []
+    names = set()
+    for field in register.fields:
+        name = field.name.upper()
+        if name.startswith("RESERVED") or name in names:
+            continue
+        names.add(name)
+        fields.append(field)
+    return fields
 
 if __name__ == "__main__":
     # 创建命令行参数解析器
     parser = argparse.ArgumentParser(description="将 JSON 文件转换为 C 语言头文件代码。")
-    parser.add_argument("--json_file", help="JSON 文件的路径，默认为 output.json", default="output.json")
+    parser.add_argument("--json_file", help="JSON 文件或 IP-XACT（.xml）文件的路径，默认为 output.json", default="output.json")
     parser.add_argument("--cheader_file", help="C 语言头文件的路径。如果省略，则使用 MODULE_NAME 作为文件名。", default=None)
+    parser.add_argument("--template_dir", help="用户模板目录，其中的同名模板（例如 cheader.h.tpl）优先于内置模板，默认为只使用内置模板", default=None)
+    add_metrics_arguments(parser)
 
     # 解析命令行参数
     args = parser.parse_args()
 
     # 调用 json_to_cheader 函数
-    json_to_cheader(args.json_file, args.cheader_file)
\ No newline at end of file
+    metrics = metrics_from_args("json2cheader_reg", args)
+    json_to_cheader(args.json_file, args.cheader_file, metrics, args.template_dir)
+    metrics.finish()
\ No newline at end of file
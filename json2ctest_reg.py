@@ -1,72 +1,445 @@
-import json
-import sys
+import os
+import argparse
+from reg_model import load_register_map, as_registers, field_access
+from reg_emit import render, emit_to_file
+from reg_template import load_template
+from reg_metrics import NULL_METRICS, add_metrics_arguments, metrics_from_args
 
-def generate_test_code(json_file, base_address, test_code_file):
-    try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        module_name = data["MODULE_NAME"]
-        registers = data["REGISTERS"]
-
-        # 这里可以使用之前提供的 generate_test_code 函数来生成测试 C 代码
-        # 代码省略，你可以根据实际情况实现
+# 测试代码风格：unrolled 为每个寄存器展开一段读写比较代码，table 生成描述符表和一个测试循环
+TEST_STYLES = ("unrolled", "table")
 
-        code = f"#include \"{module_name}.h\"\n\n"
-        code += "uint32_t read_reg(uint32_t address) {\n"
-        code += "    return *(volatile uint32_t*)address;\n"
-        code += "}\n\n"
-        code += "void write_reg(uint32_t address, uint32_t value) {\n"
-        code += "    *(volatile uint32_t*)address = value;\n"
-        code += "}\n\n"
+# 寄存器类型 -> 描述符表中的访问类型
+TABLE_ACCESS = {"RW": "REG_TEST_RW", "RO": "REG_TEST_RO", "WO": "REG_TEST_WO", "reserved": "REG_TEST_RSVD"}
 
-        code += "void test_reg_access() {\n"
-        code += "    uint32_t base_addr = 0x10000000;\n"
-        code += "    uint32_t rand_val;\n"
-        code += "    uint32_t read_val;\n\n"
+def generate_test_code(json_file, base_address, test_code_file, metrics=NULL_METRICS, style="unrolled", host_shim_file=None, template_dir=None,
+                       cheader_file=None):
+    try:
+        registers = load_register_map(json_file, metrics)
+        module_name = registers.module_name
 
-        for reg in registers:
-            reg_name = reg["REG_NAME"]
-            reg_type = reg["REG_TYPE"]
-            offset = reg["OFFSET"]
-            reset_val = reg.get("RESET_VALUE", "0x0")
-
-            if reg_type == "RW":
-                code += f"    rand_val = rand();\n"
-                code += f"    write_reg(base_addr + {offset}, rand_val);\n"
-                code += f"    read_val = read_reg(base_addr + {offset});\n"
-                code += f"    if (read_val != rand_val) {{\n"
-                code += f"        printf(\"{reg_name} RW test failed!\\n\");\n"
-                code += "    }\n\n"
-            elif reg_type == "RO":
-                code += f"    read_val = read_reg(base_addr + {offset});\n"
-                code += f"    if (read_val != {reset_val}) {{\n"
-                code += f"        printf(\"{reg_name} RO test failed!\\n\");\n"
-                code += "    }\n\n"
-            elif reg_type == "WO":
-                code += f"    write_reg(base_addr + {offset}, 0xDEADBEEF);\n"
-                code += f"    printf(\"{reg_name} WO test passed\\n\");\n\n"
-
-        code += "}\n"
-
-        # 写入测试 C 代码文件
-        with open(test_code_file, 'w', encoding='utf-8') as f:
-            f.write(code)
+        # 边生成边写入测试 C 代码文件
+        emit_to_file(iter_ctest_code(module_name, registers, base_address, style, template_dir, cheader_file, host_shim_file), test_code_file,
+                     metrics=metrics)
 
         print(f"寄存器测试 C 代码已生成：{test_code_file}")
 
+        if host_shim_file:
+            emit_to_file(iter_host_shim(module_name, registers, base_address), host_shim_file, metrics=metrics)
+            print(f"主机仿真头文件已生成：{host_shim_file}")
+
     except FileNotFoundError:
         print(f"错误：文件 '{json_file}' 未找到。")
     except Exception as e:
         print(f"发生错误：{e}")
 
+def generate_ctest_code(module_name, registers, base_address, style="unrolled", template_dir=None, cheader_file=None, host_shim_file=None):
+    """
+    根据模块名称和寄存器信息生成寄存器读写测试 C 代码。
+
+    Args:
+        module_name (str): 模块名称。
+        registers (RegisterMap | list): 寄存器集合（Register 对象或 JSON 寄存器字典列表）。
+        base_address (str): 寄存器基地址。
+        style (str): 测试代码风格，取值见 TEST_STYLES，默认为 unrolled。
+        template_dir (str, optional): 用户模板目录，其中的同名模板优先于内置模板。
+        cheader_file (str, optional): 被包含的 C 头文件路径，默认为 {module_name}.h。
+        host_shim_file (str, optional): 被包含的主机仿真头文件路径，默认为 {module_name}_host.h。
+
+    Returns:
+        str: 生成的测试 C 代码。
+    """
+    return render(iter_ctest_code(module_name, registers, base_address, style, template_dir, cheader_file, host_shim_file))
+
+def iter_ctest_code(module_name, registers, base_address, style="unrolled", template_dir=None, cheader_file=None, host_shim_file=None):
+    """
+    逐个寄存器生成读写测试 C 代码片段，调用方可以边生成边写入文件。
+    定义 REG_HOST_EMULATION 编译时改用主机仿真头文件（见 iter_host_shim）中的 read_reg/write_reg，
+    并生成调用测试函数的 main，可以直接在主机上运行。
+
+    Args:
+        module_name (str): 模块名称。
+        registers (RegisterMap | list): 寄存器集合（Register 对象或 JSON 寄存器字典列表）。
+        base_address (str): 寄存器基地址。
+        style (str): 测试代码风格，取值见 TEST_STYLES，默认为 unrolled。
+        template_dir (str, optional): 用户模板目录，unrolled 风格的逐个寄存器测试代码由其中的
+            ctest_register.c.tpl 生成，不存在时使用内置模板。
+        cheader_file (str, optional): 被包含的 C 头文件路径，按文件名包含，默认为 {module_name}.h。
+        host_shim_file (str, optional): 被包含的主机仿真头文件路径，按文件名包含，默认为 {module_name}_host.h。
+
+    Yields:
+        str: 测试 C 代码片段。
+    """
+    if style not in TEST_STYLES:
+        raise ValueError(f"未知的测试代码风格：{style}，可选值为 {', '.join(TEST_STYLES)}")
+    registers = as_registers(registers)
+    # 头文件与测试 C 代码不在同一目录时，编译时用 -I 指定头文件所在目录
+    cheader_name = os.path.basename(cheader_file) if cheader_file else f"{module_name}.h"
+    host_shim_name = os.path.basename(host_shim_file) if host_shim_file else f"{module_name}_host.h"
+
+    yield (
+        "#ifdef REG_HOST_EMULATION\n"
+        f"#include \"{host_shim_name}\"\n"
+        "#endif\n"
+        f"#include \"{cheader_name}\"\n\n"
+        "#ifndef REG_HOST_EMULATION\n"
+        "uint32_t read_reg(uint32_t address) {\n"
+        "    return *(volatile uint32_t*)address;\n"
+        "}\n\n"
+        "void write_reg(uint32_t address, uint32_t value) {\n"
+        "    *(volatile uint32_t*)address = value;\n"
+        "}\n"
+        "#endif\n\n"
+    )
+
+    if style == "table":
+        yield from iter_test_table(module_name, registers)
+        yield (
+            "int test_reg_access() {\n"
+            f"    return {module_name}_run_reg_tests({base_address});\n"
+            "}\n"
+        )
+    else:
+        # 与 table 风格相同，test_reg_access 返回失败的寄存器数
+        yield (
+            "int test_reg_access() {\n"
+            f"    uint32_t base_addr = {base_address};\n"
+            "    uint32_t rand_val;\n"
+            "    uint32_t read_val;\n"
+            "    int failures = 0;\n\n"
+        )
+
+        # 逐个寄存器的测试代码由模板 ctest_register.c.tpl 生成
+        render_register = load_template("ctest_register.c.tpl", template_dir, __name__).render
+        for reg in registers:
+            yield from render_register(reg)
+
+        yield "    return failures;\n}\n"
+
+    # 主机仿真时测试失败或出现总线错误都以非 0 状态退出，make host_test 据此判断结果
+    yield (
+        "\n#ifdef REG_HOST_EMULATION\n"
+        "int main(void) {\n"
+        "    int failures = test_reg_access();\n"
+        f"    printf(\"%d register test(s) failed, %lu bus error(s)\\n\", failures, {module_name}_host_bus_errors);\n"
+        f"    return failures != 0 || {module_name}_host_bus_errors != 0;\n"
+        "}\n"
+        "#endif\n"
+    )
+
+def rw_test_mask(register):
+    """
+    返回读写测试中需要比较的位：访问类型为 RW 的字段所占的位，没有字段信息时为全部 32 位。
+    RO、WO、W1C、W1S 字段写入后读回的值与写入值不同，不参与比较。
+    """
+    if not register.fields:
+        return 0xFFFFFFFF
+    mask = 0
+    for field in register.fields:
+        if field_access(register, field) == "RW":
+            mask |= field.mask
+    return mask & 0xFFFFFFFF
+
+def iter_test_table(module_name, registers):
+    """
+    生成表驱动的寄存器测试：const 描述符表（偏移、访问类型、复位值、读写掩码）和一个测试循环函数
+    int {module_name}_run_reg_tests(uint32_t base_addr)，返回失败的寄存器数。寄存器数量宏为 {MODULE_NAME}_REG_TEST_COUNT。
+    代码大小与寄存器数量无关，每个寄存器只占描述符表中的一项。
+
+    Args:
+        module_name (str): 模块名称。
+        registers (RegisterMap | list): Register 对象序列，类型为 RW、RO、WO 或 reserved。
+
+    Yields:
+        str: 测试 C 代码片段。
+    """
+    yield (
+        "#include <stdio.h>\n"
+        "#include <stdlib.h>\n\n"
+        "#define REG_TEST_RW 0\n"
+        "#define REG_TEST_RO 1\n"
+        "#define REG_TEST_WO 2\n"
+        "#define REG_TEST_RSVD 3\n\n"
+        "typedef struct {\n"
+        "    uint32_t offset;\n"
+        "    uint32_t access;\n"
+        "    uint32_t reset;\n"
+        "    uint32_t rw_mask;\n"
+        "    const char *name;\n"
+        "} reg_test_desc_t;\n\n"
+        f"static const reg_test_desc_t {module_name}_reg_tests[] = {{\n"
+    )
+
+    count = 0
+    for reg in registers:
+        access = TABLE_ACCESS.get(reg.type)
+        if access is None:
+            continue
+        yield f"    {{0x{reg.address:X}, {access}, 0x{reg.reset & 0xFFFFFFFF:X}, 0x{rw_test_mask(reg):X}, \"{reg.name}\"}},\n"
+        count += 1
+    if count == 0:
+        # 空的初始化列表不是合法的 C 代码
+        yield "    {0, REG_TEST_RSVD, 0, 0, 0},\n"
+
+    yield (
+        "};\n\n"
+        f"#define {module_name.upper()}_REG_TEST_COUNT {count}\n\n"
+        f"int {module_name}_run_reg_tests(uint32_t base_addr) {{\n"
+        "    int failures = 0;\n"
+        "    uint32_t i;\n"
+        f"    for (i = 0; i < {module_name.upper()}_REG_TEST_COUNT; i++) {{\n"
+        f"        const reg_test_desc_t *desc = &{module_name}_reg_tests[i];\n"
+        "        uint32_t reg_addr = base_addr + desc->offset;\n"
+        "        uint32_t rand_val = (uint32_t)rand();\n"
+        "        uint32_t expected;\n"
+        "        uint32_t mask;\n"
+        "        switch (desc->access) {\n"
+        "        case REG_TEST_RW:\n"
+        "            write_reg(reg_addr, rand_val);\n"
+        "            expected = rand_val;\n"
+        "            mask = desc->rw_mask;\n"
+        "            break;\n"
+        "        case REG_TEST_RO:\n"
+        "            write_reg(reg_addr, rand_val);\n"
+        "            expected = desc->reset;\n"
+        "            mask = 0xFFFFFFFFu;\n"
+        "            break;\n"
+        "        case REG_TEST_WO:\n"
+        "            write_reg(reg_addr, rand_val);\n"
+        "            continue;\n"
+        "        default:\n"
+        "            expected = 0;\n"
+        "            mask = 0xFFFFFFFFu;\n"
+        "            break;\n"
+        "        }\n"
+        "        if ((read_reg(reg_addr) ^ expected) & mask) {\n"
+        "            printf(\"%s test failed!\\n\", desc->name);\n"
+        "            failures++;\n"
+        "        }\n"
+        "    }\n"
+        "    return failures;\n"
+        "}\n\n"
+    )
+
+def host_register_masks(register):
+    """
+    按字段的有效访问类型（reg_model.field_access）计算主机仿真使用的 (读, 写, 写 1 清零, 写 1 置位) 掩码，
+    与 reg_tlm 的事务级模型一致：RO 寄存器的字段全部只读，WO 寄存器和 WO 字段不读回，不属于任何字段的位读为 0 且忽略写入。
+    没有字段信息的寄存器（如 IP-XACT 测试流程中的寄存器）按寄存器类型处理全部 32 位。
+
+    Args:
+        register (Register): 寄存器对象。
+
+    Returns:
+        tuple: (read_mask, write_mask, clear_mask, set_mask)。
+    """
+    if not register.fields:
+        full = 0xFFFFFFFF
+        return {"RW": (full, full, 0, 0), "RO": (full, 0, 0, 0), "WO": (0, full, 0, 0)}.get(register.type, (0, 0, 0, 0))
+    masks = {"RW": 0, "WO": 0, "W1C": 0, "W1S": 0}
+    read_mask = 0
+    for field in register.fields:
+        access = field_access(register, field)
+        if access in masks:
+            masks[access] |= field.mask
+        if access != "WO":
+            read_mask |= field.mask
+    return (read_mask & 0xFFFFFFFF, (masks["RW"] | masks["WO"]) & 0xFFFFFFFF,
+            masks["W1C"] & 0xFFFFFFFF, masks["W1S"] & 0xFFFFFFFF)
+
+def generate_host_shim(module_name, registers, base_address):
+    """
+    生成在 Linux 主机上运行寄存器测试 C 代码的仿真头文件。
+
+    Args:
+        module_name (str): 模块名称。
+        registers (RegisterMap | list): 寄存器集合（Register 对象或 JSON 寄存器字典列表）。
+        base_address (str): 寄存器基地址，必须与测试代码使用的基地址相同。
+
+    Returns:
+        str: 生成的 C 头文件代码。
+    """
+    return render(iter_host_shim(module_name, registers, base_address))
+
+def iter_host_shim(module_name, registers, base_address):
+    """
+    逐段生成主机仿真头文件 {module_name}_host.h。以 -DREG_HOST_EMULATION 编译测试 C 代码时，
+    测试代码包含此文件并使用其中的 read_reg/write_reg：寄存器窗口映射到一块内存（环境变量 REG_HOST_FILE
+    指定文件时映射该文件，其他进程可以通过同一文件观察或注入寄存器值），首次访问时装入复位值，
+    读写按字段访问类型处理（RO 忽略写入、WO 读为 0、W1C/W1S）。访问未定义的地址计为总线错误。
+
+    Args:
+        module_name (str): 模块名称。
+        registers (RegisterMap | list): 寄存器集合（Register 对象或 JSON 寄存器字典列表）。
+        base_address (str): 寄存器基地址，必须与测试代码使用的基地址相同。
+
+    Yields:
+        str: C 代码片段。
+    """
+    registers = as_registers(registers)
+    guard = f"{module_name.upper()}_HOST_H"
+    prefix = f"{module_name}_host"
+
+    # 按偏移排序供二分查找，偏移重复时以第一个寄存器为准
+    table = {}
+    for reg in registers:
+        table.setdefault(reg.address, reg)
+    size = max(table) + 4 if table else 4
+
+    yield (
+        f"#ifndef {guard}\n"
+        f"#define {guard}\n\n"
+        f"/* {module_name} 寄存器块的主机仿真：只能被测试 C 代码包含一次，编译时定义 REG_HOST_EMULATION */\n\n"
+        "#ifndef _DEFAULT_SOURCE\n"
+        "#define _DEFAULT_SOURCE\n"
+        "#endif\n"
+        "#include <stdint.h>\n"
+        "#include <stdio.h>\n"
+        "#include <stdlib.h>\n"
+        "#include <fcntl.h>\n"
+        "#include <unistd.h>\n"
+        "#include <sys/mman.h>\n\n"
+        "#ifndef __IO\n"
+        "#define __IO volatile\n"
+        "#endif\n"
+        "#ifndef __I\n"
+        "#define __I volatile const\n"
+        "#endif\n"
+        "#ifndef __O\n"
+        "#define __O volatile\n"
+        "#endif\n"
+        "/* xml_to_struct_and_test 生成的结构体头文件使用的访问限定符 */\n"
+        "#ifndef _IO\n"
+        "#define _IO volatile\n"
+        "#endif\n"
+        "#ifndef _I\n"
+        "#define _I volatile const\n"
+        "#endif\n"
+        "#ifndef _O\n"
+        "#define _O volatile\n"
+        "#endif\n\n"
+        f"#define {prefix.upper()}_BASE ((uint32_t)({base_address}))\n"
+        f"#define {prefix.upper()}_SIZE 0x{size:X}u\n\n"
+        "typedef struct {\n"
+        "    uint32_t offset;\n"
+        "    uint32_t reset;\n"
+        "    uint32_t read_mask;\n"
+        "    uint32_t write_mask;\n"
+        "    uint32_t clear_mask;\n"
+        "    uint32_t set_mask;\n"
+        f"}} {prefix}_desc_t;\n\n"
+        f"static const {prefix}_desc_t {prefix}_regs[] = {{\n"
+    )
+    for offset in sorted(table):
+        reg = table[offset]
+        read_mask, write_mask, clear_mask, set_mask = host_register_masks(reg)
+        yield (f"    {{0x{offset:X}, 0x{reg.reset & (read_mask | write_mask):X}, 0x{read_mask:X}, 0x{write_mask:X}, "
+               f"0x{clear_mask:X}, 0x{set_mask:X}}}, /* {reg.name} */\n")
+    if not table:
+        # 空的初始化列表不是合法的 C 代码
+        yield "    {0, 0, 0, 0, 0, 0},\n"
+
+    yield (
+        "};\n\n"
+        f"#define {prefix.upper()}_REG_COUNT {len(table)}u\n\n"
+        f"volatile uint32_t *{prefix}_mem;\n"
+        f"unsigned long {prefix}_bus_errors;\n\n"
+        "/* 映射寄存器窗口并装入复位值。path 为 NULL 或空字符串时使用匿名映射，否则映射（必要时创建）该文件。 */\n"
+        f"int {prefix}_init(const char *path) {{\n"
+        "    void *mem;\n"
+        "    uint32_t i;\n"
+        "    if (path == NULL || path[0] == '\\0') {\n"
+        f"        mem = mmap(NULL, {prefix.upper()}_SIZE, PROT_READ | PROT_WRITE, MAP_SHARED | MAP_ANONYMOUS, -1, 0);\n"
+        "    } else {\n"
+        "        int fd = open(path, O_RDWR | O_CREAT, 0644);\n"
+        "        if (fd < 0) {\n"
+        "            perror(path);\n"
+        "            return -1;\n"
+        "        }\n"
+        f"        if (ftruncate(fd, {prefix.upper()}_SIZE) != 0) {{\n"
+        "            perror(path);\n"
+        "            close(fd);\n"
+        "            return -1;\n"
+        "        }\n"
+        f"        mem = mmap(NULL, {prefix.upper()}_SIZE, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);\n"
+        "        close(fd);\n"
+        "    }\n"
+        "    if (mem == MAP_FAILED) {\n"
+        "        perror(\"mmap\");\n"
+        "        return -1;\n"
+        "    }\n"
+        f"    {prefix}_mem = (volatile uint32_t *)mem;\n"
+        f"    for (i = 0; i < {prefix.upper()}_REG_COUNT; i++) {{\n"
+        f"        {prefix}_mem[{prefix}_regs[i].offset / 4] = {prefix}_regs[i].reset;\n"
+        "    }\n"
+        "    return 0;\n"
+        "}\n\n"
+        f"void {prefix}_close(void) {{\n"
+        f"    if ({prefix}_mem != NULL) {{\n"
+        f"        munmap((void *){prefix}_mem, {prefix.upper()}_SIZE);\n"
+        f"        {prefix}_mem = NULL;\n"
+        "    }\n"
+        "}\n\n"
+        "/* 查找地址对应的寄存器，首次访问时按环境变量 REG_HOST_FILE 映射寄存器窗口 */\n"
+        f"static const {prefix}_desc_t *{prefix}_find(uint32_t address) {{\n"
+        f"    uint32_t offset = address - {prefix.upper()}_BASE;\n"
+        "    uint32_t lo = 0;\n"
+        f"    uint32_t hi = {prefix.upper()}_REG_COUNT;\n"
+        f"    if ({prefix}_mem == NULL && {prefix}_init(getenv(\"REG_HOST_FILE\")) != 0) {{\n"
+        "        exit(2);\n"
+        "    }\n"
+        "    while (lo < hi) {\n"
+        "        uint32_t mid = lo + (hi - lo) / 2;\n"
+        f"        if ({prefix}_regs[mid].offset < offset) {{\n"
+        "            lo = mid + 1;\n"
+        "        } else {\n"
+        "            hi = mid;\n"
+        "        }\n"
+        "    }\n"
+        f"    if (lo < {prefix.upper()}_REG_COUNT && {prefix}_regs[lo].offset == offset) {{\n"
+        f"        return &{prefix}_regs[lo];\n"
+        "    }\n"
+        f"    {prefix}_bus_errors++;\n"
+        f"    fprintf(stderr, \"{module_name}: address 0x%08X is not mapped to any register\\n\", (unsigned)address);\n"
+        "    return NULL;\n"
+        "}\n\n"
+        "uint32_t read_reg(uint32_t address) {\n"
+        f"    const {prefix}_desc_t *reg = {prefix}_find(address);\n"
+        "    if (reg == NULL) {\n"
+        "        return 0;\n"
+        "    }\n"
+        f"    return {prefix}_mem[reg->offset / 4] & reg->read_mask;\n"
+        "}\n\n"
+        "void write_reg(uint32_t address, uint32_t value) {\n"
+        f"    const {prefix}_desc_t *reg = {prefix}_find(address);\n"
+        "    uint32_t current;\n"
+        "    if (reg == NULL) {\n"
+        "        return;\n"
+        "    }\n"
+        f"    current = {prefix}_mem[reg->offset / 4];\n"
+        "    current = (current & ~reg->write_mask) | (value & reg->write_mask);\n"
+        "    current &= ~(value & reg->clear_mask);\n"
+        "    current |= value & reg->set_mask;\n"
+        f"    {prefix}_mem[reg->offset / 4] = current;\n"
+        "}\n\n"
+        f"#endif /* {guard} */\n"
+    )
+
 if __name__ == "__main__":
-    if len(sys.argv) != 4:
-        print("用法: python json2ctest_reg.py <json_file> <base_address> --test_code_file <test_code_file>")
-        sys.exit(1)
+    # 创建命令行参数解析器
+    parser = argparse.ArgumentParser(description="将 JSON 文件转换为寄存器读写测试 C 代码。")
+    parser.add_argument("json_file", help="JSON 文件或 IP-XACT（.xml）文件的路径")
+    parser.add_argument("base_address", help="寄存器基地址，例如 0x10000000")
+    parser.add_argument("--test_code_file", help="测试 C 代码文件的路径", required=True)
+    parser.add_argument("--style", choices=TEST_STYLES, help="测试代码风格：unrolled 逐个寄存器展开，table 生成描述符表和测试循环（代码量与寄存器数无关），默认为 unrolled", default="unrolled")
+    parser.add_argument("--host_shim_file", help="主机仿真头文件的路径。如果提供，则同时生成 MODULE_NAME_host.h，测试代码以 -DREG_HOST_EMULATION 编译后可在 Linux 主机上运行", default=None)
+    parser.add_argument("--template_dir", help="用户模板目录，其中的同名模板（例如 ctest_register.c.tpl）优先于内置模板，默认为只使用内置模板", default=None)
+    parser.add_argument("--cheader_file", help="测试代码包含的 C 头文件路径（按文件名包含），默认为 MODULE_NAME.h", default=None)
+    add_metrics_arguments(parser)
 
-    json_file = sys.argv[1]
-    base_address = sys.argv[2]
-    test_code_file = sys.argv[3]
+    # 解析命令行参数
+    args = parser.parse_args()
 
-    generate_test_code(json_file, base_address, test_code_file)
\ No newline at end of file
+    metrics = metrics_from_args("json2ctest_reg", args)
+    generate_test_code(args.json_file, args.base_address, args.test_code_file, metrics, args.style, args.host_shim_file, args.template_dir,
+                       args.cheader_file)
+    metrics.finish()
\ No newline at end of file
@@ -1,77 +1,163 @@
-import json
 import logging
 import argparse
 import os
+from reg_model import load_register_map, as_registers
+from reg_emit import render, emit_to_file, iter_parallel
+from reg_template import load_template
+from reg_metrics import NULL_METRICS, add_metrics_arguments, metrics_from_args
+from json2rtl_reg import DECODE_MODES, register_slots
 
 # 配置日志记录
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def json_to_ral(json_file="output.json", ral_file=None):
+def json_to_ral(json_file="output.json", ral_file=None, metrics=NULL_METRICS, hdl_path=None, apb_data_width=32, decode="auto", jobs=1, template_dir=None):
     """
     将 JSON 文件转换为 UVM RAL 模型的 SystemVerilog 代码。
 
     Args:
     json_file (str): JSON 文件的路径，默认为 "output.json"。
     ral_file (str, optional): RAL 模型的 SystemVerilog 文件的路径。如果为 None，则使用 MODULE_NAME 加 ral_ 前缀命名，默认为 None。
+    metrics (Metrics): 指标记录器，默认不记录。
+    hdl_path (str, optional): 生成的 RTL 模块实例的层次路径（例如 tb_top.u_dut）。如果提供，则生成后门访问路径。
+    apb_data_width (int): RTL 的 APB 数据宽度，用于计算后门路径，默认为 32。
+    decode (str): RTL 的地址译码方式，用于计算后门路径，默认为 auto。
+    jobs (int): 按寄存器并行生成的进程数，默认为 1（串行），输出与串行逐字节相同。
+    template_dir (str, optional): 用户模板目录，其中的同名模板优先于内置模板。
     """
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        registers = load_register_map(json_file, metrics)
 
-        module_name = data["MODULE_NAME"]
+        module_name = registers.module_name
 
         # 如果 ral_file 为 None，则使用 MODULE_NAME 加 ral_ 前缀命名
         if ral_file is None:
             ral_file = f"ral_{module_name}.sv"
 
-        registers = data["REGISTERS"]
+        # 边生成边写入 RAL 模型文件
+        emit_to_file(iter_ral(module_name, registers, hdl_path, apb_data_width, decode, jobs, template_dir), ral_file, metrics=metrics)
 
-        # 生成寄存器类代码
-        register_classes_code = ""
-        for register in registers:
-            reg_name = f"ral_reg_{register["REG_NAME"]}"  # 添加前缀 ral_reg_
-            reg_width = int(register["WIDTH"])
-            fields = register["FIELDS"]
-            register_classes_code += generate_register_class(reg_name, reg_width, fields)
+        logging.info(f"JSON 文件 '{json_file}' 已成功转换为 RAL 模型文件 '{ral_file}'")
+
+    except FileNotFoundError:
+        logging.error(f"错误：文件 '{json_file}' 未找到。")
+    except Exception as e:
+        logging.exception(f"发生错误：{e}")
+
+def generate_ral(module_name, registers, hdl_path=None, apb_data_width=32, decode="auto", jobs=1, template_dir=None):
+    """
+    根据模块名称和寄存器信息生成完整的 RAL 模型文件内容（寄存器类、寄存器块及文件头尾）。
+
+    Args:
+    module_name (str): 模块名称。
+    registers (RegisterMap | list): 寄存器集合（Register 对象或 JSON 寄存器字典列表）。
+    hdl_path (str, optional): RTL 模块实例的层次路径。如果提供，则生成后门访问路径。
+    apb_data_width (int): RTL 的 APB 数据宽度，默认为 32。
+    decode (str): RTL 的地址译码方式，默认为 auto。
+    template_dir (str, optional): 用户模板目录，其中的同名模板优先于内置模板。
+
+    Returns:
+    str: 生成的 RAL 模型文件内容。
+    """
+    return render(iter_ral(module_name, registers, hdl_path, apb_data_width, decode, jobs, template_dir))
+
+def iter_ral(module_name, registers, hdl_path=None, apb_data_width=32, decode="auto", jobs=1, template_dir=None):
+    """
+    逐段生成完整的 RAL 模型文件，调用方可以边生成边写入文件。
 
-        # 生成 RAL 模型代码
-        ral_model_code = generate_ral_model(module_name, registers)
+    Args:
+    module_name (str): 模块名称。
+    registers (RegisterMap | list): 寄存器集合（Register 对象或 JSON 寄存器字典列表）。
+    hdl_path (str, optional): RTL 模块实例的层次路径。如果提供，则生成后门访问路径。
+    apb_data_width (int): RTL 的 APB 数据宽度，默认为 32。
+    decode (str): RTL 的地址译码方式，默认为 auto。
+    jobs (int): 寄存器类和寄存器配置代码按寄存器分块在进程池中并行生成的进程数，默认为 1（串行）。
+        各块按原顺序拼接，输出与串行逐字节相同。
+    template_dir (str, optional): 用户模板目录。寄存器类由其中的 ral_register_class.sv.tpl 生成，
+        寄存器配置代码由 ral_register_build.sv.tpl 生成，不存在时使用内置模板。
+
+    Yields:
+    str: RAL 模型代码片段。
+    """
+    registers = as_registers(registers)
 
-        # 将宏定义添加到文件开头
-        file_header = f"""`ifndef {module_name.upper()}_RAL_MODEL_SV
+    # 将宏定义添加到文件开头
+    yield f"""`ifndef {module_name.upper()}_RAL_MODEL_SV
 `define {module_name.upper()}_RAL_MODEL_SV
 
 import uvm_pkg::*;
 """
 
-        # 将宏定义添加到文件结尾
-        file_footer = """
+    # 生成寄存器类代码：字段布局相同的寄存器共用第一个寄存器的类，其余寄存器名称用 typedef 指向该类
+    class_names = register_class_names(registers)
+    template = load_template("ral_register_class.sv.tpl", template_dir, __name__)
+    yield from iter_parallel(iter_register_class, [(register, class_names[register.name]) for register in registers], (template,), jobs)
+
+    # 生成 RAL 模型代码
+    yield from iter_ral_model(module_name, registers, hdl_path, apb_data_width, decode, jobs, template_dir)
+
+    # 将宏定义添加到文件结尾
+    yield """
 `endif
 """
 
-        # 写入 RAL 模型文件
-        with open(ral_file, 'w', encoding='utf-8') as f:
-            f.write(file_header + register_classes_code + ral_model_code + file_footer)
-
-        logging.info(f"JSON 文件 '{json_file}' 已成功转换为 RAL 模型文件 '{ral_file}'")
+def iter_register_class(item, template):
+    """
+    生成一个寄存器的 uvm_reg 类；与之前的寄存器共用类时只生成 typedef。
 
-    except FileNotFoundError:
-        logging.error(f"错误：文件 '{json_file}' 未找到。")
-    except Exception as e:
-        logging.exception(f"发生错误：{e}")
+    Args:
+    item (tuple): (Register 对象, register_class_names 给出的类名称)。
+    template (Template): 寄存器类模板，参数为 (类名称, 寄存器宽度, 字段列表)。
 
-def generate_ral_model(module_name, registers):
+    Yields:
+    str: 寄存器类代码片段。
+    """
+    register, class_name = item
+    reg_name = f"ral_reg_{register.name}"  # 添加前缀 ral_reg_
+    if class_name == reg_name:
+        yield from template.render(reg_name, register.width, register.fields)
+    else:
+        yield f"\ntypedef {class_name} {reg_name};\n"
+
+def generate_ral_model(module_name, registers, hdl_path=None, apb_data_width=32, decode="auto", jobs=1, template_dir=None):
     """
     根据模块名称和寄存器信息生成 UVM RAL 模型的 SystemVerilog 代码。
 
     Args:
     module_name (str): 模块名称。
-    registers (list): 寄存器信息列表。
+    registers (RegisterMap | list): 寄存器集合（Register 对象或 JSON 寄存器字典列表）。
+    hdl_path (str, optional): RTL 模块实例的层次路径。如果提供，则生成后门访问路径。
+    apb_data_width (int): RTL 的 APB 数据宽度，默认为 32。
+    decode (str): RTL 的地址译码方式，默认为 auto。
+    template_dir (str, optional): 用户模板目录，其中的同名模板优先于内置模板。
 
     Returns:
     str: 生成的 RAL 模型代码。
     """
-    ral_model_code = f"""
+    return render(iter_ral_model(module_name, registers, hdl_path, apb_data_width, decode, jobs, template_dir))
+
+def iter_ral_model(module_name, registers, hdl_path=None, apb_data_width=32, decode="auto", jobs=1, template_dir=None):
+    """
+    逐段生成 UVM RAL 寄存器块（ral_block_*）的 SystemVerilog 代码。
+
+    提供 hdl_path 时，寄存器块添加该 HDL 路径，每个字段通过 add_hdl_path_slice 映射到
+    json2rtl_reg 生成的 register_data[i] 的相应位，测试可以使用 UVM_BACKDOOR 访问寄存器而不占用总线周期。
+    register_data 的下标与 RTL 使用相同的译码方式计算，因此 apb_data_width 和 decode 必须与生成 RTL 时一致。
+
+    Args:
+    module_name (str): 模块名称。
+    registers (RegisterMap | list): 寄存器集合（Register 对象或 JSON 寄存器字典列表）。
+    hdl_path (str, optional): RTL 模块实例的层次路径（例如 tb_top.u_dut）。如果为 None，则不生成后门访问路径。
+    apb_data_width (int): RTL 的 APB 数据宽度，默认为 32。
+    decode (str): RTL 的地址译码方式，默认为 auto。
+    jobs (int): 按寄存器并行生成寄存器配置代码的进程数，默认为 1（串行）。
+    template_dir (str, optional): 用户模板目录，寄存器配置代码由其中的 ral_register_build.sv.tpl 生成，不存在时使用内置模板。
+
+    Yields:
+    str: RAL 寄存器块代码片段。
+    """
+    registers = as_registers(registers)
+    slots = register_slots(registers, apb_data_width, decode)[1] if hdl_path else None
+    yield f"""
 class ral_block_{module_name} extends uvm_reg_block;
 
     `uvm_object_utils(ral_block_{module_name})
@@ -80,12 +166,12 @@ class ral_block_{module_name} extends uvm_reg_block;
 """
 
     # 添加寄存器句柄
+    class_names = register_class_names(registers)
     for register in registers:
-        reg_name = register["REG_NAME"]
-        ral_reg_name = f"ral_reg_{register["REG_NAME"]}"
-        ral_model_code += f"    rand {ral_reg_name} {reg_name};\n"
+        reg_name = register.name
+        yield f"    rand {class_names[reg_name]} {reg_name};\n"
 
-    ral_model_code += f"""
+    yield f"""
 
     function new (string name = "ral_block_{module_name}");
         super.new(name, UVM_NO_COVERAGE);
@@ -94,91 +180,100 @@ class ral_block_{module_name} extends uvm_reg_block;
     virtual function void build();
 
         this.default_map = create_map("", 0, 4, UVM_LITTLE_ENDIAN, 0);
-        // 创建寄存器
 """
-    # 添加寄存器创建和配置代码
-    for register in registers:
-        ral_reg_name = f"ral_reg_{register["REG_NAME"]}"
-        reg_name = register["REG_NAME"]
-        reg_width = int(register["WIDTH"])
-        reg_aceess = register.get("ACCESS", "RW")  # 默认为 RW
-        reg_address = register["ADDRESS"].replace("0x", "32'h")  # 将 0x 替换为 'h
-        ral_model_code += f"""
-        {reg_name} = {ral_reg_name}::type_id::create("{reg_name}",,get_full_name());
-        {reg_name}.configure(this, null, "{reg_name}");
-        {reg_name}.build();
-        this.default_map.add_reg(this.{reg_name}, {reg_address}, "{reg_aceess}", 0);
+    if hdl_path:
+        yield f"""        // 后门访问路径：寄存器块对应 RTL 模块实例
+        add_hdl_path("{hdl_path}");
+"""
+    yield """        // 创建寄存器
 """
+    # 添加寄存器创建和配置代码
+    items = [(register, class_names[register.name], slots[index] if slots else None) for index, register in enumerate(registers)]
+    template = load_template("ral_register_build.sv.tpl", template_dir, __name__)
+    yield from iter_parallel(iter_register_build, items, (hdl_path, template), jobs)
 
-    ral_model_code += f"""
+    yield """
     endfunction
 
 endclass
 
 """
 
-    return ral_model_code
-
-def generate_register_class(reg_name, reg_width, fields):
+def iter_register_build(item, hdl_path, template):
     """
-    生成 UVM 寄存器类的 SystemVerilog 代码。
+    生成寄存器块 build() 中一个寄存器的创建、配置和地址映射代码，提供 hdl_path 时还生成字段的后门路径切片。
 
     Args:
-    reg_name (str): 寄存器名称。
-    reg_width (int): 寄存器宽度。
-    fields (list): 字段信息列表。
+    item (tuple): (Register 对象, uvm_reg 类名称, register_data 下标)，不生成后门路径时下标为 None。
+    hdl_path (str, optional): RTL 模块实例的层次路径。使用后门路径时，寄存器的 HDL 路径由字段切片给出。
+    template (Template): 寄存器配置模板，参数为 (Register 对象, uvm_reg 类名称, register_data 下标, hdl_path)。
 
     Returns:
-    str: 生成的寄存器类代码。
+    iterator: RAL 寄存器块代码片段生成器。
     """
-    register_class_code = f"""
-class {reg_name} extends uvm_reg;
-    `uvm_object_utils({reg_name})
+    register, ral_reg_name, slot = item
+    return template.render(register, ral_reg_name, slot, hdl_path)
 
-    rand uvm_reg_field {";\n    rand uvm_reg_field ".join([field["NAME"] for field in fields])};
+def register_layout(register):
+    """
+    返回寄存器的字段布局，用于判断两个寄存器能否共用同一个 uvm_reg 类。
 
-    function new (string name = "{reg_name}");
-        super.new(name, {reg_width}, UVM_NO_COVERAGE);
-    endfunction
+    Args:
+    register (Register): 寄存器对象。
 
-    virtual function void build();
-        // 配置字段
-        {"\n        ".join([generate_field_configuration(field, reg_name) for field in fields])}
-    endfunction
+    Returns:
+    tuple: 寄存器宽度和每个字段的名称、宽度、LSB、访问类型、复位值。
+    """
+    return (register.width, tuple((field.name, field.width, field.lsb, field.access, field.reset) for field in register.fields))
 
-endclass
-"""
-    return register_class_code
+def register_class_names(registers):
+    """
+    按字段布局对寄存器去重，返回寄存器名称到 uvm_reg 类名称的映射。
+    每种布局只生成一个类，以第一个使用该布局的寄存器命名（ral_reg_<寄存器名>）。
+
+    Args:
+    registers (RegisterMap | list): Register 对象序列。
+
+    Returns:
+    dict: 寄存器名称 -> 类名称。
+    """
+    layouts = {}
+    class_names = {}
+    for register in registers:
+        class_names[register.name] = layouts.setdefault(register_layout(register), f"ral_reg_{register.name}")
+    return class_names
 
-def generate_field_configuration(field, reg_name):
+def generate_register_class(reg_name, reg_width, fields, template_dir=None):
     """
-    生成 UVM 寄存器字段的配置代码。
+    生成 UVM 寄存器类的 SystemVerilog 代码，类定义和字段配置由模板 ral_register_class.sv.tpl 给出。
 
     Args:
-    field (dict): 字段信息。
     reg_name (str): 寄存器名称。
+    reg_width (int): 寄存器宽度。
+    fields (list): 字段信息列表（Field 对象）。
+    template_dir (str, optional): 用户模板目录，其中的同名模板优先于内置模板。
 
     Returns:
-    str: 生成的字段配置代码。
+    str: 生成的寄存器类代码。
     """
-    field_name = field["NAME"]
-    field_width = int(field["WIDTH"])
-    field_reset = field["RESET"].replace("0x", "'h")  # 将 0x 替换为 'h
-    field_access = field.get("ACCESS", "RW")  # 默认为 RW
-    field_lsb = field.get("LSB", 0)  # 尝试从 JSON 中获取 LSB，否则默认为 0
-
-    return f"""
-        this.{field_name} = uvm_reg_field::type_id::create("{field_name}");
-        this.{field_name}.configure(this, {field_width}, {field_lsb}, "{field_access}", 0, {field_reset}, 1, 0, 0);"""
+    return render(load_template("ral_register_class.sv.tpl", template_dir, __name__)(reg_name, reg_width, fields))
 
 if __name__ == "__main__":
     # 创建命令行参数解析器
     parser = argparse.ArgumentParser(description="将 JSON 文件转换为 UVM RAL 模型的 SystemVerilog 代码。")
-    parser.add_argument("--json_file", help="JSON 文件的路径，默认为 output.json", default="output.json")
+    parser.add_argument("--json_file", help="JSON 文件或 IP-XACT（.xml）文件的路径，默认为 output.json", default="output.json")
     parser.add_argument("--ral_file", help="RAL 模型的 SystemVerilog 文件的路径。如果省略，则使用 MODULE_NAME 加 ral_ 前缀命名。", default=None)
+    parser.add_argument("--hdl_path", help="RTL 模块实例的层次路径（例如 tb_top.u_dut）。如果提供，则生成后门访问路径，默认为不生成。", default=None)
+    parser.add_argument("--apb_data_width", type=int, help="RTL 的 APB 数据宽度，用于计算后门访问路径，默认为 32", default=32)
+    parser.add_argument("--decode", choices=DECODE_MODES, help="RTL 的地址译码方式，用于计算后门访问路径，默认为 auto", default="auto")
+    parser.add_argument("--jobs", type=int, help="按寄存器并行生成的进程数，输出与串行相同，默认为 1（串行），0 表示使用 CPU 核数", default=1)
+    parser.add_argument("--template_dir", help="用户模板目录，其中的同名模板（例如 ral_register_class.sv.tpl）优先于内置模板，默认为只使用内置模板", default=None)
+    add_metrics_arguments(parser)
 
     # 解析命令行参数
     args = parser.parse_args()
 
     # 调用 json_to_ral 函数
-    json_to_ral(args.json_file, args.ral_file)
\ No newline at end of file
+    metrics = metrics_from_args("json2ral_reg", args)
+    json_to_ral(args.json_file, args.ral_file, metrics, args.hdl_path, args.apb_data_width, args.decode, args.jobs, args.template_dir)
+    metrics.finish()
\ No newline at end of file
@@ -1,12 +1,43 @@
-import json
 import logging
 import argparse
 import os
+from reg_model import load_register_map, as_registers
+from collections import Counter
+from reg_emit import render, emit_to_file, iter_parallel
+from reg_template import load_template
+from reg_metrics import NULL_METRICS, add_metrics_arguments, metrics_from_args
 
 # 配置日志记录
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def json_to_verilog(json_file, verilog_file=None, apb_data_width=32):
+# 地址译码方式：
+#   flat   - 每个寄存器与完整 32 位地址比较（寄存器较少时最简单）
+#   direct - 地址窗口稠密时，直接用字地址低位索引 register_data
+#   banked - 地址稀疏时，先按地址高位选择分组，再在组内按低位译码
+#   auto   - 根据寄存器数量和地址分布自动选择
+DECODE_MODES = ("auto", "flat", "direct", "banked")
+# auto 模式下，寄存器数不超过该值时使用 flat 译码
+FLAT_DECODE_MAX_REGISTERS = 16
+# auto 模式下，direct 译码窗口的槽位数不超过寄存器数的该倍数时视为稠密
+DIRECT_DECODE_MAX_SPARSITY = 2
+
+# 读数据通路的流水方式及读操作的流水延迟（等待周期数）：
+#   none   - setup 阶段完成译码和读选择，无等待周期
+#   decode - 寄存译码结果，access 阶段选择读数据
+#   full   - 寄存译码结果，读多路选择器拆为两级并寄存第一级
+#   auto   - 根据寄存器数量自动选择
+READ_PIPELINE_MODES = ("auto", "none", "decode", "full")
+READ_PIPELINE_LATENCY = {"none": 0, "decode": 1, "full": 2}
+# auto 模式下，寄存器数不少于该值时使用 full 流水
+FULL_PIPELINE_MIN_REGISTERS = 256
+# 等待周期计数器为 8 位，流水延迟加等待周期数不超过 255
+MAX_WAIT_STATES = 253
+
+# 总线接口：apb 为 APB 从机，axi4lite 为读写通道相互独立、每周期可接收一次读和一次写的 AXI4-Lite 从机
+BUS_PROTOCOLS = ("apb", "axi4lite")
+
+def json_to_verilog(json_file, verilog_file=None, apb_data_width=32, decode="auto", metrics=NULL_METRICS, read_pipeline="auto", wait_states=0,
+                    bus="apb", skid_buffer=False, jobs=1, template_dir=None):
     """
     将 JSON 文件转换为支持 APB 接口访问寄存器的 RTL Verilog 代码。
 
@@ -14,25 +45,26 @@ def json_to_verilog(json_file, verilog_file=None, apb_data_width=32):
         json_file (str): JSON 文件的路径。
         verilog_file (str, optional): Verilog 文件的路径。如果为 None，则使用 MODULE_NAME 作为文件名，默认为 None。
         apb_data_width (int): APB 数据宽度，默认为 32。
+        decode (str): 地址译码方式，取值见 DECODE_MODES，默认为 auto。
+        metrics (Metrics): 指标记录器，默认不记录。
+        read_pipeline (str): 读数据流水方式，取值见 READ_PIPELINE_MODES，默认为 auto。
+        wait_states (int): 每次传输额外插入的等待周期数，默认为 0。
+        bus (str): 总线接口，取值见 BUS_PROTOCOLS，默认为 apb。
+        skid_buffer (bool): AXI4-Lite 接口是否在地址和写数据通道插入 skid buffer，默认为 False。
+        jobs (int): 按寄存器并行生成的进程数，默认为 1（串行），输出与串行逐字节相同。
+        template_dir (str, optional): 用户模板目录，其中的同名模板优先于内置模板。
     """
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        registers = load_register_map(json_file, metrics)
 
-        module_name = data["MODULE_NAME"]
+        module_name = registers.module_name
 
         # 如果 verilog_file 为 None，则使用 MODULE_NAME 作为文件名
         if verilog_file is None:
             verilog_file = f"{module_name}.v"
 
-        registers = data["REGISTERS"]
-
-        # 生成 Verilog 代码
-        verilog_code = generate_verilog(module_name, registers, apb_data_width)
-
-        # 写入 Verilog 文件
-        with open(verilog_file, 'w', encoding='utf-8') as f:
-            f.write(verilog_code)
+        # 边生成边写入 Verilog 文件
+        emit_to_file(iter_verilog(module_name, registers, apb_data_width, decode, read_pipeline, wait_states, bus, skid_buffer, jobs, template_dir), verilog_file, metrics=metrics)
 
         logging.info(f"JSON 文件 '{json_file}' 已成功转换为 Verilog 文件 '{verilog_file}'")
 
@@ -41,21 +73,88 @@ def json_to_verilog(json_file, verilog_file=None, apb_data_width=32):
     except Exception as e:
         logging.exception(f"发生错误：{e}")
 
-def generate_verilog(module_name, registers, apb_data_width):
+def generate_verilog(module_name, registers, apb_data_width, decode="auto", read_pipeline="auto", wait_states=0, bus="apb", skid_buffer=False, jobs=1,
+                     template_dir=None):
     """
     根据模块名称和寄存器信息生成 Verilog 代码。
 
     Args:
         module_name (str): 模块名称。
-        registers (list): 寄存器信息列表。
+        registers (RegisterMap | list): 寄存器集合（Register 对象或 JSON 寄存器字典列表）。
         apb_data_width (int): APB 数据宽度。
+        decode (str): 地址译码方式，取值见 DECODE_MODES，默认为 auto。
+        read_pipeline (str): 读数据流水方式，取值见 READ_PIPELINE_MODES，默认为 auto。
+        wait_states (int): 每次传输额外插入的等待周期数，默认为 0。
+        bus (str): 总线接口，取值见 BUS_PROTOCOLS，默认为 apb。
+        skid_buffer (bool): AXI4-Lite 接口是否插入 skid buffer，默认为 False。
+        jobs (int): 按寄存器并行生成的进程数，默认为 1（串行）。
+        template_dir (str, optional): 用户模板目录，其中的同名模板优先于内置模板。
 
     Returns:
         str: 生成的 Verilog 代码。
     """
+    return render(iter_verilog(module_name, registers, apb_data_width, decode, read_pipeline, wait_states, bus, skid_buffer, jobs, template_dir))
+
+def iter_verilog(module_name, registers, apb_data_width, decode="auto", read_pipeline="auto", wait_states=0, bus="apb", skid_buffer=False, jobs=1,
+                 template_dir=None):
+    """
+    逐段生成 Verilog 代码，调用方可以边生成边写入文件，内存占用与寄存器数量无关。
+
+    Args:
+        module_name (str): 模块名称。
+        registers (RegisterMap | list): 寄存器集合（Register 对象或 JSON 寄存器字典列表）。
+        apb_data_width (int): APB 数据宽度。
+        decode (str): 地址译码方式，取值见 DECODE_MODES，默认为 auto。
+        read_pipeline (str): 读数据通路的流水方式，取值见 READ_PIPELINE_MODES，默认为 auto。
+        wait_states (int): 每次传输额外插入的等待周期数，作为模块参数 WAIT_STATES 的默认值，默认为 0。仅 APB 接口支持。
+        bus (str): 总线接口，取值见 BUS_PROTOCOLS，默认为 apb。两种接口共用寄存器存储、地址译码和字段端口。
+        skid_buffer (bool): AXI4-Lite 接口是否在 AW、W、AR 通道插入 skid buffer，使 READY 由寄存器驱动，
+            切断 BREADY/RREADY 到 AWREADY/WREADY/ARREADY 的组合路径，默认为 False。
+        jobs (int): 字段端口、逐寄存器译码和字段赋值按寄存器分块在进程池中并行生成的进程数，
+            默认为 1（串行）。各块按原顺序拼接，输出与串行逐字节相同。
+        template_dir (str, optional): 用户模板目录。字段端口由其中的 rtl_register_ports.v.tpl 生成，
+            字段赋值由 rtl_field_assigns.v.tpl 生成，不存在时使用内置模板。
+
+    Yields:
+        str: Verilog 代码片段，依次拼接即为完整的 Verilog 文件。
+
+    Raises:
+        ValueError: 译码方式、流水方式、总线接口或等待周期数无效，或寄存器地址不满足 direct 译码的要求。
+    """
+    registers = as_registers(registers)
+
+    if bus not in BUS_PROTOCOLS:
+        raise ValueError(f"无效的总线接口：{bus}")
+    if bus == "axi4lite":
+        if wait_states:
+            raise ValueError("AXI4-Lite 接口不支持等待周期，由 VALID/READY 握手控制时序")
+        if apb_data_width not in (32, 64):
+            raise ValueError(f"AXI4-Lite 数据宽度必须为 32 或 64：{apb_data_width}")
+
+    decode, slots, window = register_slots(registers, apb_data_width, decode)
+    logging.info(f"地址译码方式：{decode}")
+    if read_pipeline not in READ_PIPELINE_MODES:
+        raise ValueError(f"无效的读数据流水方式：{read_pipeline}")
+    if read_pipeline == "auto":
+        read_pipeline = choose_read_pipeline(registers)
+    logging.info(f"读数据流水方式：{read_pipeline}")
+    if not 0 <= wait_states <= MAX_WAIT_STATES:
+        raise ValueError(f"等待周期数必须在 0 到 {MAX_WAIT_STATES} 之间：{wait_states}")
+
+    depth = max(slots) + 1 if slots else 0
+    # register_data 下标位宽：direct 译码时为地址窗口的索引位宽
+    index_width = window[1] if decode == "direct" else max((depth - 1).bit_length(), 1)
+
+    # 模块参数和端口定义
+    if bus == "axi4lite":
+        yield axi_ports(module_name, apb_data_width)
+    else:
+        yield f"""
+module {module_name} #(
+    // 每次传输在流水延迟之外额外插入的等待周期数（0 到 {MAX_WAIT_STATES}）
+    parameter integer WAIT_STATES = {wait_states}
+) (
 
-    # 模块端口定义
-    port_list = f"""
     input wire PCLK,
     input wire PRESETn,
     input wire PSEL,
@@ -68,182 +167,765 @@ def generate_verilog(module_name, registers, apb_data_width):
     output wire PSLVERROR,
     """
 
-    # 添加寄存器字段端口
+    # 添加寄存器字段端口（最后一个端口后不加逗号）
+    yield from iter_parallel(iter_register_ports, registers, (load_template("rtl_register_ports.v.tpl", template_dir, __name__),), jobs, ",\n")
+
+    yield """
+
+);
+"""
+
+    # 寄存器地址定义
     for register in registers:
-        reg_name = register["REG_NAME"]
-        reg_type = register["REG_TYPE"]
-        fields = register["FIELDS"]  # 获取字段信息
+        yield f"    localparam ADDR_{register.name.upper()} = 32'h{register.address:x};\n"
 
-        for field in fields:
-            field_name = field["NAME"]
-            field_width = field["WIDTH"]
+    # full 流水时读多路选择器按 2^READ_GROUP_BITS 个寄存器分组，register_data 补齐到整组
+    if read_pipeline == "full":
+        group_bits = (index_width + 1) // 2
+        group_count = (depth + (1 << group_bits) - 1) >> group_bits
+        storage_depth = group_count << group_bits
+    else:
+        storage_depth = depth
+
+    # 内部信号定义（寄存器存储由两种总线接口共用）
+    yield f"""
+    reg [{apb_data_width}-1:0] register_data [0:{storage_depth - 1}];
+    """
 
-            if reg_type == "RO":
-                port_list += f"    input wire [{int(field_width) - 1}:0] {reg_name}_{field_name}_i,\n"
-            else:
-                port_list += f"    output wire [{int(field_width) - 1}:0] {reg_name}_{field_name}_o,\n"
+    # 地址译码（组合逻辑），得到是否命中、register_data 下标和是否可写
+    # APB 译码 PADDR；AXI4-Lite 的写地址和读地址各用一个译码器，读写可以在同一周期进行
+    if bus == "axi4lite":
+        yield from iter_axi_frontend(apb_data_width, skid_buffer)
+        decoders = [("wr_addr", "wr"), ("rd_addr", "rd")]
+    else:
+        decoders = [("PADDR", "dec")]
+    if decode == "direct":
+        yield from iter_direct_decode_params(registers, apb_data_width, slots, window)
+    bank_lsb = banked_decode_split(registers, apb_data_width) if decode == "banked" else None
+    for addr, prefix in decoders:
+        if decode == "direct":
+            yield from iter_direct_decode(apb_data_width, addr, prefix, index_width)
+        elif decode == "banked":
+            yield from iter_banked_decode(registers, addr, prefix, index_width, bank_lsb, jobs)
+        else:
+            yield from iter_flat_decode(registers, addr, prefix, index_width, jobs)
+
+    # 总线握手和读写数据通路
+    if bus == "axi4lite":
+        yield from iter_axi_datapath(apb_data_width, slots, index_width, read_pipeline, storage_depth)
+    else:
+        yield from iter_apb_slave(apb_data_width, slots, index_width, read_pipeline, storage_depth)
 
-    # Remove the last comma and newline
-    port_list = port_list.rstrip(",\n") + "\n"
+    # 添加字段输出赋值（字段位置已在寄存器模型中计算）
+    yield from iter_parallel(iter_field_assigns, zip(slots, registers), (load_template("rtl_field_assigns.v.tpl", template_dir, __name__),), jobs)
 
-    ports = f"""
-module {module_name} (
-{port_list}
-);
+    # 模块结束
+    yield """
+endmodule
 """
 
-    # 寄存器地址定义
-    address_definitions = ""
+def iter_register_ports(register, template):
+    """
+    生成一个寄存器的字段端口声明，端口之间以逗号分隔，末尾不加逗号。RO 寄存器的字段为输入，其余为输出。
+
+    Args:
+        register (Register): 寄存器对象。
+        template (Template): 字段端口模板，参数为 (Register 对象)。
+
+    Returns:
+        iterator: Verilog 代码片段生成器。
+    """
+    return template.render(register)
+
+def iter_field_assigns(item, template):
+    """
+    生成一个寄存器的字段赋值：RO 寄存器将输入值赋给 register_data 的相应位，其余寄存器将相应位赋给输出。
+
+    Args:
+        item (tuple): (register_data 下标, Register 对象)。
+        template (Template): 字段赋值模板，参数为 (register_data 下标, Register 对象)。
+
+    Returns:
+        iterator: Verilog 代码片段生成器。
+    """
+    return template.render(*item)
+
+def register_slots(registers, apb_data_width, decode="auto"):
+    """
+    确定译码方式和每个寄存器在 register_data 中的下标：direct 译码时为地址窗口中的槽位，其余为寄存器顺序。
+    RAL 的后门访问路径使用同一函数，保证与生成的 RTL 一致。
+
+    Args:
+        registers (RegisterMap | list): 寄存器集合。
+        apb_data_width (int): APB 数据宽度。
+        decode (str): 地址译码方式，取值见 DECODE_MODES，默认为 auto。
+
+    Returns:
+        tuple: (实际译码方式, 下标列表, direct 译码的地址窗口或 None)。
+
+    Raises:
+        ValueError: 译码方式无效，或寄存器地址不满足 direct 译码的要求。
+    """
+    if decode not in DECODE_MODES:
+        raise ValueError(f"无效的地址译码方式：{decode}")
+    if decode == "auto":
+        decode = choose_decode(registers, apb_data_width)
+
+    if decode == "direct":
+        window = direct_decode_window(registers, apb_data_width)
+        if window is None:
+            raise ValueError("寄存器地址未按字对齐或存在重复地址，无法使用 direct 译码")
+        slots = [(register.address - window[0]) >> word_address_bits(apb_data_width) for register in registers]
+    else:
+        window = None
+        slots = list(range(len(registers)))
+    return decode, slots, window
+
+def word_address_bits(apb_data_width):
+    """返回 APB 数据宽度对应的字内字节地址位数，例如 32 位数据宽度为 2。"""
+    return max(apb_data_width // 8 - 1, 0).bit_length()
+
+def direct_decode_window(registers, apb_data_width):
+    """
+    计算 direct 译码的地址窗口。窗口大小为 2 的幂并按自身大小对齐，
+    寄存器在窗口中的槽位为 (地址 - 窗口基址) >> 字内字节地址位数。
+
+    Args:
+        registers (RegisterMap | list): 寄存器集合。
+        apb_data_width (int): APB 数据宽度。
+
+    Returns:
+        tuple | None: (窗口基址, 索引位宽)。寄存器地址未按字对齐或存在重复地址时返回 None。
+    """
+    lsb = word_address_bits(apb_data_width)
+    addresses = [register.address for register in registers]
+    if not addresses or len(set(addresses)) != len(addresses):
+        return None
+    if any(address & ((1 << lsb) - 1) for address in addresses):
+        return None
+
+    low, high = min(addresses), max(addresses)
+    width = max(((high - low) >> lsb).bit_length(), 1)
+    # 对齐后窗口可能无法覆盖最高地址，此时扩大一倍
+    while True:
+        base = low & ~((1 << (lsb + width)) - 1)
+        if high < base + (1 << (lsb + width)):
+            break
+        width += 1
+    if lsb + width >= 32:
+        return None
+    return base, width
+
+def banked_decode_split(registers, apb_data_width):
+    """
+    选择两级译码的分组位置：PADDR[31:bank_lsb] 选择分组，PADDR[bank_lsb-1:0] 在组内译码。
+    取“分组数 + 最大组内寄存器数”最小的位置，使两级比较器的规模都接近寄存器数的平方根。
+
+    Args:
+        registers (RegisterMap | list): 寄存器集合。
+        apb_data_width (int): APB 数据宽度。
+
+    Returns:
+        int: 分组地址的最低位。
+    """
+    best = None
+    for bank_lsb in range(word_address_bits(apb_data_width) + 1, 32):
+        banks = Counter(register.address >> bank_lsb for register in registers)
+        cost = len(banks) + max(banks.values(), default=0)
+        if best is None or cost < best[0]:
+            best = (cost, bank_lsb)
+    return best[1]
+
+def choose_decode(registers, apb_data_width):
+    """
+    根据寄存器数量和地址分布选择译码方式：寄存器较少时使用 flat，
+    地址窗口稠密时使用 direct，否则使用 banked。
+
+    Args:
+        registers (RegisterMap | list): 寄存器集合。
+        apb_data_width (int): APB 数据宽度。
+
+    Returns:
+        str: 译码方式。
+    """
+    if len(registers) <= FLAT_DECODE_MAX_REGISTERS:
+        return "flat"
+    window = direct_decode_window(registers, apb_data_width)
+    if window is not None:
+        base, _ = window
+        span = ((max(register.address for register in registers) - base) >> word_address_bits(apb_data_width)) + 1
+        if span <= DIRECT_DECODE_MAX_SPARSITY * len(registers):
+            return "direct"
+    return "banked"
+
+def choose_read_pipeline(registers):
+    """
+    根据寄存器数量选择读数据流水方式：寄存器较少时使用 none（无额外等待周期），
+    寄存器较多时寄存译码结果（decode），寄存器很多时再将读多路选择器拆为两级（full）。
+
+    Args:
+        registers (RegisterMap | list): 寄存器集合。
+
+    Returns:
+        str: 读数据流水方式。
+    """
+    if len(registers) <= FLAT_DECODE_MAX_REGISTERS:
+        return "none"
+    if len(registers) < FULL_PIPELINE_MIN_REGISTERS:
+        return "decode"
+    return "full"
+
+def decode_outputs(prefix, index_width):
+    """返回译码器输出信号的声明。"""
+    return f"""
+    reg {prefix}_hit;
+    reg [{index_width}-1:0] {prefix}_index;
+    reg {prefix}_writable;
+"""
+
+def iter_flat_decode(registers, addr, prefix, index_width, jobs=1):
+    """
+    逐段生成 flat 译码器：地址与每个寄存器的完整地址比较。
+
+    Args:
+        registers (RegisterMap | list): 寄存器集合。
+        addr (str): 被译码的地址信号名称。
+        prefix (str): 译码器输出信号的前缀，输出为 {prefix}_hit、{prefix}_index、{prefix}_writable。
+        index_width (int): register_data 下标位宽。
+        jobs (int): 按寄存器并行生成的进程数，默认为 1（串行）。
+
+    Yields:
+        str: Verilog 代码片段。
+    """
+    yield decode_outputs(prefix, index_width)
+    yield f"""
+    // flat 译码：{addr} 与每个寄存器的完整地址比较
+    always @* begin
+        {prefix}_hit = 1'b0;
+        {prefix}_index = {index_width}'d0;
+        {prefix}_writable = 1'b0;
+        case ({addr})
+"""
+    yield from iter_parallel(iter_flat_decode_case, enumerate(registers), (prefix, index_width), jobs)
+    yield """            default: ;
+        endcase
+    end
+"""
+
+def iter_flat_decode_case(item, prefix, index_width):
+    """生成 flat 译码器中一个寄存器的 case 分支，item 为 (register_data 下标, Register 对象)。"""
+    i, register = item
+    writable = 1 if register.type == "RW" else 0
+    yield f"            ADDR_{register.name.upper()}: begin {prefix}_hit = 1'b1; {prefix}_index = {index_width}'d{i}; {prefix}_writable = 1'b{writable}; end\n"
+
+def iter_direct_decode_params(registers, apb_data_width, slots, window):
+    """
+    逐段生成 direct 译码的地址窗口参数和槽位表，同一模块中的多个 direct 译码器共用。
+
+    Args:
+        registers (RegisterMap | list): 寄存器集合。
+        apb_data_width (int): APB 数据宽度。
+        slots (list): 每个寄存器在地址窗口中的槽位。
+        window (tuple): direct_decode_window 返回的 (窗口基址, 索引位宽)。
+
+    Yields:
+        str: Verilog 代码片段。
+    """
+    base, width = window
+    lsb = word_address_bits(apb_data_width)
+    slot_count = 1 << width
+    valid = 0
+    writable = 0
+    for slot, register in zip(slots, registers):
+        valid |= 1 << slot
+        if register.type == "RW":
+            writable |= 1 << slot
+
+    yield f"""
+    // direct 译码：地址[{lsb + width - 1}:{lsb}] 直接作为 register_data 的下标
+    localparam DECODE_BASE = 32'h{base:x};
+    localparam DECODE_LSB = {lsb};
+    localparam DECODE_WIDTH = {width};
+    // 地址窗口中每个槽位是否存在寄存器、是否可写
+    localparam [{slot_count}-1:0] SLOT_VALID = {slot_count}'h{valid:x};
+    localparam [{slot_count}-1:0] SLOT_WRITABLE = {slot_count}'h{writable:x};
+"""
+
+def iter_direct_decode(apb_data_width, addr, prefix, index_width):
+    """
+    逐段生成 direct 译码器：用字地址低位直接索引 register_data，
+    高位只与窗口基址比较一次，比较器规模与寄存器数量无关。参数见 iter_direct_decode_params。
+
+    Args:
+        apb_data_width (int): APB 数据宽度。
+        addr (str): 被译码的地址信号名称。
+        prefix (str): 译码器输出信号的前缀。
+        index_width (int): register_data 下标位宽，等于 DECODE_WIDTH。
+
+    Yields:
+        str: Verilog 代码片段。
+    """
+    aligned = f" && ({addr}[DECODE_LSB-1:0] == 0)" if word_address_bits(apb_data_width) else ""
+    yield decode_outputs(prefix, index_width)
+    yield f"""
+    always @* begin
+        {prefix}_index = {addr}[DECODE_LSB+DECODE_WIDTH-1:DECODE_LSB];
+        {prefix}_hit = ({addr}[31:DECODE_LSB+DECODE_WIDTH] == DECODE_BASE[31:DECODE_LSB+DECODE_WIDTH]){aligned} && SLOT_VALID[{prefix}_index];
+        {prefix}_writable = SLOT_WRITABLE[{prefix}_index];
+    end
+"""
+
+def iter_banked_decode(registers, addr, prefix, index_width, bank_lsb, jobs=1):
+    """
+    逐段生成 banked 译码器：第一级按地址高位选择分组，
+    第二级只比较组内低位，避免对每个寄存器都比较完整的 32 位地址。
+
+    Args:
+        registers (RegisterMap | list): 寄存器集合。
+        addr (str): 被译码的地址信号名称。
+        prefix (str): 译码器输出信号的前缀。
+        index_width (int): register_data 下标位宽。
+        bank_lsb (int): 分组地址的最低位，见 banked_decode_split。
+        jobs (int): 按分组并行生成的进程数，默认为 1（串行）。
+
+    Yields:
+        str: Verilog 代码片段。
+    """
+    banks = {}
     for i, register in enumerate(registers):
-        address = register["ADDRESS"].replace("0x", "32'h")
-        reg_name = register["REG_NAME"]
-        address_definitions += f"    localparam ADDR_{reg_name.upper()} = {address};\n"
+        banks.setdefault(register.address >> bank_lsb, []).append((i, register))
+
+    yield decode_outputs(prefix, index_width)
+    yield f"""
+    // banked 译码：{addr}[31:{bank_lsb}] 选择分组（共 {len(banks)} 组），{addr}[{bank_lsb - 1}:0] 在组内译码
+    always @* begin
+        {prefix}_hit = 1'b0;
+        {prefix}_index = {index_width}'d0;
+        {prefix}_writable = 1'b0;
+        case ({addr}[31:{bank_lsb}])
+"""
+    bank_items = [(bank, banks[bank]) for bank in sorted(banks)]
+    yield from iter_parallel(iter_bank_cases, bank_items, (addr, prefix, index_width, bank_lsb), jobs)
+    yield """            default: ;
+        endcase
+    end
+"""
+
+def iter_bank_cases(item, addr, prefix, index_width, bank_lsb):
+    """生成 banked 译码器中一个分组的 case 分支，item 为 (分组号, [(register_data 下标, Register 对象), ...])。"""
+    bank, members = item
+    offset_mask = (1 << bank_lsb) - 1
+    yield f"""            {32 - bank_lsb}'h{bank:x}: begin
+                case ({addr}[{bank_lsb - 1}:0])
+"""
+    for i, register in members:
+        writable = 1 if register.type == "RW" else 0
+        yield f"                    {bank_lsb}'h{register.address & offset_mask:x}: begin {prefix}_hit = 1'b1; {prefix}_index = {index_width}'d{i}; {prefix}_writable = 1'b{writable}; end // {register.name}\n"
+    yield """                    default: ;
+                endcase
+            end
+"""
+
+def iter_read_path(apb_data_width, index_width, read_pipeline, storage_depth, clock, index, enable=None):
+    """
+    逐段生成 full 流水的第一级读多路选择器：按下标低位在每组寄存器中选择并寄存，
+    第二级只需在各组之间选择，每级多路选择器的深度约为 register_data 深度的平方根。
 
-    # 内部信号定义
-    internal_signals = f"""
-    reg [{apb_data_width}-1:0] register_data [0:{len(registers) - 1}];
+    Args:
+        apb_data_width (int): 数据宽度。
+        index_width (int): register_data 下标位宽。
+        read_pipeline (str): 读数据流水方式，只有 full 时生成代码。
+        storage_depth (int): register_data 深度（已补齐到整组）。
+        clock (str): 时钟信号名称。
+        index (str): 已寄存的读下标信号名称。
+        enable (str, optional): 第一级的使能信号。如果为 None，则每个周期都更新。
+
+    Yields:
+        str: Verilog 代码片段。
+    """
+    if read_pipeline != "full":
+        return
+    group_bits = (index_width + 1) // 2
+    group_count = storage_depth >> group_bits
+    # 第一级选择的 register_data 下标为 {组号, 下标低位}
+    if index_width > group_bits:
+        storage_index = f"{{read_group_i[{index_width - group_bits}-1:0], {index}[READ_GROUP_BITS-1:0]}}"
+    else:
+        storage_index = f"{index}[READ_GROUP_BITS-1:0]"
+    yield f"""
+    // full 流水：第一级在每组 {1 << group_bits} 个寄存器中选择并寄存（共 {group_count} 组），第二级在组间选择
+    localparam READ_GROUP_BITS = {group_bits};
+    reg [{apb_data_width}-1:0] read_group [0:{group_count - 1}];
+    integer read_group_i;
+    always @(posedge {clock}) begin
+        {"" if enable is None else f"if ({enable}) "}for (read_group_i = 0; read_group_i < {group_count}; read_group_i = read_group_i + 1)
+            read_group[read_group_i] <= register_data[{storage_index}];
+    end
+"""
+
+def read_mux(read_pipeline, index, index_width):
+    """返回 decode/full 流水在 access 阶段使用的读多路选择器表达式。"""
+    if read_pipeline == "full":
+        if index_width > (index_width + 1) // 2:
+            return f"read_group[{index}[{index_width}-1:READ_GROUP_BITS]]"
+        return "read_group[0]"
+    return f"register_data[{index}]"
+
+def iter_apb_slave(apb_data_width, slots, index_width, read_pipeline, storage_depth):
+    """
+    逐段生成 APB 握手和寄存器读写逻辑，三种译码方式共用。
+
+    setup 阶段（PSEL && !PENABLE）锁存译码结果；access 阶段等待 READ_LATENCY（只对读）加 WAIT_STATES 个周期后
+    拉高 PREADY，地址未命中时同时拉高 PSLVERROR，不会使总线挂起。写操作在传输完成的周期提交。
+    读数据通路按 read_pipeline 分为：
+      none   - setup 阶段直接由组合译码结果选择读数据，读写均无额外等待周期
+      decode - access 阶段由已寄存的译码结果选择读数据，读操作 1 个等待周期
+      full   - 在 decode 的基础上将读多路选择器拆为两级并寄存第一级，读操作 2 个等待周期
+
+    Args:
+        apb_data_width (int): APB 数据宽度。
+        slots (list): 每个寄存器在 register_data 中的下标。
+        index_width (int): register_data 下标位宽。
+        read_pipeline (str): 读数据流水方式（none、decode 或 full）。
+        storage_depth (int): register_data 深度。
+
+    Yields:
+        str: Verilog 代码片段。
+    """
+    read_latency = READ_PIPELINE_LATENCY[read_pipeline]
+
+    yield from iter_read_path(apb_data_width, index_width, read_pipeline, storage_depth, "PCLK", "dec_index_q")
+    yield f"""
     reg PREADY_reg;
-    reg PSLVERROR_reg;
     reg [{apb_data_width}-1:0] PRDATA_reg;
-    """
 
-    # 寄存器读写逻辑
-    register_rw_logic = f"""
+    // APB 握手：setup 阶段锁存译码结果，access 阶段等待 READ_LATENCY（只对读）加 WAIT_STATES 个周期后拉高 PREADY
+    localparam [7:0] READ_LATENCY = 8'd{read_latency};
+    wire apb_setup = PSEL && !PENABLE;
+    wire apb_access = PSEL && PENABLE;
+    wire [7:0] access_latency = (PWRITE ? 8'd0 : READ_LATENCY) + WAIT_STATES[7:0];
+
+    reg dec_hit_q;
+    reg [{index_width}-1:0] dec_index_q;
+    reg dec_writable_q;
+    reg [7:0] wait_count;
+
     always @(posedge PCLK) begin
         if (!PRESETn) begin
             PREADY_reg <= 1'b0;
-            PSLVERROR_reg <= 1'b0;
             PRDATA_reg <= {apb_data_width}'b0;
+            dec_hit_q <= 1'b0;
+            dec_index_q <= {index_width}'d0;
+            dec_writable_q <= 1'b0;
+            wait_count <= 8'd0;
             // 初始化寄存器
-            {"\n ".join([f"register_data[{i}] <= {apb_data_width}'h0;" for i in range(len(registers))])}
-        end else begin
-            PREADY_reg <= 1'b0;
-            PSLVERROR_reg <= 1'b0;
-            if (PSEL) begin
-                if (PADDR inside {{ {", ".join(["ADDR_" + register["REG_NAME"].upper() for register in registers])} }}) begin
-                    PREADY_reg <= 1'b1;
-                    PSLVERROR_reg <= 1'b0;
-                    if (PWRITE) begin
-                        // 写操作
-                        case (PADDR)
-                            {"\n ".join([generate_write_case(register, i, apb_data_width) for i, register in enumerate(registers)])}
-                            default: begin
-                                PSLVERROR_reg <= 1'b1;
-                            end
-                        endcase
-                    end else begin
-                        // 读操作
-                        case (PADDR)
-                            {"\n ".join([generate_read_case(register, i, apb_data_width) for i, register in enumerate(registers)])}
-                            default: begin
-                                PSLVERROR_reg <= 1'b1;
-                                PRDATA_reg <= {apb_data_width}'b0;
-                            end
-                        endcase
-                    end
-                end else begin
-                    PREADY_reg <= 1'b0;
-                    PSLVERROR_reg <= 1'b1;
-                end
+"""
+    for slot in slots:
+        yield f"            register_data[{slot}] <= {apb_data_width}'h0;\n"
+    yield """        end else begin
+            if (apb_setup) begin
+                dec_hit_q <= dec_hit;
+                dec_index_q <= dec_index;
+                dec_writable_q <= dec_writable;
+                wait_count <= 8'd0;
+                PREADY_reg <= (access_latency == 8'd0);
+"""
+    if read_pipeline == "none":
+        yield f"""                // none 流水：setup 阶段由组合译码结果直接选择读数据
+                PRDATA_reg <= dec_hit ? register_data[dec_index] : {apb_data_width}'b0;
+"""
+    yield """            end else if (apb_access && !PREADY_reg) begin
+                wait_count <= wait_count + 8'd1;
+                PREADY_reg <= (wait_count + 8'd1 == access_latency);
+"""
+    if read_pipeline != "none":
+        yield f"""                PRDATA_reg <= dec_hit_q ? {read_mux(read_pipeline, "dec_index_q", index_width)} : {apb_data_width}'b0;
+"""
+    yield """            end else begin
+                PREADY_reg <= 1'b0;
             end
+            // 写操作在传输完成的周期提交，只读寄存器忽略写入
+            if (apb_access && PREADY_reg && PWRITE && dec_hit_q && dec_writable_q)
+                register_data[dec_index_q] <= PWDATA;
         end
     end
-    """
 
-    # 输出信号赋值
-    output_assignments = """
     assign PREADY = PREADY_reg;
-    assign PSLVERROR = PSLVERROR_reg;
+    assign PSLVERROR = PREADY_reg && !dec_hit_q;
     assign PRDATA = PRDATA_reg;
     """
 
-    # 添加字段输出赋值
-    for i, register in enumerate(registers):
-        reg_name = register["REG_NAME"]
-        reg_type = register["REG_TYPE"]
-        fields = register["FIELDS"]
-
-        # 计算每个字段的起始位
-        bit_offset = 0
-        for field in fields:
-            field_name = field["NAME"]
-            field_width = field["WIDTH"]
-
-            if reg_type == "RO":
-                # 对于 RO 寄存器，将输入值赋值给 register_data 的相应位
-                output_assignments += f" always @* begin register_data[{i}][{bit_offset + field_width - 1}:{bit_offset}] = {reg_name}_{field_name}_i; end\n"
-            else:
-                # 对于 RW 寄存器，将 register_data 的相应位赋值给输出
-                output_assignments += f" assign {reg_name}_{field_name}_o = register_data[{i}][{bit_offset + field_width - 1}:{bit_offset}];\n"
-
-            # 更新下一个字段的起始位
-            bit_offset += field_width
+def axi_ports(module_name, apb_data_width):
+    """
+    返回 AXI4-Lite 从机的模块头和总线端口定义，字段端口由调用方在其后追加。
 
-    # 模块结束
-    module_end = """
-endmodule
-"""
+    Args:
+        module_name (str): 模块名称。
+        apb_data_width (int): 数据宽度（32 或 64）。
 
-    verilog_code = ports + address_definitions + internal_signals + register_rw_logic + output_assignments + module_end
+    Returns:
+        str: Verilog 代码片段。
+    """
+    return f"""
+module {module_name} (
 
-    return verilog_code
+    input wire ACLK,
+    input wire ARESETn,
+    input wire [31:0] AWADDR,
+    input wire [2:0] AWPROT,
+    input wire AWVALID,
+    output wire AWREADY,
+    input wire [{apb_data_width}-1:0] WDATA,
+    input wire [{apb_data_width // 8}-1:0] WSTRB,
+    input wire WVALID,
+    output wire WREADY,
+    output wire [1:0] BRESP,
+    output wire BVALID,
+    input wire BREADY,
+    input wire [31:0] ARADDR,
+    input wire [2:0] ARPROT,
+    input wire ARVALID,
+    output wire ARREADY,
+    output wire [{apb_data_width}-1:0] RDATA,
+    output wire [1:0] RRESP,
+    output wire RVALID,
+    input wire RREADY,
+    """
 
-def generate_write_case(register, index, apb_data_width):
+def iter_axi_frontend(apb_data_width, skid_buffer):
     """
-    生成单个寄存器写操作的 case 语句。
+    逐段生成 AXI4-Lite 的通道接收逻辑，得到写通道的 wr_addr/wr_data/wr_strb 和读通道的 rd_addr，
+    以及本周期是否执行写（wr_go）和读（rd_go）。读写通道相互独立，没有反压时每个周期各接收一次传输。
+
+    不插入 skid buffer 时 READY 为组合逻辑：写在 AW 和 W 同时有效且写响应通道空闲（或本周期被取走）时接收，
+    读在读数据输出级不被 RREADY 阻塞时接收。插入 skid buffer 时每个通道增加一级暂存，
+    READY 只取决于暂存是否为空，后级阻塞时已接收的传输存入暂存，之后优先从暂存中取出。
 
     Args:
-        register (dict): 寄存器信息。
-        index (int): 寄存器索引。
-        apb_data_width (int): APB 数据宽度。
+        apb_data_width (int): 数据宽度。
+        skid_buffer (bool): 是否插入 skid buffer。
 
-    Returns:
-        str: 生成的 case 语句。
-    """
-    reg_name = register["REG_NAME"]
-    reg_type = register["REG_TYPE"]
-    if reg_type == "RW":
-        return f"""
-        ADDR_{reg_name.upper()}: begin
-            register_data[{index}] <= PWDATA;
-        end
-        """
-    else:
-        # 对于 RO 寄存器，忽略写操作
-        return f"""
-        ADDR_{reg_name.upper()}: begin
-            // Read-only register, write ignored
+    Yields:
+        str: Verilog 代码片段。
+    """
+    strb_width = apb_data_width // 8
+    yield """
+    // AXI4-Lite 写响应和读数据输出级
+    reg BVALID_reg;
+    reg [1:0] BRESP_reg;
+    reg RVALID_reg;
+    reg [1:0] RRESP_reg;
+"""
+    yield f"""    reg [{apb_data_width}-1:0] RDATA_reg;
+    // 输出级被占用且本周期不会被取走时阻塞对应通道
+    wire wr_stall = BVALID_reg && !BREADY;
+    wire rd_stall = RVALID_reg && !RREADY;
+"""
+    if not skid_buffer:
+        yield f"""
+    // 无 skid buffer：直接使用总线上的地址和数据
+    wire [31:0] wr_addr = AWADDR;
+    wire [{apb_data_width}-1:0] wr_data = WDATA;
+    wire [{strb_width}-1:0] wr_strb = WSTRB;
+    wire [31:0] rd_addr = ARADDR;
+    wire wr_go = AWVALID && WVALID && !wr_stall;
+    wire rd_go = ARVALID && !rd_stall;
+
+    assign AWREADY = wr_go;
+    assign WREADY = wr_go;
+    assign ARREADY = !rd_stall;
+"""
+        return
+    yield f"""
+    // skid buffer：READY 由暂存是否为空决定，后级阻塞时将已接收的传输存入暂存
+    reg aw_skid_valid;
+    reg [31:0] aw_skid_addr;
+    reg w_skid_valid;
+    reg [{apb_data_width}-1:0] w_skid_data;
+    reg [{strb_width}-1:0] w_skid_strb;
+    reg ar_skid_valid;
+    reg [31:0] ar_skid_addr;
+
+    wire aw_valid = aw_skid_valid || AWVALID;
+    wire w_valid = w_skid_valid || WVALID;
+    wire ar_valid = ar_skid_valid || ARVALID;
+    wire [31:0] wr_addr = aw_skid_valid ? aw_skid_addr : AWADDR;
+    wire [{apb_data_width}-1:0] wr_data = w_skid_valid ? w_skid_data : WDATA;
+    wire [{strb_width}-1:0] wr_strb = w_skid_valid ? w_skid_strb : WSTRB;
+    wire [31:0] rd_addr = ar_skid_valid ? ar_skid_addr : ARADDR;
+    wire wr_go = aw_valid && w_valid && !wr_stall;
+    wire rd_go = ar_valid && !rd_stall;
+
+    assign AWREADY = !aw_skid_valid;
+    assign WREADY = !w_skid_valid;
+    assign ARREADY = !ar_skid_valid;
+
+    always @(posedge ACLK) begin
+        if (!ARESETn) begin
+            aw_skid_valid <= 1'b0;
+            aw_skid_addr <= 32'h0;
+            w_skid_valid <= 1'b0;
+            w_skid_data <= {apb_data_width}'h0;
+            w_skid_strb <= {strb_width}'h0;
+            ar_skid_valid <= 1'b0;
+            ar_skid_addr <= 32'h0;
+        end else begin
+            if (aw_skid_valid) begin
+                if (wr_go) aw_skid_valid <= 1'b0;
+            end else if (AWVALID && !wr_go) begin
+                aw_skid_valid <= 1'b1;
+                aw_skid_addr <= AWADDR;
+            end
+            if (w_skid_valid) begin
+                if (wr_go) w_skid_valid <= 1'b0;
+            end else if (WVALID && !wr_go) begin
+                w_skid_valid <= 1'b1;
+                w_skid_data <= WDATA;
+                w_skid_strb <= WSTRB;
+            end
+            if (ar_skid_valid) begin
+                if (rd_go) ar_skid_valid <= 1'b0;
+            end else if (ARVALID && !rd_go) begin
+                ar_skid_valid <= 1'b1;
+                ar_skid_addr <= ARADDR;
+            end
         end
-        """
+    end
+"""
 
-def generate_read_case(register, index, apb_data_width):
+def iter_axi_datapath(apb_data_width, slots, index_width, read_pipeline, storage_depth):
     """
-    生成单个寄存器读操作的 case 语句。
+    逐段生成 AXI4-Lite 的寄存器读写逻辑，三种译码方式共用，寄存器存储与 APB 接口相同。
 
-    Args:
-        register (dict): 寄存器信息。
-        index (int): 寄存器索引。
-        apb_data_width (int): APB 数据宽度。
+    写通道在 wr_go 的周期按 WSTRB 逐字节写入并给出写响应，地址未命中时返回 SLVERR。
+    读通道是一条在 rd_stall 时整体停顿的流水线，每个周期可接收一次读，读数据在接收后
+    READ_PIPELINE_LATENCY 个周期（加输出级 1 个周期）出现在 R 通道：
+      none   - 接收周期由组合译码结果选择读数据
+      decode - 寄存译码结果，下一周期选择读数据
+      full   - 在 decode 的基础上将读多路选择器拆为两级并寄存第一级
 
-    Returns:
-        str: 生成的 case 语句。
+    Args:
+        apb_data_width (int): 数据宽度。
+        slots (list): 每个寄存器在 register_data 中的下标。
+        index_width (int): register_data 下标位宽。
+        read_pipeline (str): 读数据流水方式（none、decode 或 full）。
+        storage_depth (int): register_data 深度。
+
+    Yields:
+        str: Verilog 代码片段。
     """
-    reg_name = register["REG_NAME"]
-    return f"""
-    ADDR_{reg_name.upper()}: begin
-        PRDATA_reg <= register_data[{index}];
+    yield """
+    // 写通道：按 WSTRB 逐字节写入，只读寄存器忽略写入，地址未命中时返回 SLVERR
+    always @(posedge ACLK) begin
+        if (!ARESETn) begin
+            BVALID_reg <= 1'b0;
+            BRESP_reg <= 2'b00;
+            // 初始化寄存器
+"""
+    for slot in slots:
+        yield f"            register_data[{slot}] <= {apb_data_width}'h0;\n"
+    yield """        end else if (wr_go) begin
+            BVALID_reg <= 1'b1;
+            BRESP_reg <= wr_hit ? 2'b00 : 2'b10;
+            if (wr_hit && wr_writable) begin
+"""
+    for lane in range(apb_data_width // 8):
+        yield f"                if (wr_strb[{lane}]) register_data[wr_index][{lane * 8 + 7}:{lane * 8}] <= wr_data[{lane * 8 + 7}:{lane * 8}];\n"
+    yield """            end
+        end else if (BREADY) begin
+            BVALID_reg <= 1'b0;
+        end
+    end
+"""
+
+    # 读流水线各级：(有效, 命中, 下标)，最后一级驱动 R 通道输出
+    if read_pipeline == "none":
+        stage = ("rd_go", "rd_hit", "rd_index")
+    else:
+        yield f"""
+    // 读流水第 1 级：寄存译码结果
+    reg rd_valid_q;
+    reg rd_hit_q;
+    reg [{index_width}-1:0] rd_index_q;
+    always @(posedge ACLK) begin
+        if (!ARESETn) begin
+            rd_valid_q <= 1'b0;
+            rd_hit_q <= 1'b0;
+            rd_index_q <= {index_width}'d0;
+        end else if (!rd_stall) begin
+            rd_valid_q <= rd_go;
+            rd_hit_q <= rd_hit;
+            rd_index_q <= rd_index;
+        end
+    end
+"""
+        stage = ("rd_valid_q", "rd_hit_q", "rd_index_q")
+    if read_pipeline == "full":
+        yield from iter_read_path(apb_data_width, index_width, read_pipeline, storage_depth, "ACLK", "rd_index_q", "!rd_stall")
+        yield f"""
+    // 读流水第 2 级：与第一级读多路选择器同步推进
+    reg rd_valid_q2;
+    reg rd_hit_q2;
+    reg [{index_width}-1:0] rd_index_q2;
+    always @(posedge ACLK) begin
+        if (!ARESETn) begin
+            rd_valid_q2 <= 1'b0;
+            rd_hit_q2 <= 1'b0;
+            rd_index_q2 <= {index_width}'d0;
+        end else if (!rd_stall) begin
+            rd_valid_q2 <= rd_valid_q;
+            rd_hit_q2 <= rd_hit_q;
+            rd_index_q2 <= rd_index_q;
+        end
+    end
+"""
+        stage = ("rd_valid_q2", "rd_hit_q2", "rd_index_q2")
+        read_data = read_mux(read_pipeline, "rd_index_q2", index_width)
+    else:
+        read_data = f"register_data[{stage[2]}]"
+
+    valid, hit, _ = stage
+    yield f"""
+    // 读数据输出级：RREADY 阻塞时保持，整条读流水线停顿
+    always @(posedge ACLK) begin
+        if (!ARESETn) begin
+            RVALID_reg <= 1'b0;
+            RRESP_reg <= 2'b00;
+            RDATA_reg <= {apb_data_width}'b0;
+        end else if (!rd_stall) begin
+            RVALID_reg <= {valid};
+            RRESP_reg <= {hit} ? 2'b00 : 2'b10;
+            RDATA_reg <= {hit} ? {read_data} : {apb_data_width}'b0;
+        end
     end
+
+    assign BVALID = BVALID_reg;
+    assign BRESP = BRESP_reg;
+    assign RVALID = RVALID_reg;
+    assign RRESP = RRESP_reg;
+    assign RDATA = RDATA_reg;
     """
 
 if __name__ == "__main__":
     # 创建命令行参数解析器
-    parser = argparse.ArgumentParser(description="将 JSON 文件转换为支持 APB 接口访问寄存器的 RTL Verilog 代码。")
-    parser.add_argument("json_file", help="JSON 文件的路径")
+    parser = argparse.ArgumentParser(description="将 JSON 文件转换为支持 APB 或 AXI4-Lite 接口访问寄存器的 RTL Verilog 代码。")
+    parser.add_argument("json_file", help="JSON 文件或 IP-XACT（.xml）文件的路径")
     parser.add_argument("--verilog_file", help="Verilog 文件的路径。如果省略，则使用 MODULE_NAME 作为文件名。", default=None)
-    parser.add_argument("--apb_data_width", type=int, help="APB 数据宽度，默认为 32", default=32)
+    parser.add_argument("--apb_data_width", type=int, help="总线数据宽度，默认为 32", default=32)
+    add_metrics_arguments(parser)
+    parser.add_argument("--decode", choices=DECODE_MODES, help="地址译码方式：flat、direct（稠密地址按低位直接索引）、banked（稀疏地址两级译码），默认为 auto 根据地址分布自动选择", default="auto")
+    parser.add_argument("--read_pipeline", choices=READ_PIPELINE_MODES, help="读数据流水方式：none（无等待周期）、decode（寄存译码结果，读 1 个等待周期）、full（再寄存一级读多路选择器，读 2 个等待周期），默认为 auto 根据寄存器数量自动选择", default="auto")
+    parser.add_argument("--wait_states", type=int, help=f"每次传输额外插入的等待周期数（0 到 {MAX_WAIT_STATES}），作为模块参数 WAIT_STATES 的默认值，默认为 0", default=0)
+    parser.add_argument("--bus", choices=BUS_PROTOCOLS, help="总线接口：apb 或 axi4lite，默认为 apb", default="apb")
+    parser.add_argument("--skid_buffer", action="store_true", help="AXI4-Lite 接口在 AW、W、AR 通道插入 skid buffer，使 READY 由寄存器驱动")
+    parser.add_argument("--template_dir", help="用户模板目录，其中的同名模板（例如 rtl_register_ports.v.tpl）优先于内置模板，默认为只使用内置模板", default=None)
+    parser.add_argument("--jobs", type=int, help="按寄存器并行生成的进程数，输出与串行相同，默认为 1（串行），0 表示使用 CPU 核数", default=1)
 
     # 解析命令行参数
     args = parser.parse_args()
 
     # 调用 json_to_verilog 函数
-    json_to_verilog(args.json_file, args.verilog_file, args.apb_data_width)
\ No newline at end of file
+    metrics = metrics_from_args("json2rtl_reg", args)
+    json_to_verilog(args.json_file, args.verilog_file, args.apb_data_width, args.decode, metrics, args.read_pipeline, args.wait_states,
+                    args.bus, args.skid_buffer, args.jobs, args.template_dir)
+    metrics.finish()
\ No newline at end of file
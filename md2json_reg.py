@@ -1,121 +1,489 @@
-import markdown
-from bs4 import BeautifulSoup
+import sys
 import json
 import re
+import html
 import logging
 import argparse
+from reg_metrics import NULL_METRICS, add_metrics_arguments, metrics_from_args
 
 # 配置日志记录
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Markdown 表格语法（与 markdown 库 tables 扩展的判定规则保持一致）
+HEADING_RE = re.compile(r"^(#{1,6})(.*?)#*$")
+SEPARATOR_CHARS = set("|:- ")
+CODE_PIPE_RE = re.compile(r"(\\\\)|(\\`+)|(`+)|(\\\|)|(\|)")
+END_BORDER_RE = re.compile(r"(?<!\\)(?:\\\\)*\|$")
+
+# 单元格内联标记，转换为纯文本时去除（规则和处理顺序与 markdown 库的内联处理器一致）
+BACKTICKS_RE = re.compile(r"`+")
+ESCAPE_RE = re.compile(r"\\([\\`*_{}\[\]()>#+\-.!|])")
+LINK_RE = re.compile(r"(!?)\[([^\[\]]*)\]\(([^()]*)\)")
+AUTOLINK_RE = re.compile(r"<((?:[Ff]|[Hh][Tt])[Tt][Pp][Ss]?://[^<>]*)>|<(?:mailto:)?([^<> !]+@[^@<> ]+)>")
+HTML_TAG_RE = re.compile(r"<(/?[a-zA-Z][^<>@ ]*( [^<>]*)?|!--(?:(?!<!--|-->).)*--|[?](?:(?!<[?]|[?]>).)*[?]|!\[CDATA\[(?:(?!<!\[CDATA\[|\]\]>).)*\]\])>", re.S)
+ENTITY_RE = re.compile(r"&(?:#[0-9]+|#x[0-9a-fA-F]+|[a-zA-Z0-9]+);")
+NOT_STRONG_RE = re.compile(r"(?:^|(?<=\s))(?:\*{1,3}|_{1,3})(?=\s|$)")
+# 强调标记：(分隔符, 按优先级排列的匹配规则)，依次为强调加粗、加粗强调、加粗、强调
+EMPHASIS_RULES = (
+    ("*", tuple(re.compile(p, re.S) for p in (
+        r"(\*)\1{2}(.+?)\1(.*?)\1{2}",
+        r"(\*)\1{2}(.+?)\1{2}(.*?)\1",
+        r"(\*)\1(?!\1)([^*]+?)\1(?!\1)(.+?)\1{3}",
+        r"(\*{2})(.+?)\1",
+        r"(\*)([^\*]+)\1",
+    ))),
+    ("_", tuple(re.compile(p, re.S) for p in (
+        r"(_)\1{2}(.+?)\1(.*?)\1{2}",
+        r"(_)\1{2}(.+?)\1{2}(.*?)\1",
+        r"(?<!\w)(\_)\1(?!\1)(.+?)(?<!\w)\1(?!\1)(.+?)\1{3}(?!\w)",
+        r"(?<!\w)(_{2})(?!_)(.+?)(?<!_)\1(?!\w)",
+        r"(?<!\w)(_)(?!_)(.+?)(?<!_)\1(?!\w)",
+    ))),
+)
+# 可能包含内联标记的字符，不含这些字符的单元格直接返回
+MARKUP_CHARS_RE = re.compile(r"[`*_<&\\\[]")
+# 已转换为纯文本、不再参与后续规则匹配的片段的占位符
+PLACEHOLDER_RE = re.compile("\x02([0-9]+)\x03")
+# HTML 元素（标签、注释）的边界标记。BeautifulSoup 将两个边界之间只含空白的文本压缩为一个空格
+ELEMENT_BOUNDARY = "\x01"
+ASCII_WHITESPACE = " \t\n\r\f"
+
+
+def split_table_row(row, border=True):
+    """
+    按管道符拆分一行 Markdown 表格，忽略转义管道符和行内代码中的管道符。
+
+    Args:
+        row (str): 表格行文本（已去除首尾空格）。
+        border (bool): 行首/行尾的管道符是否作为表格边框处理，默认为 True。
+
+    Returns:
+        list: 未去除空白的单元格文本列表。
+    """
+    if border:
+        if row.startswith('|'):
+            row = row[1:]
+        row = END_BORDER_RE.sub('', row)
+
+    pipes = []
+    tics = []
+    for m in CODE_PIPE_RE.finditer(row):
+        if m.group(2):
+            # 转义的反引号：(长度, 起始位置, 结束位置, 转义长度)
+            tics.append((len(m.group(2)) - 1, m.start(2), m.end(2) - 1, 1))
+        elif m.group(3):
+            tics.append((len(m.group(3)), m.start(3), m.end(3) - 1, 0))
+        elif m.group(5):
+            pipes.append(m.start(5))
+
+    # 成对的反引号之间为行内代码区域，其中的管道符不作为分隔符
+    regions = []
+    pos = 0
+    while pos < len(tics):
+        size = tics[pos][0] - tics[pos][3]
+        close = next((i for i in range(pos + 1, len(tics)) if tics[i][0] == size), None) if size else None
+        if close is None:
+            pos += 1
+            continue
+        regions.append((tics[pos][1], tics[close][2]))
+        pos = close + 1
+
+    cells = []
+    last = 0
+    for pipe in pipes:
+        if any(start <= pipe <= end for start, end in regions):
+            continue
+        cells.append(row[last:pipe])
+        last = pipe + 1
+    cells.append(row[last:])
+    return cells
+
+
+def cell_text(cell):
+    """
+    将单元格中的 Markdown 内联标记转换为纯文本，结果与渲染为 HTML 后提取的文本一致。
+
+    Args:
+        cell (str): 单元格原始文本。
+
+    Returns:
+        str: 去除首尾空白后的纯文本。
+    """
+    cell = cell.strip()
+    if not MARKUP_CHARS_RE.search(cell):
+        return cell
+
+    stash = []
+
+    def restore(m):
+        return PLACEHOLDER_RE.sub(restore, stash[int(m.group(1))])
+
+    pieces = PLACEHOLDER_RE.sub(restore, _inline_text(cell, stash)).split(ELEMENT_BOUNDARY)
+    return "".join(" " if piece and not piece.strip(ASCII_WHITESPACE) else piece for piece in pieces).strip()
+
+
+def _keep(stash, text):
+    """将已处理的片段替换为占位符，使后续规则不再匹配其中的字符。"""
+    stash.append(text)
+    return f"\x02{len(stash) - 1}\x03"
+
+
+def _element(stash, text=""):
+    """与 _keep 相同，但片段在 HTML 中是一个元素，前后加上元素边界标记。"""
+    return _keep(stash, f"{ELEMENT_BOUNDARY}{text}{ELEMENT_BOUNDARY}")
+
+
+def _inline_text(text, stash, links=True):
+    """
+    按 markdown 库内联处理器的优先级依次处理：行内代码、转义、链接和图片、自动链接、HTML 标签、
+    HTML 实体、单独的 * 和 _、强调。链接文本从链接之后的规则继续处理（links=False）。
+    """
+    if links:
+        text = _code_spans(text, stash)
+        text = ESCAPE_RE.sub(lambda m: _keep(stash, m.group(1)), text)
+        # 链接保留文本，图片在 HTML 中没有文本
+        text = LINK_RE.sub(lambda m: _element(stash, "" if m.group(1) else _inline_text(m.group(2), stash, False)), text)
+    text = AUTOLINK_RE.sub(lambda m: _element(stash, m.group(1) or m.group(2)), text)
+    text = HTML_TAG_RE.sub(lambda m: _element(stash), text)
+    text = ENTITY_RE.sub(lambda m: _keep(stash, html.unescape(m.group())), text)
+    text = NOT_STRONG_RE.sub(lambda m: _keep(stash, m.group()), text)
+    return _strip_emphasis(text, stash, EMPHASIS_RULES)
+
+
+def _code_spans(text, stash):
+    """
+    将行内代码替换为占位符，规则与 markdown 库一致：前面有奇数个反斜杠的反引号不开始行内代码；
+    没有长度相同的结束反引号时，用其后最长的一串反引号结束，开始反引号中多出的部分属于代码内容。
+    """
+    parts = []
+    last = pos = 0
+    while True:
+        pos = text.find("`", pos)
+        if pos < 0:
+            break
+        slashes = pos - last - len(text[last:pos].rstrip("\\"))
+        span = None if slashes % 2 else _find_code_span(text, pos)
+        if span is None:
+            pos += 1
+            continue
+        start, end, stop = span
+        parts.append(text[last:pos])
+        parts.append(_element(stash, text[start:end].strip()))
+        last = pos = stop
+    parts.append(text[last:])
+    return "".join(parts)
+
+
+def _find_code_span(text, begin):
+    """返回从 begin 处的反引号开始的行内代码 (内容起始位置, 内容结束位置, 结束位置)，不存在时返回 None。"""
+    ticks = BACKTICKS_RE.match(text, begin).end() - begin
+    longest = None
+    for m in BACKTICKS_RE.finditer(text, begin + ticks):
+        length = m.end() - m.start()
+        if length == ticks:
+            return begin + ticks, m.start(), m.end()
+        if longest is None or length > longest.end() - longest.start():
+            longest = m
+    if longest is None:
+        return None
+    length = longest.end() - longest.start()
+    return begin + length, longest.start(), longest.end()
+
+
+def _strip_emphasis(text, stash, rules):
+    """依次用每种分隔符的强调规则去除强调标记，强调内的文本继续用后面的分隔符处理。"""
+    for index, (delimiter, patterns) in enumerate(rules):
+        text = _strip_delimiter(text, stash, delimiter, patterns, rules[index + 1:])
+    return text
+
+
+def _strip_delimiter(text, stash, delimiter, patterns, rest):
+    """从左到右在每个分隔符处按优先级尝试匹配规则，与 markdown 库一致：强调内的文本只再匹配优先级更低的规则。"""
+    parts = []
+    last = pos = 0
+    while True:
+        pos = text.find(delimiter, pos)
+        if pos < 0:
+            break
+        for index, pattern in enumerate(patterns):
+            m = pattern.match(text, pos)
+            if m:
+                parts.append(text[last:pos])
+                for group in m.groups()[1:]:
+                    inner = _strip_delimiter(group, stash, delimiter, patterns[index + 1:], rest)
+                    parts.append(_element(stash, _strip_emphasis(inner, stash, rest)))
+                last = pos = m.end()
+                break
+        else:
+            pos += 1
+    parts.append(text[last:])
+    return "".join(parts)
+
+
+def iter_markdown_blocks(lines):
+    """
+    逐行扫描 Markdown 文本，按块生成标题和表格，不构建 HTML。
+
+    文本块以空行分隔，每次只在内存中保留一个块。
+
+    Args:
+        lines (iterable): Markdown 文本行（例如打开的文件对象）。
+
+    Yields:
+        tuple: ("heading", (level, text)) 或 ("table", rows)。rows 为单元格文本列表的列表，
+        第一行为表头，已跳过分隔行，且每行的列数与表头一致。
+    """
+    block = []
+    for line in lines:
+        line = line.rstrip('\r\n').expandtabs(4)
+        if line.strip():
+            block.append(line)
+        elif block:
+            yield from _iter_block(block)
+            block = []
+    if block:
+        yield from _iter_block(block)
+
+
+def _iter_block(block):
+    """处理一个文本块：缩进代码块被忽略，表格优先识别，否则在标题处拆分后继续识别。"""
+    if block[0].startswith('    '):
+        return
+
+    table = _parse_table_block(block)
+    if table is not None:
+        yield "table", table
+        return
+
+    for i, line in enumerate(block):
+        heading = HEADING_RE.match(line)
+        if heading:
+            if i:
+                yield from _iter_block(block[:i])
+            yield "heading", (len(heading.group(1)), heading.group(2).strip())
+            if i + 1 < len(block):
+                yield from _iter_block(block[i + 1:])
+            return
+
+
+def _parse_table_block(block):
+    """判断一个文本块是否为表格，是则返回单元格文本行列表，否则返回 None。"""
+    if len(block) < 2:
+        return None
+    header = block[0].strip(' ')
+    border = header.startswith('|') or END_BORDER_RE.search(header) is not None
+    header_cells = split_table_row(header, border)
+    if len(header_cells) < 2:
+        return None
+
+    separator = split_table_row(block[1].strip(' '), border)
+    if len(separator) != len(header_cells) or not set(''.join(separator)) <= SEPARATOR_CHARS:
+        return None
+
+    num_cols = len(header_cells)
+    rows = [[cell_text(cell) for cell in header_cells]]
+    for line in block[2:]:
+        cells = split_table_row(line.strip(' '), border)[:num_cols]
+        cells += [""] * (num_cols - len(cells))
+        rows.append([cell_text(cell) for cell in cells])
+    if len(block) == 2:
+        # 空表格与 markdown 库的行为一致：生成一个空行
+        rows.append([""] * num_cols)
+    return rows
+
+
 def extract_register_info(reg_rows):
-    """从寄存器信息行中提取寄存器信息"""
-    register_name = reg_rows[0].find_all('th')[1].text.strip() if len(reg_rows[0].find_all('th')) > 1 else None
-    register_description = reg_rows[1].find_all('td')[1].text.strip() if len(reg_rows[1].find_all('td')) > 1 else None
-    register_type = reg_rows[2].find_all('td')[1].text.strip() if len(reg_rows[2].find_all('td')) > 1 else None
+    """从寄存器信息表的单元格行中提取寄存器信息"""
+    register_name = reg_rows[0][1] if len(reg_rows[0]) > 1 else None
+    register_description = reg_rows[1][1] if len(reg_rows[1]) > 1 else None
+    register_type = reg_rows[2][1] if len(reg_rows[2]) > 1 else None
     return register_name, register_description, register_type
 
-def markdown_to_json(markdown_file, json_file="output.json", html_file="output.html", start_address=0, address_step=4):
+def iter_registers(tables, start_address=0, address_step=4):
     """
-    解析 Markdown 文件并将其转换为包含多个寄存器信息的 JSON 格式，并添加地址分配功能。
+    将表格按（寄存器信息表，字段信息表）两两配对，逐个生成寄存器信息。
+
+    Args:
+        tables (iterable): iter_markdown_blocks 生成的表格单元格行。
+        start_address (int): 起始地址，默认为 0。
+        address_step (int): 地址步进，默认为 4。
+
+    Yields:
+        dict: 寄存器信息，格式与 JSON 文件中的 REGISTERS 项一致。
+    """
+    current_address = start_address
+    tables = iter(tables)
+    for reg_table in tables:
+        field_table = next(tables, None)
+        # 确保存在配对的表格
+        if field_table is None:
+            logging.warning("缺少与寄存器信息表配对的字段信息表。")
+            return
+
+        # 提取寄存器信息
+        register_name, register_description, register_type = extract_register_info(reg_table)
+
+        # 提取字段信息
+        fields = []
+        total_width = 0  # 初始化寄存器总宽度
+        for cols in field_table[1:]:  # Skip header row
+            if len(cols) == 5:
+                try:
+                    field = {
+                        "NAME": cols[0],
+                        "WIDTH": int(cols[1]),  # 转换为整数
+                        "RESET": cols[2],
+                        "TYPE": cols[3],
+                        "DESC": cols[4]
+                    }
+                    fields.append(field)
+                    total_width += field["WIDTH"]  # 累加字段宽度
+                except ValueError as e:
+                    logging.error(f"字段宽度不是有效的整数：{e}")
+                    continue
+
+        # 构建寄存器数据
+        yield {
+            "REG_NAME": register_name,
+            "DESC": register_description,
+            "REG_TYPE": register_type,
+            "ADDRESS": hex(current_address),  # 添加地址信息
+            "FIELDS": fields,
+            "WIDTH": total_width  # 添加寄存器总宽度
+        }
+
+        # 更新地址
+        current_address += address_step
+
+def parse_markdown(markdown_file, start_address=0, address_step=4):
+    """
+    逐行解析 Markdown 文件，返回与 JSON 文件结构相同的寄存器数据。
 
     Args:
         markdown_file (str): Markdown 文件的路径。
-        json_file (str): JSON 文件的路径，默认为 "output.json"。
-        html_file (str): HTML 文件的路径，默认为 "output.html"。
         start_address (int): 起始地址，默认为 0。
         address_step (int): 地址步进，默认为 4。
+
+    Returns:
+        dict: 包含 MODULE_NAME 和 REGISTERS 的寄存器数据。
     """
-    try:
-        with open(markdown_file, 'r', encoding='utf-8') as f:
-            markdown_text = f.read()
+    module_name = None
 
-        # 将 Markdown 内容转换为 HTML
-        html = markdown.markdown(markdown_text, extensions=['tables'])
+    def tables(lines):
+        nonlocal module_name
+        for kind, value in iter_markdown_blocks(lines):
+            if kind == "table":
+                yield value
+            elif module_name is None and value[0] == 2 and "MODULE_NAME:" in value[1]:
+                # 提取模块名称
+                module_name = cell_text(value[1]).replace("MODULE_NAME:", "").strip()
 
-        # 将 HTML 写入文件
-        with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html)
+    with open(markdown_file, 'r', encoding='utf-8') as f:
+        registers = list(iter_registers(tables(f), start_address, address_step))
 
-        # 使用 BeautifulSoup 解析 HTML
-        soup = BeautifulSoup(html, 'html.parser')
+    return {
+        "MODULE_NAME": module_name,
+        "REGISTERS": registers
+    }
 
-        # 提取模块名称
-        module_name_element = soup.find(string=re.compile(r"MODULE_NAME:"))
-        module_name = module_name_element.find_parent("h2").text.strip() if module_name_element else None
-        if module_name:
-            module_name = module_name.replace("MODULE_NAME:", "").strip()
+def write_html(markdown_file, html_file):
+    """
+    将 Markdown 文件渲染为 HTML 文件，仅在需要查看 HTML 时调用。
 
-        # 提取所有表格
-        tables = soup.find_all('table')
+    Args:
+        markdown_file (str): Markdown 文件的路径。
+        html_file (str): HTML 文件的路径。
+    """
+    import markdown
+
+    with open(markdown_file, 'r', encoding='utf-8') as f:
+        html_text = markdown.markdown(f.read(), extensions=['tables'])
+
+    with open(html_file, 'w', encoding='utf-8') as f:
+        f.write(html_text)
+
+def verify_html(markdown_file):
+    """
+    用 markdown 库渲染 HTML 并用 BeautifulSoup 提取表格单元格文本，与直接解析的结果逐个比较，
+    用于确认直接解析与原来的 HTML 解析方式输出一致。
 
-        # 存储寄存器信息的列表
-        registers = []
+    Args:
+        markdown_file (str): Markdown 文件的路径。
+
+    Returns:
+        list: 不一致的单元格列表，每项为 (表格序号, 行号, 列号, HTML 文本, 直接解析文本)；表格数或行列数不同时列号为 None。
+    """
+    import markdown
+    from bs4 import BeautifulSoup
+
+    with open(markdown_file, 'r', encoding='utf-8') as f:
+        soup = BeautifulSoup(markdown.markdown(f.read(), extensions=['tables']), 'html.parser')
+    html_tables = [[[cell.text.strip() for cell in row.find_all(['th', 'td'])] for row in table.find_all('tr')]
+                   for table in soup.find_all('table')]
 
-        # 当前地址
-        current_address = start_address
+    with open(markdown_file, 'r', encoding='utf-8') as f:
+        tables = [value for kind, value in iter_markdown_blocks(f) if kind == "table"]
 
-        # 循环处理每两个表格（一个寄存器信息表，一个字段信息表）
-        for i in range(0, len(tables), 2):
-            # 确保存在配对的表格
-            if i + 1 >= len(tables):
-                logging.warning("缺少与寄存器信息表配对的字段信息表。")
+    mismatches = []
+    if len(html_tables) != len(tables):
+        mismatches.append((None, None, None, f"{len(html_tables)} 个表格", f"{len(tables)} 个表格"))
+    for index, (html_rows, rows) in enumerate(zip(html_tables, tables)):
+        if len(html_rows) != len(rows):
+            mismatches.append((index, None, None, f"{len(html_rows)} 行", f"{len(rows)} 行"))
+        for row_index, (html_cells, cells) in enumerate(zip(html_rows, rows)):
+            if len(html_cells) != len(cells):
+                mismatches.append((index, row_index, None, html_cells, cells))
                 continue
+            mismatches.extend((index, row_index, col, expected, actual)
+                              for col, (expected, actual) in enumerate(zip(html_cells, cells)) if expected != actual)
+    return mismatches
 
-            reg_table = tables[i]
-            field_table = tables[i + 1]
-
-            # 提取寄存器信息
-            register_name, register_description, register_type = extract_register_info(reg_table.find_all('tr'))
-
-            # 提取字段信息
-            fields = []
-            total_width = 0  # 初始化寄存器总宽度
-            if field_table:
-                field_rows = field_table.find_all('tr')[1:]  # Skip header row
-                for row in field_rows:
-                    cols = row.find_all('td')
-                    if len(cols) == 5:
-                        try:
-                            field = {
-                                "NAME": cols[0].text.strip(),
-                                "WIDTH": int(cols[1].text.strip()),  # 转换为整数
-                                "RESET": cols[2].text.strip(),
-                                "TYPE": cols[3].text.strip(),
-                                "DESC": cols[4].text.strip()
-                            }
-                            fields.append(field)
-                            total_width += field["WIDTH"]  # 累加字段宽度
-                        except ValueError as e:
-                            logging.error(f"字段宽度不是有效的整数：{e}")
-                            continue
-
-            # 构建寄存器数据
-            register = {
-                "REG_NAME": register_name,
-                "DESC": register_description,
-                "REG_TYPE": register_type,
-                "ADDRESS": hex(current_address),  # 添加地址信息
-                "FIELDS": fields,
-                "WIDTH": total_width  # 添加寄存器总宽度
-            }
-            registers.append(register)
-
-            # 更新地址
-            current_address += address_step
-
-        # 构建 JSON 数据
-        data = {
-            "MODULE_NAME": module_name,
-            "REGISTERS": registers
-        }
+def markdown_to_json(markdown_file, json_file="output.json", html_file=None, start_address=0, address_step=4, cache_file=None, metrics=NULL_METRICS,
+                     binary_file=None):
+    """
+    解析 Markdown 文件并将其转换为包含多个寄存器信息的 JSON 格式，并添加地址分配功能。
+
+    Args:
+        markdown_file (str): Markdown 文件的路径。
+        json_file (str): JSON 文件的路径，默认为 "output.json"。如果为空，则不写 JSON 文件。
+        html_file (str, optional): HTML 文件的路径。如果为 None，则不生成 HTML 文件，默认为 None。
+        start_address (int): 起始地址，默认为 0。
+        address_step (int): 地址步进，默认为 4。
+        cache_file (str, optional): 寄存器模型缓存文件的路径。如果为 None，则不使用缓存，默认为 None。
+        metrics (Metrics): 指标记录器，默认不记录。
+        binary_file (str, optional): 二进制中间文件（.regb）的路径。如果为 None，则不生成，默认为 None。
+    """
+    try:
+        # 逐行读取和解析同时进行，因此只有一个 parse 阶段
+        with metrics.phase("parse"):
+            if cache_file:
+                from reg_cache import RegisterModelCache
+                with RegisterModelCache(cache_file) as cache:
+                    data = cache.load(markdown_file, parse_markdown, start_address=start_address, address_step=address_step)
+            else:
+                data = parse_markdown(markdown_file, start_address, address_step)
+        metrics.count("registers", len(data["REGISTERS"]))
+        metrics.count("fields", sum(len(register["FIELDS"]) for register in data["REGISTERS"]))
 
         # 写入 JSON 文件
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        if json_file:
+            with metrics.phase("write"):
+                with open(json_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=4)
+                    metrics.count("bytes_written", f.tell())
 
-        logging.info(f"Markdown 文件 '{markdown_file}' 已成功转换为 JSON 文件 '{json_file}'")
-        logging.info(f"HTML 文件已写入 '{html_file}'")
+            logging.info(f"Markdown 文件 '{markdown_file}' 已成功转换为 JSON 文件 '{json_file}'")
+
+        # 写入二进制中间文件
+        if binary_file:
+            from reg_binary import write_binary
+            write_binary(data, binary_file, metrics)
+            logging.info(f"Markdown 文件 '{markdown_file}' 已成功转换为二进制中间文件 '{binary_file}'")
+
+        if html_file:
+            with metrics.phase("html"):
+                write_html(markdown_file, html_file)
+            logging.info(f"HTML 文件已写入 '{html_file}'")
 
     except FileNotFoundError:
         logging.error(f"错误：文件 '{markdown_file}' 未找到。")
@@ -126,13 +494,28 @@ if __name__ == "__main__":
     # 创建命令行参数解析器
     parser = argparse.ArgumentParser(description="将 Markdown 文件转换为包含寄存器信息的 JSON 文件。")
     parser.add_argument("markdown_file", help="Markdown 文件的路径")
-    parser.add_argument("--json_file", help="JSON 文件的路径，默认为 output.json", default="output.json")
-    parser.add_argument("--html_file", help="HTML 文件的路径，默认为 output.html", default="output.html")
+    parser.add_argument("--json_file", help="JSON 文件的路径，默认为 output.json。传入空字符串时不写 JSON 文件。", default="output.json")
+    parser.add_argument("--binary_file", help="二进制中间文件（.regb）的路径。如果省略，则不生成。", default=None)
+    parser.add_argument("--html_file", help="HTML 文件的路径。如果省略，则不生成 HTML 文件。", default=None)
     parser.add_argument("--start_address", type=lambda x: int(x, 0), help="起始地址，默认为 0", default=0)
     parser.add_argument("--address_step", type=int, help="地址步进，默认为 4", default=4)
+    parser.add_argument("--cache_file", help="寄存器模型缓存文件的路径，例如 build/reg_cache.sqlite。如果省略，则不使用缓存。", default=None)
+    parser.add_argument("--verify_html", action="store_true", help="只检查直接解析的表格单元格文本与 markdown 库渲染 HTML 后提取的文本是否一致（需要 markdown 和 beautifulsoup4），不一致时返回 1")
+    add_metrics_arguments(parser)
 
     # 解析命令行参数
     args = parser.parse_args()
 
+    if args.verify_html:
+        mismatches = verify_html(args.markdown_file)
+        for table, row, col, expected, actual in mismatches:
+            logging.error(f"表格 {table} 第 {row} 行第 {col} 列不一致：HTML {expected!r}，直接解析 {actual!r}")
+        if not mismatches:
+            logging.info(f"'{args.markdown_file}' 的全部表格单元格与 HTML 解析结果一致")
+        sys.exit(1 if mismatches else 0)
+
     # 调用 markdown_to_json 函数
-    markdown_to_json(args.markdown_file, args.json_file, args.html_file, args.start_address, args.address_step)
\ No newline at end of file
+    metrics = metrics_from_args("md2json_reg", args)
+    markdown_to_json(args.markdown_file, args.json_file, args.html_file, args.start_address, args.address_step, args.cache_file, metrics,
+                     args.binary_file)
+    metrics.finish()
\ No newline at end of file
@@ -0,0 +1,316 @@
+import bisect
+import json
+import mmap
+import struct
+import logging
+import argparse
+import sys
+from reg_model import Field, Register, RegisterMap
+from reg_metrics import NULL_METRICS, add_metrics_arguments, metrics_from_args
+
+# 配置日志记录
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# 二进制中间文件格式
+#
+#   文件头      HEADER
+#   寄存器记录  REGISTER × 寄存器数，按原始顺序
+#   字段记录    FIELD × 字段数，每个寄存器的字段连续存放
+#   字符串偏移  uint64 × (字符串数 + 1)，第 i 个字符串为 [offsets[i], offsets[i + 1])
+#   字符串数据  UTF-8，名称、描述和类型只存一份
+#   地址索引    ADDRESS_ENTRY × 寄存器数，按 (地址, 寄存器下标) 排序
+#   名称索引    NAME_ENTRY × 寄存器数，按 (名称 UTF-8 字节, 寄存器下标) 排序
+#
+# 所有整数为小端序，各段按 8 字节对齐，可直接 mmap 后按偏移读取单个记录。
+BINARY_MAGIC = b"REGB"
+BINARY_FORMAT_VERSION = 1
+BINARY_SUFFIX = ".regb"
+
+HEADER = struct.Struct("<4sHHIIII6Q")
+REGISTER = struct.Struct("<IIIIQQIIII")
+FIELD = struct.Struct("<IIIIIIQ")
+ADDRESS_ENTRY = struct.Struct("<QI4x")
+NAME_ENTRY = struct.Struct("<II")
+STRING_OFFSET = struct.Struct("<Q")
+
+# 字符串为 None（例如 Markdown 中缺少的描述）时使用的字符串编号
+NO_STRING = 0xFFFFFFFF
+# 寄存器记录 flags：复位值由寄存器单独给出，而不是由字段复位值拼接
+FLAG_EXPLICIT_RESET = 1
+
+def _align(size, alignment=8):
+    return (size + alignment - 1) & ~(alignment - 1)
+
+def write_binary(registers, binary_file, metrics=NULL_METRICS):
+    """
+    将寄存器集合写为二进制中间文件。
+
+    Args:
+        registers (RegisterMap | dict): 寄存器集合，或 md2json_reg 格式的寄存器数据。
+        binary_file (str): 二进制文件的路径。
+        metrics (Metrics): 指标记录器，记录 write:binary 阶段，默认不记录。
+
+    Returns:
+        int: 写入的字节数。
+
+    Raises:
+        ValueError: 地址或复位值超过 64 位。
+    """
+    if not isinstance(registers, RegisterMap):
+        registers = RegisterMap.from_dict(registers)
+
+    with metrics.phase("write:binary"):
+        strings = {}
+        string_list = []
+
+        def intern(text):
+            if text is None:
+                return NO_STRING
+            index = strings.get(text)
+            if index is None:
+                index = strings[text] = len(string_list)
+                string_list.append(text)
+            return index
+
+        module_name_id = intern(registers.module_name)
+        register_records = bytearray(REGISTER.size * len(registers))
+        field_records = bytearray()
+        field_count = 0
+        for i, register in enumerate(registers):
+            if register.address >= 1 << 64 or register.reset >= 1 << 64:
+                raise ValueError(f"寄存器 {register.name} 的地址或复位值超过 64 位")
+            field_reset = 0
+            for field in register.fields:
+                if field.reset >= 1 << 64:
+                    raise ValueError(f"寄存器 {register.name} 字段 {field.name} 的复位值超过 64 位")
+                field_reset |= (field.reset << field.lsb) & field.mask
+                field_records += FIELD.pack(intern(field.name), intern(field.desc), intern(field.type), intern(field.access),
+                                            field.lsb, field.width, field.reset)
+            flags = FLAG_EXPLICIT_RESET if register.reset != field_reset else 0
+            REGISTER.pack_into(register_records, i * REGISTER.size,
+                               intern(register.name), intern(register.desc), intern(register.type), intern(register.access),
+                               register.address, register.reset, register.width, field_count, len(register.fields), flags)
+            field_count += len(register.fields)
+
+        encoded = [text.encode('utf-8') for text in string_list]
+        string_offsets = bytearray(STRING_OFFSET.size * (len(encoded) + 1))
+        position = 0
+        for i, data in enumerate(encoded):
+            STRING_OFFSET.pack_into(string_offsets, i * STRING_OFFSET.size, position)
+            position += len(data)
+        STRING_OFFSET.pack_into(string_offsets, len(encoded) * STRING_OFFSET.size, position)
+        string_data = b"".join(encoded)
+
+        by_address = sorted(range(len(registers)), key=lambda i: (registers[i].address, i))
+        address_index = b"".join(ADDRESS_ENTRY.pack(registers[i].address, i) for i in by_address)
+        name_bytes = [encoded[strings[register.name]] if register.name is not None else b"" for register in registers]
+        by_name = sorted(range(len(registers)), key=lambda i: (name_bytes[i], i))
+        name_index = b"".join(NAME_ENTRY.pack(intern(registers[i].name), i) for i in by_name)
+
+        # 依次计算各段偏移，每段 8 字节对齐
+        sections = [register_records, field_records, string_offsets, string_data, address_index, name_index]
+        offsets = []
+        position = HEADER.size
+        for section in sections:
+            position = _align(position)
+            offsets.append(position)
+            position += len(section)
+
+        header = HEADER.pack(BINARY_MAGIC, BINARY_FORMAT_VERSION, 0, module_name_id, len(registers), field_count, len(encoded), *offsets)
+        with open(binary_file, 'wb') as f:
+            f.write(header)
+            for offset, section in zip(offsets, sections):
+                f.write(b"\0" * (offset - f.tell()))
+                f.write(section)
+            size = f.tell()
+
+    metrics.count("bytes_written", size)
+    metrics.count("files_written")
+    return size
+
+class BinaryRegisterFile:
+    """
+    以 mmap 方式打开的二进制中间文件。按名称或地址查找寄存器时只读取索引和对应的记录，不解码整个文件。
+
+    可以像 RegisterMap 一样迭代、取长度、按下标访问，以及使用 find()/at() 查找。
+    """
+
+    def __init__(self, binary_file):
+        """
+        Args:
+            binary_file (str): 二进制文件的路径。
+
+        Raises:
+            ValueError: 文件不是二进制中间文件或版本不支持。
+        """
+        self.binary_file = binary_file
+        self._file = open(binary_file, 'rb')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, module_name_id, self.register_count, self.field_count, self.string_count, \
+            self._registers, self._fields, self._string_offsets, self._string_data, self._address_index, self._name_index = \
+            HEADER.unpack_from(self._data, 0)
+        if magic != BINARY_MAGIC:
+            self.close()
+            raise ValueError(f"'{binary_file}' 不是寄存器二进制中间文件")
+        if version != BINARY_FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"'{binary_file}' 的格式版本 {version} 不受支持（当前版本 {BINARY_FORMAT_VERSION}）")
+        self.module_name = self.string(module_name_id)
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.register_count
+
+    def __iter__(self):
+        for i in range(self.register_count):
+            yield self[i]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.register_count
+        if not 0 <= index < self.register_count:
+            raise IndexError(index)
+        return self._register(index)
+
+    def string(self, string_id):
+        """按编号读取字符串表中的字符串。"""
+        if string_id == NO_STRING:
+            return None
+        start, end = struct.unpack_from("<QQ", self._data, self._string_offsets + string_id * STRING_OFFSET.size)
+        return self._data[self._string_data + start:self._string_data + end].decode('utf-8')
+
+    def strings(self):
+        """一次解码整个字符串表，返回按编号排列的字符串列表。"""
+        end = self._string_offsets + STRING_OFFSET.size * (self.string_count + 1)
+        offsets = [offset for offset, in STRING_OFFSET.iter_unpack(self._data[self._string_offsets:end])]
+        data = self._data[self._string_data:self._string_data + offsets[-1]]
+        return [data[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+
+    def _register(self, index, string=None):
+        string = string or self.string
+        name, desc, reg_type, access, address, reset, width, first_field, num_fields, flags = \
+            REGISTER.unpack_from(self._data, self._registers + index * REGISTER.size)
+        fields = []
+        for j in range(first_field, first_field + num_fields):
+            f_name, f_desc, f_type, f_access, lsb, f_width, f_reset = FIELD.unpack_from(self._data, self._fields + j * FIELD.size)
+            fields.append(Field(string(f_name), f_width, lsb, f_reset, string(f_type), string(f_access), string(f_desc)))
+        return Register(string(name), address, fields, string(reg_type), string(access), string(desc), width,
+                        index, reset if flags & FLAG_EXPLICIT_RESET else None)
+
+    def _name_key(self, position):
+        string_id, index = NAME_ENTRY.unpack_from(self._data, self._name_index + position * NAME_ENTRY.size)
+        if string_id == NO_STRING:
+            return b"", index
+        start, end = struct.unpack_from("<QQ", self._data, self._string_offsets + string_id * STRING_OFFSET.size)
+        return self._data[self._string_data + start:self._string_data + end], index
+
+    def _address_key(self, position):
+        return ADDRESS_ENTRY.unpack_from(self._data, self._address_index + position * ADDRESS_ENTRY.size)
+
+    def find(self, name):
+        """按名称二分查找寄存器，不存在时返回 None。同名寄存器返回第一个。"""
+        key = name.encode('utf-8')
+        position = bisect.bisect_left(range(self.register_count), key, key=lambda p: self._name_key(p)[0])
+        if position < self.register_count:
+            found, index = self._name_key(position)
+            if found == key:
+                return self._register(index)
+        return None
+
+    def at(self, address):
+        """按地址二分查找寄存器，不存在时返回 None。同一地址的多个寄存器返回第一个。"""
+        position = bisect.bisect_left(range(self.register_count), address, key=lambda p: self._address_key(p)[0])
+        if position < self.register_count:
+            found, index = self._address_key(position)
+            if found == address:
+                return self._register(index)
+        return None
+
+    def to_register_map(self):
+        """解码全部寄存器，返回 RegisterMap。字符串表只解码一次。"""
+        strings = self.strings()
+
+        def string(string_id):
+            return strings[string_id] if string_id != NO_STRING else None
+
+        return RegisterMap(self.module_name, [self._register(i, string) for i in range(self.register_count)])
+
+def load_binary_register_map(binary_file, metrics=NULL_METRICS):
+    """
+    读取二进制中间文件并构建寄存器集合。
+
+    Args:
+        binary_file (str): 二进制文件的路径。
+        metrics (Metrics): 指标记录器，记录 model 阶段，默认不记录。
+
+    Returns:
+        RegisterMap: 寄存器集合。
+    """
+    with metrics.phase("model"):
+        with BinaryRegisterFile(binary_file) as binary:
+            registers = binary.to_register_map()
+    metrics.count_registers(registers)
+    return registers
+
+def _print_register(register):
+    print(f"{register.name} @ 0x{register.address:X} {register.type} width={register.width} reset=0x{register.reset:X}  {register.desc or ''}")
+    for field in register.fields:
+        print(f"    [{field.msb}:{field.lsb}] {field.name} {field.access} reset=0x{field.reset:X}  {field.desc or ''}")
+
+def main(argv=None):
+    # 创建命令行参数解析器
+    parser = argparse.ArgumentParser(description="生成、查询和导出寄存器二进制中间文件（.regb）。")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pack_parser = subparsers.add_parser("pack", help="将 Markdown、IP-XACT 或 JSON 文件转换为二进制中间文件")
+    pack_parser.add_argument("input_file", help="Markdown、IP-XACT（.xml）或 JSON 文件的路径")
+    pack_parser.add_argument("binary_file", nargs="?", help="二进制文件的路径，默认为 output.regb", default="output" + BINARY_SUFFIX)
+    pack_parser.add_argument("--start_address", type=lambda x: int(x, 0), help="Markdown 起始地址，默认为 0", default=0)
+    pack_parser.add_argument("--address_step", type=int, help="Markdown 地址步进，默认为 4", default=4)
+    add_metrics_arguments(pack_parser)
+
+    export_parser = subparsers.add_parser("export", help="将二进制中间文件导出为 JSON 文件")
+    export_parser.add_argument("binary_file", help="二进制文件的路径")
+    export_parser.add_argument("json_file", nargs="?", help="JSON 文件的路径，默认为 output.json", default="output.json")
+
+    lookup_parser = subparsers.add_parser("lookup", help="按名称或地址查找寄存器，不解码整个文件")
+    lookup_parser.add_argument("binary_file", help="二进制文件的路径")
+    group = lookup_parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--name", help="寄存器名称")
+    group.add_argument("--address", type=lambda x: int(x, 0), help="寄存器地址（例如 0x10）")
+
+    # 解析命令行参数
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        from gen_all_reg import load_register_data
+        metrics = metrics_from_args("reg_binary", args)
+        data = load_register_data(args.input_file, args.start_address, args.address_step, metrics=metrics)
+        size = write_binary(data, args.binary_file, metrics)
+        logging.info(f"'{args.input_file}' 已转换为二进制中间文件 '{args.binary_file}'（{size} 字节）")
+        metrics.finish()
+    elif args.command == "export":
+        registers = load_binary_register_map(args.binary_file)
+        with open(args.json_file, 'w', encoding='utf-8') as f:
+            json.dump(registers.to_dict(), f, ensure_ascii=False, indent=4)
+        logging.info(f"二进制中间文件 '{args.binary_file}' 已导出为 JSON 文件 '{args.json_file}'")
+    else:
+        with BinaryRegisterFile(args.binary_file) as binary:
+            register = binary.find(args.name) if args.name is not None else binary.at(args.address)
+            if register is None:
+                print(f"未找到寄存器：{args.name if args.name is not None else hex(args.address)}")
+                return 1
+            _print_register(register)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,364 @@
+import json
+import zlib
+import time
+import sqlite3
+import hashlib
+import inspect
+import logging
+import argparse
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+# 配置日志记录
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# 缓存格式版本，修改存储格式时递增以使旧缓存失效
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_FILE = os.path.join("build", "reg_cache.sqlite")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 缓存总大小上限，默认 256 MB
+DEFAULT_MAX_AGE = 30 * 24 * 3600  # 缓存条目最长保留时间（秒），默认 30 天
+
+_parser_ids = {}
+
+def parser_source_files(parse):
+    """
+    返回解析函数依赖的源文件：定义解析函数的模块，以及它直接或间接引用的、与之位于同一目录的模块。
+
+    Args:
+        parse (callable): 解析函数。
+
+    Returns:
+        list: 按路径排序的源文件列表。
+    """
+    module = inspect.getmodule(parse)
+    source_file = inspect.getsourcefile(parse)
+    if module is None or not source_file:
+        return [source_file] if source_file else []
+
+    source_dir = os.path.dirname(os.path.abspath(source_file))
+    files = {}
+    pending = [module]
+    while pending:
+        module = pending.pop()
+        module_file = getattr(module, "__file__", None)
+        if not module_file or not module_file.endswith(".py"):
+            continue
+        module_file = os.path.abspath(module_file)
+        if module_file in files or os.path.dirname(module_file) != source_dir:
+            continue
+        files[module_file] = module
+        for value in list(vars(module).values()):
+            if inspect.ismodule(value):
+                pending.append(value)
+            elif getattr(value, "__module__", None) in sys.modules:
+                pending.append(sys.modules[value.__module__])
+    return sorted(files)
+
+def parser_identity(parse):
+    """
+    返回解析函数的标识：源文件名、函数名及其依赖的全部源文件内容的哈希。
+    解析器或它使用的模型代码（例如 reg_model.py）改变时缓存自动失效。
+
+    Args:
+        parse (callable): 解析函数。
+
+    Returns:
+        str: 解析函数标识。
+    """
+    if parse not in _parser_ids:
+        source_name = source_hash = ""
+        source_file = inspect.getsourcefile(parse)
+        if source_file:
+            source_name = os.path.basename(source_file)
+            h = hashlib.sha256()
+            for path in parser_source_files(parse):
+                h.update(os.path.basename(path).encode('utf-8') + b"\0")
+                with open(path, 'rb') as f:
+                    h.update(f.read())
+            source_hash = h.hexdigest()[:16]
+        _parser_ids[parse] = f"{source_name}:{parse.__qualname__}@{source_hash}"
+    return _parser_ids[parse]
+
+def cache_key(content, parser_id, **options):
+    """
+    根据输入内容、解析器标识和解析参数计算缓存键。
+
+    Args:
+        content (bytes): 输入文件内容。
+        parser_id (str): 解析器标识。
+        **options: 解析参数，例如 start_address、address_step。
+
+    Returns:
+        str: SHA-256 十六进制缓存键。
+    """
+    h = hashlib.sha256()
+    h.update(f"v{CACHE_FORMAT_VERSION}\0{parser_id}\0".encode('utf-8'))
+    h.update(json.dumps(options, sort_keys=True).encode('utf-8'))
+    h.update(b"\0")
+    h.update(content)
+    return h.hexdigest()
+
+class RegisterModelCache:
+    """
+    以内容哈希为键、保存在 SQLite 文件中的寄存器模型缓存。
+
+    条目按最近访问时间淘汰：超过 max_age 的条目被删除，总大小超过 max_bytes 时删除最久未访问的条目。
+    """
+
+    def __init__(self, cache_file=DEFAULT_CACHE_FILE, max_bytes=DEFAULT_MAX_BYTES, max_age=DEFAULT_MAX_AGE):
+        """
+        Args:
+            cache_file (str): SQLite 缓存文件的路径，默认为 build/reg_cache.sqlite。
+            max_bytes (int, optional): 缓存总大小上限（字节）。如果为 None，则不按大小淘汰。
+            max_age (float, optional): 条目最长保留时间（秒）。如果为 None，则不按时间淘汰。
+        """
+        self.cache_file = cache_file
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+
+        cache_dir = os.path.dirname(cache_file)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        self.conn = sqlite3.connect(cache_file, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                source TEXT,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, key):
+        """
+        查找缓存条目并更新其访问时间。
+
+        Args:
+            key (str): 缓存键。
+
+        Returns:
+            dict: 缓存的寄存器模型；未命中时返回 None。
+        """
+        row = self.conn.execute("SELECT data FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+
+        self.conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        self._count("hits")
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key, data, source=None):
+        """
+        写入缓存条目，并按配置的上限淘汰旧条目。
+
+        Args:
+            key (str): 缓存键。
+            data (dict): 规范化的寄存器模型（可 JSON 序列化）。
+            source (str, optional): 输入文件路径，仅用于统计显示。
+        """
+        blob = zlib.compress(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO entries (key, source, data, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, source, blob, len(blob), now, now))
+        self.conn.commit()
+        self.evict()
+
+    def load(self, input_file, parse, **options):
+        """
+        读取输入文件，命中缓存时直接返回缓存的模型，否则调用解析函数并写入缓存。
+
+        Args:
+            input_file (str): 输入文件的路径。
+            parse (callable): 解析函数，以 parse(input_file, **options) 方式调用，返回可 JSON 序列化的模型。
+            **options: 解析参数，同时作为缓存键的一部分。
+
+        Returns:
+            dict: 寄存器模型。
+        """
+        with open(input_file, 'rb') as f:
+            key = cache_key(f.read(), parser_identity(parse), **options)
+
+        data = self.get(key)
+        if data is not None:
+            logging.info(f"缓存命中：'{input_file}'")
+            return data
+
+        data = parse(input_file, **options)
+        self.put(key, data, os.path.abspath(input_file))
+        return data
+
+    def evict(self, max_bytes=None, max_age=None):
+        """
+        淘汰过期条目，并在总大小超限时按最久未访问顺序删除条目。
+
+        Args:
+            max_bytes (int, optional): 总大小上限，默认使用构造时的设置。
+            max_age (float, optional): 最长保留时间（秒），默认使用构造时的设置。
+
+        Returns:
+            int: 删除的条目数。
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        max_age = self.max_age if max_age is None else max_age
+        removed = 0
+
+        if max_age is not None:
+            removed += self.conn.execute("DELETE FROM entries WHERE accessed < ?", (time.time() - max_age,)).rowcount
+
+        if max_bytes is not None:
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > max_bytes:
+                stale = []
+                for key, size in self.conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+                    if total <= max_bytes:
+                        break
+                    stale.append((key,))
+                    total -= size
+                self.conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+                removed += len(stale)
+
+        if removed:
+            self._count("evictions", removed)
+        self.conn.commit()
+        return removed
+
+    def clear(self):
+        """删除全部缓存条目和统计数据。"""
+        self.conn.execute("DELETE FROM entries")
+        self.conn.execute("DELETE FROM stats")
+        self.conn.commit()
+
+    def stats(self):
+        """
+        返回缓存统计信息。
+
+        Returns:
+            dict: 累计命中/未命中/淘汰次数、本进程命中/未命中次数、条目数和总大小。
+        """
+        totals = dict(self.conn.execute("SELECT name, value FROM stats"))
+        entries, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {
+            "hits": totals.get("hits", 0),
+            "misses": totals.get("misses", 0),
+            "evictions": totals.get("evictions", 0),
+            "session_hits": self.hits,
+            "session_misses": self.misses,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def _count(self, name, amount=1):
+        if name == "hits":
+            self.hits += amount
+        elif name == "misses":
+            self.misses += amount
+        self.conn.execute(
+            "INSERT INTO stats (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount))
+        self.conn.commit()
+
+class MemoryModelCache:
+    """
+    常驻进程使用的内存 LRU 寄存器模型缓存，接口与 RegisterModelCache.load 相同。
+
+    以内容哈希为键，因此文件被保存但内容未改变时仍然命中。可选地以 RegisterModelCache 作为二级缓存。
+    """
+
+    def __init__(self, max_entries=32, backing=None):
+        """
+        Args:
+            max_entries (int): 最多保存的模型数量，默认为 32。
+            backing (RegisterModelCache, optional): 内存未命中时查询的二级缓存。
+        """
+        self.max_entries = max_entries
+        self.backing = backing
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def load(self, input_file, parse, **options):
+        """
+        读取输入文件，命中缓存时直接返回内存中的模型，否则解析（或查询二级缓存）并加入缓存。
+
+        Args:
+            input_file (str): 输入文件的路径。
+            parse (callable): 解析函数，以 parse(input_file, **options) 方式调用。
+            **options: 解析参数，同时作为缓存键的一部分。
+
+        Returns:
+            dict: 寄存器模型。调用方不应修改返回的模型。
+        """
+        with open(input_file, 'rb') as f:
+            key = cache_key(f.read(), parser_identity(parse), **options)
+
+        with self._lock:
+            data = self.entries.get(key)
+            if data is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+
+        if self.backing is not None:
+            data = self.backing.load(input_file, parse, **options)
+        else:
+            data = parse(input_file, **options)
+
+        with self._lock:
+            self.entries[key] = data
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return data
+
+    def clear(self):
+        """删除全部缓存条目。"""
+        with self._lock:
+            self.entries.clear()
+
+    def stats(self):
+        """返回命中/未命中/淘汰次数和条目数。"""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "entries": len(self.entries)}
+
+if __name__ == "__main__":
+    # 创建命令行参数解析器
+    parser = argparse.ArgumentParser(description="查看和维护寄存器模型缓存。")
+    parser.add_argument("command", choices=["stats", "evict", "clear"], help="stats: 显示统计信息；evict: 淘汰旧条目；clear: 清空缓存")
+    parser.add_argument("--cache_file", help="缓存文件的路径，默认为 build/reg_cache.sqlite", default=DEFAULT_CACHE_FILE)
+    parser.add_argument("--max_bytes", type=int, help="缓存总大小上限（字节），默认为 256 MB", default=DEFAULT_MAX_BYTES)
+    parser.add_argument("--max_age", type=float, help="条目最长保留时间（秒），默认为 30 天", default=DEFAULT_MAX_AGE)
+
+    # 解析命令行参数
+    args = parser.parse_args()
+
+    with RegisterModelCache(args.cache_file, args.max_bytes, args.max_age) as cache:
+        if args.command == "evict":
+            logging.info(f"已淘汰 {cache.evict()} 个缓存条目")
+        elif args.command == "clear":
+            cache.clear()
+            logging.info(f"缓存 '{args.cache_file}' 已清空")
+        print(json.dumps(cache.stats(), indent=4))
\ No newline at end of file
@@ -0,0 +1,289 @@
+import sys
+import json
+import logging
+import argparse
+from reg_model import RegisterMap
+from reg_metrics import add_metrics_arguments, metrics_from_args
+
+# 配置日志记录
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# 寄存器的变化类型，summary 中按此顺序统计各类型的寄存器数
+REGISTER_CHANGES = ("renamed", "moved", "resized", "reset", "access", "desc", "fields")
+
+def load_spec(input_file, start_address=0, address_step=4):
+    """
+    读取寄存器描述文件并构建寄存器集合，支持 Markdown、IP-XACT、二进制中间文件和 JSON。
+
+    Args:
+        input_file (str): 寄存器描述文件的路径。
+        start_address (int): Markdown 解析的起始地址，默认为 0。
+        address_step (int): Markdown 解析的地址步进，默认为 4。
+
+    Returns:
+        RegisterMap: 寄存器集合。
+    """
+    from gen_all_reg import load_register_data
+    data = load_register_data(input_file, start_address, address_step)
+    return data if isinstance(data, RegisterMap) else RegisterMap.from_dict(data)
+
+def match_items(old_items, new_items, key):
+    """
+    先按名称、再按位置（寄存器地址或字段 LSB）配对新旧两组条目。两轮各建一次哈希索引，耗时与条目数成线性关系。
+    重名条目只有第一个参与名称匹配，其余按位置匹配。
+
+    Args:
+        old_items (iterable): 旧条目序列，条目具有 name 属性。
+        new_items (iterable): 新条目序列。
+        key (callable): 返回条目位置的函数。
+
+    Returns:
+        tuple: (配对列表 [(旧条目, 新条目)]，按新顺序排列；仅在旧序列中的条目列表；仅在新序列中的条目列表)。
+    """
+    old_items = list(old_items)
+    new_items = list(new_items)
+
+    # 第一轮：按名称匹配
+    old_by_name = {}
+    for item in old_items:
+        old_by_name.setdefault(item.name, item)
+    partner = {}
+    matched_old = set()
+    for item in new_items:
+        old = old_by_name.get(item.name)
+        if old is not None and id(old) not in matched_old:
+            partner[id(item)] = old
+            matched_old.add(id(old))
+
+    # 第二轮：名称不同但位置相同的条目视为改名
+    old_by_key = {}
+    for item in old_items:
+        if id(item) not in matched_old:
+            old_by_key.setdefault(key(item), item)
+    for item in new_items:
+        if id(item) in partner:
+            continue
+        old = old_by_key.pop(key(item), None)
+        if old is not None:
+            partner[id(item)] = old
+            matched_old.add(id(old))
+
+    pairs = [(partner[id(item)], item) for item in new_items if id(item) in partner]
+    removed = [item for item in old_items if id(item) not in matched_old]
+    added = [item for item in new_items if id(item) not in partner]
+    return pairs, removed, added
+
+def describe_register(register):
+    """返回寄存器在报告中的属性字典。"""
+    return {
+        "name": register.name,
+        "address": hex(register.address),
+        "width": register.width,
+        "reset": hex(register.reset),
+        "type": register.type,
+        "access": register.access,
+    }
+
+def describe_field(field):
+    """返回字段在报告中的属性字典。"""
+    return {
+        "name": field.name,
+        "lsb": field.lsb,
+        "width": field.width,
+        "reset": hex(field.reset),
+        "type": field.type,
+        "access": field.access,
+    }
+
+def item_changes(old, new, position):
+    """
+    比较配对的两个寄存器或字段的公共属性。
+
+    Args:
+        old (Register | Field): 旧条目。
+        new (Register | Field): 新条目。
+        position (str): 位置属性名，寄存器为 address，字段为 lsb。
+
+    Returns:
+        list: 变化类型列表。
+    """
+    changes = []
+    if old.name != new.name:
+        changes.append("renamed")
+    if getattr(old, position) != getattr(new, position):
+        changes.append("moved")
+    if old.width != new.width:
+        changes.append("resized")
+    if old.reset != new.reset:
+        changes.append("reset")
+    if old.type != new.type or old.access != new.access:
+        changes.append("access")
+    if old.desc != new.desc:
+        changes.append("desc")
+    return changes
+
+def diff_fields(old_register, new_register):
+    """
+    比较两个寄存器的字段，字段先按名称、再按 LSB 配对。
+
+    Args:
+        old_register (Register): 旧寄存器。
+        new_register (Register): 新寄存器。
+
+    Returns:
+        list: 字段差异字典列表，只包含有变化的字段。
+    """
+    old_fields, new_fields = old_register.fields, new_register.fields
+    # 字段名称和顺序都未改变时（最常见的情况）直接按顺序配对，不建索引
+    if len(old_fields) == len(new_fields) and all(old.name == new.name for old, new in zip(old_fields, new_fields)):
+        pairs, removed, added = zip(old_fields, new_fields), (), ()
+    else:
+        pairs, removed, added = match_items(old_fields, new_fields, lambda field: field.lsb)
+    entries = []
+    for old, new in pairs:
+        changes = item_changes(old, new, "lsb")
+        if changes:
+            entries.append({"name": new.name, "change": "changed", "changes": changes, "old": describe_field(old), "new": describe_field(new)})
+    entries.extend({"name": field.name, "change": "removed", "old": describe_field(field)} for field in removed)
+    entries.extend({"name": field.name, "change": "added", "new": describe_field(field)} for field in added)
+    return entries
+
+def diff_register_maps(old_map, new_map):
+    """
+    对两个寄存器集合做语义比较。寄存器先按名称、再按地址配对，配对后比较地址、宽度、复位值、
+    访问类型、描述和字段。只使用哈希索引，不做两两比较，十万级寄存器的规格也能在数秒内完成。
+
+    Args:
+        old_map (RegisterMap): 旧寄存器集合。
+        new_map (RegisterMap): 新寄存器集合。
+
+    Returns:
+        dict: 差异报告，包含 module_name、summary 和 registers（有变化的寄存器列表）。
+            registers 中每一项的 change 为 added、removed 或 changed，changed 项的 changes 为变化类型列表，
+            fields 为字段差异列表。
+    """
+    pairs, removed, added = match_items(old_map, new_map, lambda register: register.address)
+
+    entries = []
+    for old, new in pairs:
+        changes = item_changes(old, new, "address")
+        fields = diff_fields(old, new)
+        if fields:
+            changes.append("fields")
+        if changes:
+            entries.append({
+                "name": new.name, "change": "changed", "changes": changes,
+                "old": describe_register(old), "new": describe_register(new), "fields": fields,
+            })
+    summary = {"added": len(added), "removed": len(removed), "changed": len(entries), "unchanged": len(pairs) - len(entries)}
+    for change in REGISTER_CHANGES:
+        summary[change] = sum(1 for entry in entries if change in entry["changes"])
+
+    entries.extend({"name": register.name, "change": "removed", "old": describe_register(register)} for register in removed)
+    entries.extend({"name": register.name, "change": "added", "new": describe_register(register)} for register in added)
+
+    return {
+        "module_name": {"old": old_map.module_name, "new": new_map.module_name},
+        "summary": summary,
+        "registers": entries,
+    }
+
+def format_change(change, old, new, position):
+    """返回一个变化类型的文本描述，例如 moved 0x0 -> 0x8。"""
+    if change == "renamed":
+        return f"renamed {old['name']} -> {new['name']}"
+    if change == "moved":
+        return f"moved {old[position]} -> {new[position]}"
+    if change == "resized":
+        return f"resized {old['width']} -> {new['width']}"
+    if change == "reset":
+        return f"reset {old['reset']} -> {new['reset']}"
+    if change == "access":
+        return f"access {old['type']}/{old['access']} -> {new['type']}/{new['access']}"
+    return change
+
+def iter_text_report(report):
+    """
+    逐行生成差异报告的文本形式：+ 新增，- 删除，~ 修改，字段差异缩进显示在所属寄存器之下。
+
+    Args:
+        report (dict): diff_register_maps 的返回值。
+
+    Yields:
+        str: 文本行（含换行符）。
+    """
+    module_name = report["module_name"]
+    if module_name["old"] != module_name["new"]:
+        yield f"module {module_name['old']} -> {module_name['new']}\n"
+
+    for entry in report["registers"]:
+        if entry["change"] == "added":
+            yield f"+ {entry['name']} @ {entry['new']['address']}\n"
+        elif entry["change"] == "removed":
+            yield f"- {entry['name']} @ {entry['old']['address']}\n"
+        else:
+            changes = [format_change(change, entry["old"], entry["new"], "address") for change in entry["changes"] if change != "fields"]
+            yield f"~ {entry['name']} @ {entry['new']['address']}{': ' + ', '.join(changes) if changes else ''}\n"
+            for field in entry["fields"]:
+                if field["change"] == "added":
+                    yield f"    + {field['name']} [{field['new']['lsb'] + field['new']['width'] - 1}:{field['new']['lsb']}]\n"
+                elif field["change"] == "removed":
+                    yield f"    - {field['name']} [{field['old']['lsb'] + field['old']['width'] - 1}:{field['old']['lsb']}]\n"
+                else:
+                    changes = [format_change(change, field["old"], field["new"], "lsb") for change in field["changes"]]
+                    yield f"    ~ {field['name']}: {', '.join(changes)}\n"
+
+    summary = report["summary"]
+    yield f"summary: {summary['added']} added, {summary['removed']} removed, {summary['changed']} changed, {summary['unchanged']} unchanged\n"
+
+def main(argv=None):
+    """
+    命令行入口。两份规格相同时返回 0，存在差异时返回 1，与 diff 命令一致。
+
+    Args:
+        argv (list, optional): 命令行参数。如果为 None，则使用 sys.argv。
+    """
+    # 创建命令行参数解析器
+    parser = argparse.ArgumentParser(description="按名称和地址比较两份寄存器规格（Markdown、IP-XACT、二进制中间文件或 JSON），报告新增、删除、移动、改宽和复位值变化的寄存器及字段。")
+    parser.add_argument("old_file", help="旧规格文件的路径")
+    parser.add_argument("new_file", help="新规格文件的路径")
+    parser.add_argument("--format", choices=["text", "json"], help="输出到标准输出的格式，默认为 text", default="text")
+    parser.add_argument("--json_file", help="JSON 差异报告的路径。如果提供，则同时写出 JSON 报告。", default=None)
+    parser.add_argument("--start_address", type=lambda x: int(x, 0), help="Markdown 解析的起始地址，默认为 0", default=0)
+    parser.add_argument("--address_step", type=int, help="Markdown 解析的地址步进，默认为 4", default=4)
+    add_metrics_arguments(parser)
+
+    # 解析命令行参数
+    args = parser.parse_args(argv)
+    metrics = metrics_from_args("reg_diff", args)
+
+    try:
+        with metrics.phase("load"):
+            old_map = load_spec(args.old_file, args.start_address, args.address_step)
+            new_map = load_spec(args.new_file, args.start_address, args.address_step)
+    except FileNotFoundError as e:
+        logging.error(f"错误：文件 '{e.filename}' 未找到。")
+        return 2
+    metrics.count_registers(new_map)
+
+    with metrics.phase("diff"):
+        report = diff_register_maps(old_map, new_map)
+    metrics.count("changed", len(report["registers"]))
+
+    with metrics.phase("write"):
+        if args.format == "json":
+            json.dump(report, sys.stdout, ensure_ascii=False, indent=4)
+            sys.stdout.write("\n")
+        else:
+            sys.stdout.writelines(iter_text_report(report))
+
+        if args.json_file:
+            with open(args.json_file, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=4)
+            logging.info(f"差异报告已写入 '{args.json_file}'")
+
+    metrics.finish()
+    return 1 if report["registers"] or report["module_name"]["old"] != report["module_name"]["new"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
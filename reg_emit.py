@@ -0,0 +1,199 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from reg_metrics import NULL_METRICS
+
+DEFAULT_BUFFER_SIZE = 1 << 20  # 每次写入文件前累积的字符数，默认 1M
+PARALLEL_MIN_ITEMS = 2000  # 元素少于该数量时串行生成，进程池的启动和传输开销大于收益
+PARALLEL_CHUNKS_PER_JOB = 4  # 每个工作进程分到的块数，块越多负载越均衡
+
+def join_chunks(separator, chunks):
+    """
+    惰性版本的 separator.join(chunks)：逐个生成文本块，并在相邻块之间插入分隔符。
+
+    Args:
+        separator (str): 分隔符。
+        chunks (iterable): 文本块。
+
+    Yields:
+        str: 文本块或分隔符。
+    """
+    first = True
+    for chunk in chunks:
+        if not first:
+            yield separator
+        first = False
+        yield chunk
+
+def render(chunks):
+    """
+    将文本块拼接为完整字符串，供需要整段文本的调用方使用。
+
+    Args:
+        chunks (iterable): 文本块。
+
+    Returns:
+        str: 拼接后的文本。
+    """
+    return "".join(chunks)
+
+# 工作进程中的 (func, items, args, separator)，由进程池的 initializer 设置一次，之后的任务只传递下标范围
+_chunk_worker_state = None
+
+def _init_chunk_worker(func, items, args, separator):
+    global _chunk_worker_state
+    _chunk_worker_state = (func, items, args, separator)
+
+def _render_chunk(start, end):
+    func, items, args, separator = _chunk_worker_state
+    return _render_items(func, items[start:end], args, separator)
+
+def _render_items(func, items, args, separator):
+    if separator is None:
+        return "".join(chunk for item in items for chunk in func(item, *args))
+    return separator.join(filter(None, ("".join(func(item, *args)) for item in items)))
+
+def iter_parallel(func, items, args=(), jobs=1, separator=None):
+    """
+    对每个元素调用生成器函数 func(item, *args)，按元素的原顺序产出生成的文本。
+
+    jobs 大于 1 且元素足够多时，元素被切分为连续的块，在进程池中并行渲染，每块渲染为一个字符串，
+    再按块的原顺序产出，拼接结果与串行生成逐字节相同。func 必须是模块级函数，元素和参数必须可以 pickle；
+    元素只在启动工作进程时传递一次，之后每个任务只传递下标范围。
+
+    Args:
+        func (callable): 生成器函数，对一个元素逐段产出文本。
+        items (sequence): 元素序列，通常是寄存器或 (下标, 寄存器) 元组。
+        args (tuple): 传给 func 的其余参数。
+        jobs (int): 工作进程数。为 1 时串行生成；为 None 或 0 时使用 CPU 核数。
+        separator (str, optional): 如果提供，则每个元素的文本作为一项，非空项之间插入该分隔符。
+
+    Yields:
+        str: 文本块。
+    """
+    items = list(items)
+    if not jobs:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(items) < PARALLEL_MIN_ITEMS:
+        if separator is None:
+            for item in items:
+                yield from func(item, *args)
+        else:
+            yield from join_chunks(separator, filter(None, ("".join(func(item, *args)) for item in items)))
+        return
+
+    chunk_size = -(-len(items) // (jobs * PARALLEL_CHUNKS_PER_JOB))
+    starts = range(0, len(items), chunk_size)
+    ends = [min(start + chunk_size, len(items)) for start in starts]
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_chunk_worker, initargs=(func, items, args, separator)) as executor:
+        # map 按提交顺序返回结果，输出顺序与串行相同
+        results = executor.map(_render_chunk, starts, ends)
+        if separator is None:
+            yield from results
+        else:
+            yield from join_chunks(separator, filter(None, results))
+
+class BufferedEmitter:
+    """
+    缓冲的文本文件写入器。文本块先累积在内存中，达到 buffer_size 后一次写入文件，
+    因此内存占用只取决于缓冲区大小，与生成内容的总长度无关。
+    """
+
+    def __init__(self, output_file, buffer_size=DEFAULT_BUFFER_SIZE):
+        """
+        Args:
+            output_file (str): 输出文件的路径。
+            buffer_size (int): 缓冲区大小（字符数），默认为 1M。
+        """
+        self.output_file = output_file
+        self.buffer_size = buffer_size
+        self.bytes_written = 0
+        self.write_seconds = 0.0  # 实际写入文件所用的时间
+        self._buffer = []
+        self._pending = 0
+        self._file = open(output_file, 'w', encoding='utf-8')
+
+    def write(self, chunk):
+        self._buffer.append(chunk)
+        self._pending += len(chunk)
+        if self._pending >= self.buffer_size:
+            self.flush()
+
+    def write_all(self, chunks):
+        for chunk in chunks:
+            self.write(chunk)
+
+    def flush(self):
+        if self._buffer:
+            start = time.perf_counter()
+            self._file.write("".join(self._buffer))
+            self.write_seconds += time.perf_counter() - start
+            self._buffer = []
+            self._pending = 0
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self.bytes_written = self._file.tell()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def emit_if_changed(chunks, output_file, metrics=NULL_METRICS, name=None):
+    """
+    生成完整内容并与已有文件比较，只有内容不同时才写入，使未改变的文件保持原有的修改时间，
+    下游的 make/VCS 不会因此重新编译。生成的内容会整体保存在内存中。
+
+    Args:
+        chunks (iterable): 文本块。
+        output_file (str): 输出文件的路径。
+        metrics (Metrics): 指标记录器，默认不记录。
+        name (str, optional): 阶段名称后缀，见 emit_to_file。
+
+    Returns:
+        int: 写入文件的字节数，内容未改变时为 0。
+    """
+    suffix = f":{name}" if name else ""
+    with metrics.phase("emit" + suffix):
+        content = render(chunks).encode('utf-8')
+    try:
+        with open(output_file, 'rb') as f:
+            if f.read() == content:
+                return 0
+    except FileNotFoundError:
+        pass
+    with metrics.phase("write" + suffix):
+        with open(output_file, 'wb') as f:
+            f.write(content)
+    metrics.count("bytes_written", len(content))
+    metrics.count("files_written")
+    return len(content)
+
+def emit_to_file(chunks, output_file, buffer_size=DEFAULT_BUFFER_SIZE, metrics=NULL_METRICS, name=None):
+    """
+    将生成器产生的文本块流式写入文件。
+
+    Args:
+        chunks (iterable): 文本块。
+        output_file (str): 输出文件的路径。
+        buffer_size (int): 缓冲区大小（字符数），默认为 1M。
+        metrics (Metrics): 指标记录器，默认不记录。emit 阶段包含生成和写入的总时间，
+            write 阶段为其中实际写入文件的时间。
+        name (str, optional): 阶段名称后缀，例如后端名称，用于区分同一进程中的多个输出。
+
+    Returns:
+        int: 写入文件的字节数。
+    """
+    suffix = f":{name}" if name else ""
+    with metrics.phase("emit" + suffix):
+        with BufferedEmitter(output_file, buffer_size) as emitter:
+            emitter.write_all(chunks)
+    metrics.add_time("write" + suffix, emitter.write_seconds)
+    metrics.count("bytes_written", emitter.bytes_written)
+    metrics.count("files_written")
+    return emitter.bytes_written
\ No newline at end of file
@@ -0,0 +1,213 @@
+import cProfile
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+METRICS_FORMAT_VERSION = 1
+# --profile 未指定目录时的默认输出目录
+DEFAULT_PROFILE_DIR = "profile"
+# 每个阶段的 tracemalloc 报告中列出的分配位置数量
+TRACEMALLOC_TOP = 20
+
+class Metrics:
+    """
+    按阶段记录墙钟时间、CPU 时间和内存，以及寄存器数、字段数和写出字节数等计数。
+
+    未启用时 phase() 不做任何测量，调用方可以无条件使用。启用后每个阶段记录结束时进程的最大常驻内存
+    （max_rss_bytes），不影响计时。tracemalloc 会使被测代码慢数倍，只在指定 profile_dir 时启用：
+    此时额外记录每个阶段的 tracemalloc 峰值（peak_bytes），并输出 cProfile 数据（.prof）和
+    tracemalloc 分配报告（.txt）。tracemalloc 的峰值是进程级的，并发执行的阶段（例如 gen_all_reg
+    的各后端线程）只在没有其他阶段运行时重置峰值，因此重叠的阶段共享同一个峰值；同一时刻只能有一个
+    cProfile 分析器，与正在分析的阶段重叠的阶段不输出 .prof。
+    """
+
+    def __init__(self, tool, enabled=True, metrics_file=None, profile_dir=None):
+        """
+        Args:
+            tool (str): 入口脚本名称，写入指标文件并用作性能分析文件名前缀。
+            enabled (bool): 是否记录指标，默认为 True。
+            metrics_file (str, optional): 指标 JSON 文件的路径。如果为 None，则 finish() 不写文件。
+            profile_dir (str, optional): 每个阶段的 cProfile/tracemalloc 输出目录。如果为 None，则不输出。
+        """
+        self.tool = tool
+        self.enabled = enabled
+        self.metrics_file = metrics_file
+        self.profile_dir = profile_dir
+        self.phases = {}
+        self.counts = {}
+        self._lock = threading.Lock()
+        self._active = 0
+        self._profiling = False
+        self._started = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        if enabled and profile_dir:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            os.makedirs(profile_dir, exist_ok=True)
+
+    @contextmanager
+    def phase(self, name):
+        """
+        测量一个阶段。同名阶段多次执行时累加时间，内存取最大值。
+
+        Args:
+            name (str): 阶段名称，例如 read、parse、model、emit、write。
+        """
+        if not self.enabled:
+            yield
+            return
+
+        traced = self.profile_dir is not None
+        profiler = None
+        if traced:
+            with self._lock:
+                # 峰值是进程级的，其他阶段仍在运行时不能重置
+                if not self._active:
+                    tracemalloc.reset_peak()
+                self._active += 1
+                start_memory = tracemalloc.get_traced_memory()[0]
+                if not self._profiling:
+                    self._profiling = True
+                    profiler = cProfile.Profile()
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            cpu = time.thread_time() - cpu
+            wall = time.perf_counter() - wall
+            peak = None
+            if traced:
+                with self._lock:
+                    self._active -= 1
+                    peak = tracemalloc.get_traced_memory()[1] - start_memory
+                    if profiler is not None:
+                        self._profiling = False
+            self.add_time(name, wall, cpu, peak, max_rss_bytes())
+            if profiler is not None:
+                self._dump_profile(name, profiler)
+
+    def add_time(self, name, wall, cpu=0.0, peak_bytes=None, rss_bytes=None):
+        """
+        直接累加一个阶段的时间，用于无法用 phase() 包围的阶段（例如流式写出中的文件写入时间）。
+
+        Args:
+            name (str): 阶段名称。
+            wall (float): 墙钟时间（秒）。
+            cpu (float): CPU 时间（秒），默认为 0。
+            peak_bytes (int, optional): 该阶段新增的 tracemalloc 峰值内存（字节）。
+            rss_bytes (int, optional): 阶段结束时进程的最大常驻内存（字节）。
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            record = self.phases.setdefault(name, {"wall_seconds": 0.0, "cpu_seconds": 0.0, "peak_bytes": None, "max_rss_bytes": None, "calls": 0})
+            record["wall_seconds"] += wall
+            record["cpu_seconds"] += cpu
+            record["calls"] += 1
+            if peak_bytes is not None:
+                record["peak_bytes"] = max(record["peak_bytes"] or 0, peak_bytes)
+            if rss_bytes is not None:
+                record["max_rss_bytes"] = max(record["max_rss_bytes"] or 0, rss_bytes)
+
+    def count(self, name, amount=1):
+        """累加一个计数，例如 registers、fields、bytes_written。"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + amount
+
+    def count_registers(self, registers):
+        """记录寄存器数和字段数。"""
+        self.count("registers", len(registers))
+        self.count("fields", sum(len(register.fields) for register in registers))
+
+    def to_dict(self):
+        """返回可写为 JSON 的指标数据。"""
+        total = {
+            "wall_seconds": time.perf_counter() - self._wall,
+            "cpu_seconds": time.process_time() - self._cpu,
+            "peak_bytes": tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None,
+            "max_rss_bytes": max_rss_bytes(),
+        }
+        return {
+            "version": METRICS_FORMAT_VERSION,
+            "tool": self.tool,
+            "argv": sys.argv,
+            "started": self._started,
+            "phases": self.phases,
+            "counts": self.counts,
+            "total": total,
+        }
+
+    def finish(self):
+        """写出指标文件（如果指定），并在 INFO 日志中输出各阶段的摘要。"""
+        if not self.enabled:
+            return
+        report = self.to_dict()
+        for name, record in self.phases.items():
+            rss = "-" if record["max_rss_bytes"] is None else f"{record['max_rss_bytes'] / 2**20:.1f} MB"
+            peak = "" if record["peak_bytes"] is None else f"，tracemalloc 峰值 {record['peak_bytes'] / 2**20:.1f} MB"
+            logging.info(f"[{self.tool}] {name}: {record['wall_seconds']:.4f} 秒（CPU {record['cpu_seconds']:.4f} 秒），最大常驻内存 {rss}{peak}")
+        if self.metrics_file:
+            directory = os.path.dirname(self.metrics_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.metrics_file, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=4)
+            logging.info(f"指标已写入 '{self.metrics_file}'")
+
+    def _dump_profile(self, name, profiler):
+        prefix = os.path.join(self.profile_dir, f"{self.tool}.{re.sub(r'[^A-Za-z0-9_.-]', '_', name)}")
+        profiler.dump_stats(prefix + ".prof")
+        snapshot = tracemalloc.take_snapshot()
+        with open(prefix + ".tracemalloc.txt", 'w', encoding='utf-8') as f:
+            for stat in snapshot.statistics("lineno")[:TRACEMALLOC_TOP]:
+                f.write(f"{stat}\n")
+
+# 未启用指标时使用的共享实例
+NULL_METRICS = Metrics("null", enabled=False)
+
+def max_rss_bytes():
+    """返回进程的最大常驻内存（字节），平台不支持时返回 None。"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 以 KB 为单位，macOS 以字节为单位
+    return rss if sys.platform == "darwin" else rss * 1024
+
+def add_metrics_arguments(parser):
+    """为命令行参数解析器添加 --metrics_json 和 --profile 选项。"""
+    parser.add_argument("--metrics_json", "--metrics-json", help="将各阶段的耗时、CPU 时间、峰值内存和计数写入该 JSON 文件", default=None)
+    parser.add_argument("--profile", nargs="?", const=DEFAULT_PROFILE_DIR, metavar="DIR",
+                        help=f"记录各阶段指标，并启用 tracemalloc，将每个阶段的 cProfile 和 tracemalloc 结果写入 DIR（默认为 {DEFAULT_PROFILE_DIR}）；"
+                             "tracemalloc 会显著增加耗时，计时请使用 --metrics_json", default=None)
+
+def metrics_from_args(tool, args):
+    """
+    根据命令行参数创建 Metrics。未指定 --metrics_json 和 --profile 时返回不做任何测量的 NULL_METRICS。
+
+    Args:
+        tool (str): 入口脚本名称。
+        args (argparse.Namespace): 包含 metrics_json 和 profile 的命令行参数。
+
+    Returns:
+        Metrics: 指标记录器。
+    """
+    if not args.metrics_json and not args.profile:
+        return NULL_METRICS
+    return Metrics(tool, metrics_file=args.metrics_json, profile_dir=args.profile)
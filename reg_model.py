@@ -0,0 +1,290 @@
+import re
+import json
+from reg_metrics import NULL_METRICS
+
+# Verilog 风格的数值，例如 8'hff、1'b0、'd10
+VERILOG_NUMBER_RE = re.compile(r"^\s*(\d*)\s*'\s*([sS]?)([bBoOdDhH])\s*([0-9a-fA-F_xXzZ]+)\s*$")
+VERILOG_BASES = {"b": 2, "o": 8, "d": 10, "h": 16}
+
+def parse_int(value, default=0):
+    """
+    将寄存器描述中的数值（0x 前缀、十进制或 Verilog 风格）转换为整数。
+
+    Args:
+        value (int | str | None): 需要转换的数值。
+        default (int): 值为空时返回的默认值，默认为 0。
+
+    Returns:
+        int: 转换后的整数。
+
+    Raises:
+        ValueError: 数值格式无法识别。
+    """
+    if value is None:
+        return default
+    if isinstance(value, int):
+        return value
+    text = str(value).strip()
+    if not text:
+        return default
+    try:
+        return int(text, 0)
+    except ValueError:
+        pass
+    m = VERILOG_NUMBER_RE.match(text)
+    if m:
+        return int(m.group(4).replace("_", ""), VERILOG_BASES[m.group(3).lower()])
+    return int(text.replace("_", ""), 0)
+
+class Field:
+    """寄存器字段。lsb/msb/mask 在构造时计算一次。"""
+
+    __slots__ = ("name", "width", "lsb", "msb", "mask", "reset", "type", "access", "desc")
+
+    def __init__(self, name, width, lsb=0, reset=0, type="RW", access="RW", desc=""):
+        self.name = name
+        self.width = width
+        self.lsb = lsb
+        self.msb = lsb + width - 1
+        self.mask = ((1 << width) - 1) << lsb
+        self.reset = reset
+        self.type = type
+        self.access = access
+        self.desc = desc
+
+    def __repr__(self):
+        return f"Field({self.name!r}, [{self.msb}:{self.lsb}])"
+
+class Register:
+    """寄存器。地址为整数，宽度、复位值和字段掩码在构造时计算一次。"""
+
+    __slots__ = ("name", "desc", "type", "access", "address", "width", "fields", "index", "reset", "mask")
+
+    def __init__(self, name, address, fields=(), type="RW", access="RW", desc="", width=None, index=0, reset=None):
+        self.name = name
+        self.desc = desc
+        self.type = type
+        self.access = access
+        self.address = address
+        self.fields = tuple(fields)
+        self.index = index
+
+        mask = 0
+        field_reset = 0
+        for field in self.fields:
+            mask |= field.mask
+            field_reset |= (field.reset << field.lsb) & field.mask
+        self.mask = mask
+        self.width = sum(field.width for field in self.fields) if width is None else width
+        self.reset = field_reset if reset is None else reset
+
+    def __repr__(self):
+        return f"Register({self.name!r}, 0x{self.address:x})"
+
+class RegisterMap:
+    """
+    模块的寄存器集合，按原始顺序保存寄存器，并建立一次名称和地址索引。
+
+    可以像列表一样迭代、取长度和按下标访问，因此可以直接传给各个后端的 generate_* 函数。
+    """
+
+    __slots__ = ("module_name", "registers", "by_name", "by_address")
+
+    def __init__(self, module_name, registers):
+        self.module_name = module_name
+        self.registers = list(registers)
+        self.by_name = {}
+        self.by_address = {}
+        for index, register in enumerate(self.registers):
+            register.index = index
+            self.by_name.setdefault(register.name, register)
+            self.by_address.setdefault(register.address, register)
+
+    def __iter__(self):
+        return iter(self.registers)
+
+    def __len__(self):
+        return len(self.registers)
+
+    def __getitem__(self, index):
+        return self.registers[index]
+
+    def find(self, name):
+        """按名称查找寄存器，不存在时返回 None。"""
+        return self.by_name.get(name)
+
+    def at(self, address):
+        """按地址查找寄存器，不存在时返回 None。"""
+        return self.by_address.get(address)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        从 md2json_reg 生成的 JSON 数据构建寄存器集合。
+
+        Args:
+            data (dict): 包含 MODULE_NAME 和 REGISTERS 的寄存器数据。
+
+        Returns:
+            RegisterMap: 寄存器集合。
+        """
+        return cls(data["MODULE_NAME"], [register_from_dict(register) for register in data["REGISTERS"]])
+
+    def to_dict(self):
+        """
+        转换为 md2json_reg 的 JSON 数据格式。
+
+        Returns:
+            dict: 包含 MODULE_NAME 和 REGISTERS 的寄存器数据。
+        """
+        return {
+            "MODULE_NAME": self.module_name,
+            "REGISTERS": [register_to_dict(register) for register in self.registers],
+        }
+
+def register_from_dict(register):
+    """
+    将 JSON 中的单个寄存器转换为 Register。字段未给出 LSB 时按字段顺序依次排列。
+
+    Args:
+        register (dict): JSON 中的寄存器信息。
+
+    Returns:
+        Register: 寄存器对象。
+    """
+    fields = []
+    bit_offset = 0
+    for field in register.get("FIELDS", []):
+        width = int(field["WIDTH"])
+        lsb = int(field.get("LSB", bit_offset))
+        fields.append(Field(
+            field["NAME"],
+            width,
+            lsb,
+            parse_int(field.get("RESET")),
+            field.get("TYPE", "RW"),
+            field.get("ACCESS", "RW"),
+            field.get("DESC", ""),
+        ))
+        bit_offset = lsb + width
+
+    width = register.get("WIDTH")
+    reset = register.get("RESET_VALUE")
+    return Register(
+        register["REG_NAME"],
+        parse_int(register.get("ADDRESS")),
+        fields,
+        register.get("REG_TYPE", "RW"),
+        register.get("ACCESS", "RW"),
+        register.get("DESC", ""),
+        None if width is None else int(width),
+        reset=None if reset is None else parse_int(reset),
+    )
+
+def register_to_dict(register):
+    """
+    将 Register 转换为 JSON 中的寄存器信息。LSB、ACCESS 和 RESET_VALUE 只在与默认推导结果不同时写出，
+    因此 md2json_reg 生成的数据转换前后格式相同。
+    """
+    fields = []
+    bit_offset = 0
+    field_reset = 0
+    for field in register.fields:
+        item = {"NAME": field.name}
+        if field.lsb != bit_offset:
+            item["LSB"] = field.lsb
+        item["WIDTH"] = field.width
+        item["RESET"] = hex(field.reset)
+        item["TYPE"] = field.type
+        if field.access != "RW":
+            item["ACCESS"] = field.access
+        item["DESC"] = field.desc
+        fields.append(item)
+        bit_offset = field.lsb + field.width
+        field_reset |= (field.reset << field.lsb) & field.mask
+
+    data = {
+        "REG_NAME": register.name,
+        "DESC": register.desc,
+        "REG_TYPE": register.type,
+        "ADDRESS": hex(register.address),
+        "FIELDS": fields,
+        "WIDTH": register.width,
+    }
+    if register.access != "RW":
+        data["ACCESS"] = register.access
+    if register.reset != field_reset:
+        data["RESET_VALUE"] = hex(register.reset)
+    return data
+
+def field_access(register, field):
+    """
+    返回字段的有效访问类型（UVM 命名，大写）。RO/WO 寄存器的所有字段沿用寄存器类型；
+    否则字段 ACCESS 不是默认的 RW 时（例如 IP-XACT 的 W1C/W1S）取 ACCESS，再否则取字段 TYPE。
+
+    Args:
+        register (Register): 字段所属的寄存器。
+        field (Field): 字段。
+
+    Returns:
+        str: 访问类型，例如 RW、RO、WO、W1C、W1S。
+    """
+    reg_type = (register.type or "").upper()
+    if reg_type in ("RO", "WO"):
+        return reg_type
+    access = (field.access or "RW").upper()
+    if access == "RW":
+        access = (field.type or "RW").upper()
+    return access
+
+def as_registers(registers):
+    """
+    将寄存器列表统一为 Register 对象序列。已经是 RegisterMap 或 Register 列表时直接返回，
+    JSON 字典列表则逐个转换，以兼容直接传入 json.load 结果的调用方。
+
+    Args:
+        registers (RegisterMap | list): 寄存器集合、Register 列表或 JSON 寄存器字典列表。
+
+    Returns:
+        RegisterMap | list: Register 对象序列。
+    """
+    if isinstance(registers, RegisterMap):
+        return registers
+    registers = list(registers)
+    if registers and isinstance(registers[0], dict):
+        return RegisterMap(None, [register_from_dict(register) for register in registers])
+    return registers
+
+def load_register_map(json_file, metrics=NULL_METRICS):
+    """
+    读取 md2json_reg 生成的 JSON 文件并构建寄存器集合。.xml 文件按 IP-XACT 格式由 ipxact_reg 转换，
+    .regb 文件按二进制中间文件由 reg_binary 读取。
+
+    Args:
+        json_file (str): JSON、IP-XACT 或二进制中间文件的路径。
+        metrics (Metrics): 指标记录器，分别记录 read、parse 和 model 阶段，默认不记录。
+
+    Returns:
+        RegisterMap: 寄存器集合。
+    """
+    if json_file.endswith(".regb"):
+        from reg_binary import load_binary_register_map
+        return load_binary_register_map(json_file, metrics)
+
+    if json_file.endswith(".xml"):
+        from ipxact_reg import import_ipxact
+        data = import_ipxact(json_file, metrics=metrics)
+        with metrics.phase("model"):
+            registers = RegisterMap.from_dict(data)
+        metrics.count_registers(registers)
+        return registers
+
+    with metrics.phase("read"):
+        with open(json_file, 'r', encoding='utf-8') as f:
+            text = f.read()
+    with metrics.phase("parse"):
+        data = json.loads(text)
+    with metrics.phase("model"):
+        registers = RegisterMap.from_dict(data)
+    metrics.count_registers(registers)
+    return registers
\ No newline at end of file
@@ -0,0 +1,341 @@
+import io
+import json
+import logging
+import argparse
+import os
+import runpy
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+import importlib
+from contextlib import redirect_stdout, redirect_stderr
+from reg_metrics import NULL_METRICS, add_metrics_arguments, metrics_from_args
+
+# 配置日志记录
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# 可以通过服务执行的脚本（与脚本文件名相同，不含 .py）
+SERVICE_SCRIPTS = (
+    "md2json_reg", "json2rtl_reg", "json2ral_reg", "json2cheader_reg",
+    "json2ctest_reg", "xml_to_struct_and_test", "gen_all_reg",
+)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOCKET = os.path.join("build", "reg_service.sock")
+DEFAULT_POLL_INTERVAL = 0.2  # 监视模式下检查文件变化的间隔（秒）
+DEFAULT_MAX_MODELS = 32  # 内存中最多保存的寄存器模型数量
+
+class GeneratorService:
+    """
+    常驻的生成器服务。各脚本及其依赖只导入一次，解析后的寄存器模型保存在内存 LRU 缓存中。
+
+    run() 在进程内以原有的命令行参数执行脚本，gen_all_reg 直接使用内存缓存；
+    watch() 监视规格文件，文件内容改变时只重写内容发生变化的输出文件。
+    脚本执行会修改当前目录、sys.argv 和标准输出，因此同一时间只执行一个请求。
+    """
+
+    def __init__(self, max_models=DEFAULT_MAX_MODELS, cache_file=None, metrics=NULL_METRICS):
+        """
+        Args:
+            max_models (int): 内存中最多保存的寄存器模型数量，默认为 32。
+            cache_file (str, optional): SQLite 寄存器模型缓存文件，作为内存缓存的二级缓存。
+            metrics (Metrics): 指标记录器，记录 startup（导入脚本模块）、load、emit:<后端>/write:<后端> 和 request 阶段，默认不记录。
+        """
+        # 客户端不创建服务实例，只在服务进程中导入缓存和各脚本模块
+        from reg_cache import MemoryModelCache, RegisterModelCache
+
+        backing = RegisterModelCache(cache_file) if cache_file else None
+        self.models = MemoryModelCache(max_models, backing)
+        self.metrics = metrics
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._last_models = {}
+
+        # 预先导入全部脚本模块，请求中不再有导入开销
+        with metrics.phase("startup"):
+            for script in SERVICE_SCRIPTS:
+                importlib.import_module(script)
+
+    def run(self, script, argv, cwd=None):
+        """
+        在进程内执行脚本，效果与 python3 <script>.py <argv> 相同。
+
+        Args:
+            script (str): 脚本名称，取值见 SERVICE_SCRIPTS，可以带 .py 后缀。
+            argv (list): 命令行参数（不含脚本名）。
+            cwd (str, optional): 执行时的当前目录，默认为服务的当前目录。
+
+        Returns:
+            tuple: (退出码, 脚本输出的文本)。
+        """
+        script = os.path.splitext(os.path.basename(script))[0]
+        if script not in SERVICE_SCRIPTS:
+            return 2, f"错误：不支持的脚本 '{script}'，可选：{', '.join(SERVICE_SCRIPTS)}\n"
+
+        output = io.StringIO()
+        with self._lock:
+            self.requests += 1
+            # 脚本可能以 --profile 运行并启用自己的 cProfile，因此请求耗时直接累加，不使用 phase()
+            wall, cpu = time.perf_counter(), time.thread_time()
+            old_cwd, old_argv, old_stdin = os.getcwd(), sys.argv, sys.stdin
+            handlers = [h for h in logging.getLogger().handlers if isinstance(h, logging.StreamHandler)]
+            streams = [h.setStream(output) for h in handlers]
+            try:
+                if cwd:
+                    os.chdir(cwd)
+                # 服务中没有终端，脚本不会进入交互输入
+                sys.stdin = io.StringIO()
+                with redirect_stdout(output), redirect_stderr(output):
+                    code = self._run_script(script, argv)
+            finally:
+                for handler, stream in zip(handlers, streams):
+                    handler.setStream(stream)
+                sys.argv, sys.stdin = old_argv, old_stdin
+                os.chdir(old_cwd)
+                self.metrics.add_time("request", time.perf_counter() - wall, time.thread_time() - cpu)
+        self.metrics.count("requests")
+        return code, output.getvalue()
+
+    def _run_script(self, script, argv):
+        try:
+            if script == "gen_all_reg":
+                importlib.import_module("gen_all_reg").main(argv, cache=self.models)
+            else:
+                sys.argv = [os.path.join(SCRIPT_DIR, script + ".py")] + list(argv)
+                runpy.run_path(sys.argv[0], run_name="__main__")
+            return 0
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                return e.code or 0
+            print(e.code)
+            return 1
+        except Exception:
+            traceback.print_exc()
+            return 1
+
+    def regenerate(self, spec_file, output_dir, options):
+        """
+        重新生成单个规格文件的输出。寄存器模型与上次相同时直接跳过，
+        否则只重写内容发生变化的输出文件。
+
+        Args:
+            spec_file (str): 规格文件路径（.md/.json/.xml）。
+            output_dir (str): 输出目录。
+            options (dict): 生成选项，见 batch_reg.process_spec。
+        """
+        from gen_all_reg import BACKEND_OPTIONS, load_register_data, generate_all
+
+        start = time.perf_counter()
+        os.makedirs(output_dir, exist_ok=True)
+        with self._lock:
+            with self.metrics.phase("load"):
+                data = load_register_data(spec_file, options["start_address"], options["address_step"], self.models)
+            if self._last_models.get((spec_file, output_dir)) is data:
+                logging.info(f"'{spec_file}' 的寄存器模型未改变，跳过生成")
+                return
+            generate_all(data, backends=options.get("backends"), output_dir=output_dir,
+                         apb_data_width=options["apb_data_width"], base_address=options["base_address"], only_changed=True,
+                         metrics=self.metrics, **{name: options[name] for name in BACKEND_OPTIONS if name in options})
+            self._last_models[(spec_file, output_dir)] = data
+            self.metrics.count("regenerations")
+        logging.info(f"'{spec_file}' 已重新生成，耗时 {(time.perf_counter() - start) * 1000:.1f} 毫秒")
+
+    def watch(self, specs, output_root, options, interval=DEFAULT_POLL_INTERVAL, once=False):
+        """
+        轮询规格文件的修改时间和大小，发生变化时重新生成对应的输出。
+
+        Args:
+            specs (list): 规格文件路径列表。
+            output_root (str): 输出目录。多个规格文件时按 batch_reg 的规则分配子目录。
+            options (dict): 生成选项，见 batch_reg.process_spec。
+            interval (float): 轮询间隔（秒），默认为 0.2。
+            once (bool): 只检查并生成一次后返回，默认为 False。
+        """
+        from batch_reg import output_dirs_for
+
+        output_dirs = {specs[0]: output_root} if len(specs) == 1 else output_dirs_for(specs, output_root)
+        signatures = {}
+        logging.info(f"开始监视 {len(specs)} 个规格文件，按 Ctrl+C 退出")
+        while True:
+            for spec in specs:
+                try:
+                    stat = os.stat(spec)
+                except FileNotFoundError:
+                    continue
+                signature = (stat.st_mtime_ns, stat.st_size)
+                if signatures.get(spec) == signature:
+                    continue
+                signatures[spec] = signature
+                try:
+                    self.regenerate(spec, output_dirs[spec], options)
+                except Exception as e:
+                    logging.error(f"错误：重新生成 '{spec}' 失败：{type(e).__name__}: {e}")
+            if once:
+                return
+            time.sleep(interval)
+
+    def stats(self):
+        """返回请求数和内存模型缓存的统计信息。"""
+        return {"requests": self.requests, "models": self.models.stats()}
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """每个连接处理一个 JSON 请求行，返回一个 JSON 响应行。"""
+
+    def handle(self):
+        service = self.server.service
+        try:
+            request = json.loads(self.rfile.readline())
+            command = request.get("command", "run")
+            if command == "run":
+                code, output = service.run(request["script"], request.get("argv", []), request.get("cwd"))
+                response = {"exit_code": code, "output": output}
+            elif command == "stats":
+                response = {"exit_code": 0, "output": json.dumps(service.stats(), indent=4) + "\n"}
+            elif command == "stop":
+                self.server.stopping = True
+                response = {"exit_code": 0, "output": "服务已停止\n"}
+            else:
+                response = {"exit_code": 2, "output": f"错误：未知命令 '{command}'\n"}
+        except Exception as e:
+            response = {"exit_code": 1, "output": f"错误：{type(e).__name__}: {e}\n"}
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b"\n")
+
+def serve(socket_path, service):
+    """
+    在 Unix socket 上运行服务，直到收到 stop 命令或被中断。
+
+    Args:
+        socket_path (str): Unix socket 文件的路径。
+        service (GeneratorService): 生成器服务。
+    """
+    directory = os.path.dirname(socket_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    server = socketserver.UnixStreamServer(socket_path, _RequestHandler)
+    server.service = service
+    server.stopping = False
+    server.timeout = 0.5
+    logging.info(f"生成器服务已在 '{socket_path}' 上启动")
+    try:
+        while not server.stopping:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(socket_path)
+        logging.info("生成器服务已退出")
+
+def send_request(socket_path, request):
+    """
+    向服务发送一个请求并返回响应。
+
+    Args:
+        socket_path (str): Unix socket 文件的路径。
+        request (dict): 请求内容。
+
+    Returns:
+        dict: 包含 exit_code 和 output 的响应。
+
+    Raises:
+        OSError: 无法连接服务。
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(json.dumps(request, ensure_ascii=False).encode('utf-8') + b"\n")
+        with client.makefile('rb') as f:
+            return json.loads(f.readline())
+
+def main():
+    from gen_all_reg import add_backend_arguments, backend_options
+
+    # 创建命令行参数解析器
+    parser = argparse.ArgumentParser(description="常驻的寄存器代码生成服务：监视规格文件或通过 Unix socket 执行各脚本。")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="在 Unix socket 上运行服务")
+    serve_parser.add_argument("--socket", help=f"Unix socket 文件的路径，默认为 {DEFAULT_SOCKET}", default=DEFAULT_SOCKET)
+    serve_parser.add_argument("--max_models", type=int, help=f"内存中最多保存的寄存器模型数量，默认为 {DEFAULT_MAX_MODELS}", default=DEFAULT_MAX_MODELS)
+    serve_parser.add_argument("--cache_file", help="SQLite 寄存器模型缓存文件，作为二级缓存。如果省略，则不使用。", default=None)
+    add_metrics_arguments(serve_parser)
+
+    watch_parser = subparsers.add_parser("watch", help="在前台监视规格文件，改变时重新生成输出")
+    watch_parser.add_argument("inputs", nargs="+", help="规格文件、目录或通配符（.md/.json/.xml）")
+    watch_parser.add_argument("--output_dir", help="输出目录，默认为当前目录", default=".")
+    watch_parser.add_argument("--interval", type=float, help=f"轮询间隔（秒），默认为 {DEFAULT_POLL_INTERVAL}", default=DEFAULT_POLL_INTERVAL)
+    watch_parser.add_argument("--backends", nargs="+", choices=["cheader", "ral", "rtl", "ctest", "host"], help="需要生成的后端，默认为全部", default=None)
+    watch_parser.add_argument("--start_address", type=lambda x: int(x, 0), help="起始地址，默认为 0", default=0)
+    watch_parser.add_argument("--address_step", type=int, help="地址步进，默认为 4", default=4)
+    watch_parser.add_argument("--apb_data_width", type=int, help="APB 数据宽度，默认为 32", default=32)
+    watch_parser.add_argument("--base_address", help="寄存器基地址，默认为 0x10000000", default="0x10000000")
+    add_backend_arguments(watch_parser)
+    watch_parser.add_argument("--max_models", type=int, help=f"内存中最多保存的寄存器模型数量，默认为 {DEFAULT_MAX_MODELS}", default=DEFAULT_MAX_MODELS)
+    watch_parser.add_argument("--once", action="store_true", help="只生成一次后退出")
+    add_metrics_arguments(watch_parser)
+
+    run_parser = subparsers.add_parser("run", help="通过服务执行脚本，参数与直接运行脚本相同；服务未启动时在本进程中执行")
+    run_parser.add_argument("--socket", help=f"Unix socket 文件的路径，默认为 {DEFAULT_SOCKET}", default=DEFAULT_SOCKET)
+    run_parser.add_argument("script", help=f"脚本名称：{', '.join(SERVICE_SCRIPTS)}")
+    run_parser.add_argument("args", nargs=argparse.REMAINDER, help="传给脚本的命令行参数")
+
+    for name, help_text in (("stats", "显示服务的请求数和模型缓存统计"), ("stop", "停止服务")):
+        command_parser = subparsers.add_parser(name, help=help_text)
+        command_parser.add_argument("--socket", help=f"Unix socket 文件的路径，默认为 {DEFAULT_SOCKET}", default=DEFAULT_SOCKET)
+
+    # 解析命令行参数
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        # 指标在服务退出时写出
+        metrics = metrics_from_args("reg_service", args)
+        serve(args.socket, GeneratorService(args.max_models, args.cache_file, metrics))
+        metrics.finish()
+        return 0
+
+    if args.command == "watch":
+        from batch_reg import collect_specs
+        specs = collect_specs(args.inputs)
+        if not specs:
+            logging.error(f"错误：未找到任何寄存器描述文件：{' '.join(args.inputs)}")
+            return 1
+        options = {
+            "start_address": args.start_address,
+            "address_step": args.address_step,
+            "apb_data_width": args.apb_data_width,
+            "base_address": args.base_address,
+            "backends": args.backends,
+            **backend_options(args),
+        }
+        metrics = metrics_from_args("reg_service", args)
+        try:
+            GeneratorService(args.max_models, metrics=metrics).watch(specs, args.output_dir, options, args.interval, args.once)
+        except KeyboardInterrupt:
+            pass
+        metrics.finish()
+        return 0
+
+    if args.command == "run":
+        request = {"command": "run", "script": args.script, "argv": args.args, "cwd": os.getcwd()}
+    else:
+        request = {"command": args.command}
+
+    try:
+        response = send_request(args.socket, request)
+    except OSError:
+        if args.command != "run":
+            logging.error(f"错误：无法连接服务 '{args.socket}'")
+            return 1
+        logging.warning(f"无法连接服务 '{args.socket}'，在本进程中执行")
+        code, output = GeneratorService().run(args.script, args.args)
+        response = {"exit_code": code, "output": output}
+
+    sys.stdout.write(response["output"])
+    return response["exit_code"]
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+import re
+import sys
+import shutil
+import marshal
+import hashlib
+import logging
+import argparse
+import importlib
+import os
+
+# 配置日志记录
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# 编译格式版本，修改模板语法或生成的代码时递增以使旧的编译缓存失效
+TEMPLATE_FORMAT_VERSION = 1
+
+# 内置模板目录；用户模板目录中的同名模板优先
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+CACHE_DIR_NAME = "__pycache__"
+
+# 独占一行的 {% 语句 %} 和 {# 注释 #} 连同缩进和行尾换行一起去掉，其余标签原位替换
+TAG_RE = re.compile(r"""
+    ^[ \t]*(?P<line>\{%(?:(?!%\}).)*%\}|\{\#(?:(?!\#\}).)*\#\})[ \t]*(?:\n|\Z)
+  | (?P<tag>\{\{(?:(?!\}\}).)*\}\}|\{%(?:(?!%\}).)*%\}|\{\#(?:(?!\#\}).)*\#\})
+""", re.M | re.S | re.X)
+INCLUDE_RE = re.compile(r"""^(["'])(?P<name>.+?)\1\s*(?P<args>.*)$""", re.S)
+
+# 已编译的模板：内容哈希 -> (代码对象, 引用的子模板名称)
+_compiled = {}
+
+class Template:
+    """
+    编译后的模板。调用 template(*args) 或 template.render(*args) 得到逐段产出文本的生成器，
+    参数由模板开头的 {% args ... %} 声明。
+
+    pickle 时只保存名称、模板目录和命名空间，在工作进程中重新加载（命中编译缓存），因此可以作为
+    reg_emit.iter_parallel 的参数。
+    """
+
+    __slots__ = ("name", "template_dir", "namespace", "path", "digest", "render")
+
+    def __init__(self, name, template_dir, namespace, path, digest, render):
+        self.name = name
+        self.template_dir = template_dir
+        self.namespace = namespace
+        self.path = path
+        self.digest = digest
+        self.render = render
+
+    def __call__(self, *args, **kwargs):
+        return self.render(*args, **kwargs)
+
+    def __reduce__(self):
+        return (load_template, (self.name, self.template_dir, self.namespace))
+
+    def __repr__(self):
+        return f"Template({self.name!r}, {self.path!r})"
+
+def find_template(name, template_dir=None):
+    """
+    查找模板文件：template_dir 中存在同名文件时使用该文件，否则使用内置模板。
+
+    Args:
+        name (str): 模板文件名，例如 cheader.h.tpl。
+        template_dir (str, optional): 用户模板目录。
+
+    Returns:
+        str: 模板文件路径。
+    """
+    if template_dir:
+        path = os.path.join(template_dir, name)
+        if os.path.exists(path):
+            return path
+    return os.path.join(TEMPLATE_DIR, name)
+
+def template_digest(source):
+    """返回模板内容（连同编译格式版本和 Python 版本）的 SHA-256 哈希，作为编译缓存的键。"""
+    h = hashlib.sha256(f"v{TEMPLATE_FORMAT_VERSION}\0{sys.implementation.cache_tag}\0".encode('utf-8'))
+    h.update(source.encode('utf-8'))
+    return h.hexdigest()
+
+def compile_template(source, name="<template>"):
+    """
+    将模板编译为 Python 生成器函数 render 的模块代码。
+
+    模板语法：
+        {{ 表达式 }}                 按 f-string 求值，可以带格式说明，例如 {{ register.address:X }}
+        {% args a, b %}              声明 render 的参数，只能出现在开头
+        {% for x in 表达式 %} ... {% endfor %}
+        {% if 条件 %} ... {% elif 条件 %} ... {% else %} ... {% endif %}
+        {% set 名称 = 表达式 %}
+        {% include "子模板" 参数 %}   产出子模板 render(参数) 的全部文本
+        {# 注释 #}
+    独占一行的语句和注释不产生输出（包括行尾换行）。相邻的文本和表达式编译为一个 f-string，
+    因此渲染速度与手写的 f-string 相同。表达式中的名称在后端模块的全局命名空间中查找。
+
+    Args:
+        source (str): 模板内容。
+        name (str): 模板名称，用于错误信息。
+
+    Returns:
+        tuple: (模块代码对象, 引用的子模板名称元组)。
+
+    Raises:
+        ValueError: 模板语法错误，信息中包含模板行号。
+    """
+    lines = []  # 生成的 Python 代码行
+    line_numbers = []  # 每行代码对应的模板行号
+    pieces = []  # 尚未产出的文本常量和 f-string 片段
+    blocks = []  # 尚未结束的 for/if 块：(语句, 模板行号)
+    includes = []
+    params = ""
+    has_yield = False
+    lineno = 1
+    pos = 0
+
+    def error(message):
+        return ValueError(f"模板 '{name}' 第 {lineno} 行：{message}")
+
+    def emit(code):
+        lines.append("    " * (len(blocks) + 1) + code)
+        line_numbers.append(lineno)
+
+    def flush():
+        nonlocal has_yield
+        if pieces:
+            emit("yield " + " ".join(pieces))
+            pieces.clear()
+            has_yield = True
+
+    for match in TAG_RE.finditer(source):
+        text = source[pos:match.start()]
+        if text:
+            pieces.append(repr(text))
+        lineno = source.count("\n", 0, match.start()) + 1
+        pos = match.end()
+        tag = match.group("line") or match.group("tag")
+        if tag.startswith("{#"):
+            continue
+        if tag.startswith("{{"):
+            pieces.append(f'f"""{{{tag[2:-2].strip()}}}"""')
+            continue
+
+        flush()
+        keyword, _, rest = tag[2:-2].strip().partition(" ")
+        rest = rest.strip()
+        if keyword == "args":
+            if lines or blocks:
+                raise error("{% args %} 只能出现在模板开头")
+            params = rest
+        elif keyword in ("for", "if"):
+            emit(f"{keyword} {rest}:")
+            blocks.append((keyword, lineno))
+            emit("pass")
+        elif keyword in ("elif", "else"):
+            if not blocks or blocks[-1][0] != "if":
+                raise error(f"{{% {keyword} %}} 没有对应的 {{% if %}}")
+            block = blocks.pop()
+            emit(f"elif {rest}:" if keyword == "elif" else "else:")
+            blocks.append(block)
+            emit("pass")
+        elif keyword in ("endfor", "endif"):
+            if not blocks or blocks[-1][0] != keyword[3:]:
+                raise error(f"{{% {keyword} %}} 没有对应的 {{% {keyword[3:]} %}}")
+            blocks.pop()
+        elif keyword == "set":
+            emit(rest)
+        elif keyword == "include":
+            include = INCLUDE_RE.match(rest)
+            if not include:
+                raise error("{% include %} 的格式为 {% include \"模板名称\" 参数 %}")
+            emit(f"yield from _include_{len(includes)}({include.group('args')})")
+            includes.append(include.group("name"))
+            has_yield = True
+        else:
+            raise error(f"未知的语句 {{% {keyword} %}}")
+
+    text = source[pos:]
+    if text:
+        pieces.append(repr(text))
+    flush()
+    if blocks:
+        keyword, lineno = blocks[-1]
+        raise error(f"{{% {keyword} %}} 没有结束")
+    if not has_yield:
+        emit("yield from ()")
+
+    code = f"def render({params}):\n" + "\n".join(lines) + "\n"
+    try:
+        return compile(code, name, "exec"), tuple(includes)
+    except SyntaxError as e:
+        lineno = line_numbers[e.lineno - 2] if e.lineno and 2 <= e.lineno < len(line_numbers) + 2 else lineno
+        raise error(f"表达式语法错误：{e.msg}") from e
+
+def load_compiled(path, source):
+    """
+    返回模板的编译结果。依次查找进程内缓存、模板目录下 __pycache__ 中的编译缓存，都未命中时编译模板并写入缓存。
+    缓存按模板内容哈希校验，模板修改后自动重新编译；缓存目录不可写时只在进程内缓存。
+
+    Args:
+        path (str): 模板文件路径。
+        source (str): 模板内容。
+
+    Returns:
+        tuple: (内容哈希, 模块代码对象, 引用的子模板名称元组)。
+    """
+    digest = template_digest(source)
+    if digest in _compiled:
+        return (digest,) + _compiled[digest]
+
+    cache_file = os.path.join(os.path.dirname(path), CACHE_DIR_NAME, f"{os.path.basename(path)}.{sys.implementation.cache_tag}.bin")
+    try:
+        with open(cache_file, 'rb') as f:
+            cached_digest, code, includes = marshal.load(f)
+        if cached_digest != digest:
+            raise ValueError("模板已修改")
+    except (OSError, ValueError, EOFError, TypeError):
+        code, includes = compile_template(source, path)
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            temp_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(temp_file, 'wb') as f:
+                marshal.dump((digest, code, includes), f)
+            os.replace(temp_file, cache_file)
+        except OSError as e:
+            logging.debug(f"无法写入模板编译缓存 '{cache_file}'：{e}")
+
+    _compiled[digest] = (code, includes)
+    return digest, code, includes
+
+def load_template(name, template_dir=None, namespace=None, _loading=()):
+    """
+    加载并编译模板。模板文件每次都重新读取，内容未改变时直接使用编译缓存。
+
+    Args:
+        name (str): 模板文件名。
+        template_dir (str, optional): 用户模板目录，其中的同名模板优先于内置模板。子模板按同样的规则查找。
+        namespace (str, optional): 模块名称，模板表达式在该模块的全局命名空间中求值，通常为后端模块的 __name__。
+        _loading (tuple): 正在加载的模板路径，用于检测循环引用。
+
+    Returns:
+        Template: 编译后的模板。
+
+    Raises:
+        ValueError: 模板语法错误或子模板循环引用。
+    """
+    path = find_template(name, template_dir)
+    if path in _loading:
+        raise ValueError(f"模板循环引用：{' -> '.join(_loading + (path,))}")
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    digest, code, includes = load_compiled(path, source)
+
+    scope = dict(vars(importlib.import_module(namespace))) if namespace else {}
+    for index, include in enumerate(includes):
+        scope[f"_include_{index}"] = load_template(include, template_dir, namespace, _loading + (path,)).render
+    exec(code, scope)
+    return Template(name, template_dir, namespace, path, digest, scope["render"])
+
+def template_names():
+    """返回全部内置模板的文件名。"""
+    return sorted(name for name in os.listdir(TEMPLATE_DIR) if name.endswith(".tpl"))
+
+if __name__ == "__main__":
+    # 创建命令行参数解析器
+    parser = argparse.ArgumentParser(description="导出内置模板以便定制，或预先编译模板目录中的模板。")
+    parser.add_argument("command", choices=["list", "export", "compile"], help="list: 列出内置模板；export: 将内置模板复制到 --template_dir（不覆盖已有文件）；compile: 编译全部模板并写入编译缓存")
+    parser.add_argument("--template_dir", help="用户模板目录，export 和 compile 时使用。如果省略，则 compile 只编译内置模板。", default=None)
+
+    # 解析命令行参数
+    args = parser.parse_args()
+
+    if args.command == "list":
+        print("\n".join(template_names()))
+    elif args.command == "export":
+        if not args.template_dir:
+            parser.error("export 需要 --template_dir")
+        os.makedirs(args.template_dir, exist_ok=True)
+        for name in template_names():
+            target = os.path.join(args.template_dir, name)
+            if os.path.exists(target):
+                logging.info(f"'{target}' 已存在，跳过")
+                continue
+            shutil.copyfile(os.path.join(TEMPLATE_DIR, name), target)
+            logging.info(f"已导出 '{target}'")
+    else:
+        failed = 0
+        for name in template_names():
+            try:
+                template = load_template(name, args.template_dir)
+                logging.info(f"已编译 '{template.path}'")
+            except ValueError as e:
+                logging.error(f"错误：{e}")
+                failed += 1
+        sys.exit(1 if failed else 0)
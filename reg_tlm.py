@@ -0,0 +1,345 @@
+import logging
+import argparse
+import sys
+import time
+import numpy as np
+from reg_model import load_register_map, as_registers, field_access
+from reg_metrics import NULL_METRICS, add_metrics_arguments, metrics_from_args
+
+# 配置日志记录
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# 字段访问类型（UVM 命名）到写入行为的映射，未列出的访问类型按只读处理
+WRITE_ACCESS = {"RW": "write", "WO": "write", "W1C": "clear", "W1S": "set"}
+# 读回值不包含的访问类型
+WRITE_ONLY_ACCESS = {"WO"}
+
+class RegisterFileModel:
+    """
+    APB 寄存器块的事务级模型，用作生成的 RTL、C 测试和 RAL 序列的参考模型。
+
+    每个寄存器的状态保存在 uint64 数组中。按字段访问类型预先计算写入、写 1 清零、
+    写 1 置位和可读掩码，execute() 以 NumPy 数组的形式批量执行读写事务，
+    结果与逐个顺序执行事务（execute_scalar）完全一致。
+
+    与 RTL 一致，地址必须与寄存器地址完全相同，否则事务返回错误且不改变任何状态。
+    字段访问类型由 reg_model.field_access 确定：RO 寄存器的所有字段均为只读，其值由 drive() 模拟硬件输入；
+    WO 寄存器的所有字段均为只写，读回 0。
+    """
+
+    def __init__(self, registers, data_width=32):
+        """
+        Args:
+            registers (RegisterMap | list): 寄存器集合（Register 对象或 JSON 寄存器字典列表）。
+            data_width (int): 数据宽度，默认为 32，最大为 64。
+        """
+        if not 0 < data_width <= 64:
+            raise ValueError(f"数据宽度必须在 1 到 64 之间：{data_width}")
+        self.registers = as_registers(registers)
+        self.data_width = data_width
+        self.data_mask = (1 << data_width) - 1
+
+        count = len(self.registers)
+        self.reset_values = np.zeros(count, dtype=np.uint64)
+        self.write_mask = np.zeros(count, dtype=np.uint64)
+        self.clear_mask = np.zeros(count, dtype=np.uint64)
+        self.set_mask = np.zeros(count, dtype=np.uint64)
+        self.read_mask = np.zeros(count, dtype=np.uint64)
+
+        for i, register in enumerate(self.registers):
+            masks = {"write": 0, "clear": 0, "set": 0}
+            read_mask = 0
+            for field in register.fields:
+                access = field_access(register, field)
+                behavior = WRITE_ACCESS.get(access)
+                if behavior is not None:
+                    masks[behavior] |= field.mask
+                if access not in WRITE_ONLY_ACCESS:
+                    read_mask |= field.mask
+            self.reset_values[i] = register.reset & register.mask & self.data_mask
+            self.write_mask[i] = masks["write"] & self.data_mask
+            self.clear_mask[i] = masks["clear"] & self.data_mask
+            self.set_mask[i] = masks["set"] & self.data_mask
+            self.read_mask[i] = read_mask & self.data_mask
+
+        # 按地址排序的查找表，地址重复时以第一个寄存器为准（与 RegisterMap.at 一致）
+        addresses = np.array([register.address for register in self.registers], dtype=np.uint64)
+        self._addresses, first = np.unique(addresses, return_index=True)
+        self._address_order = first.astype(np.int64)
+        self._by_name = {}
+        for i, register in enumerate(self.registers):
+            self._by_name.setdefault(register.name, i)
+        # 存在写 1 清零/置位字段的位，execute() 只需逐位处理这些位
+        special = 0
+        for mask in (self.clear_mask | self.set_mask).tolist():
+            special |= mask
+        self._special_bits = [bit for bit in range(data_width) if special >> bit & 1]
+
+        self.reset()
+
+    @classmethod
+    def from_json(cls, json_file, data_width=32, metrics=NULL_METRICS):
+        """从 md2json_reg 生成的 JSON 文件构建模型。"""
+        registers = load_register_map(json_file, metrics)
+        with metrics.phase("tlm_build"):
+            return cls(registers, data_width)
+
+    def reset(self):
+        """将所有寄存器恢复为复位值。"""
+        self.values = self.reset_values.copy()
+
+    def drive(self, name, value):
+        """
+        模拟硬件输入：设置寄存器只读位的值，可写位保持不变。
+
+        Args:
+            name (str): 寄存器名称。
+            value (int): 硬件输入值。
+        """
+        i = self._index_of(name)
+        hw_mask = int(self.read_mask[i]) & ~int(self.write_mask[i] | self.clear_mask[i] | self.set_mask[i])
+        self.values[i] = np.uint64((int(self.values[i]) & ~hw_mask) | (value & hw_mask))
+
+    def peek(self, name):
+        """返回寄存器的当前值（不经过总线，不受读掩码影响）。"""
+        return int(self.values[self._index_of(name)])
+
+    def snapshot(self):
+        """返回寄存器名称到当前值的映射。"""
+        return {register.name: int(value) for register, value in zip(self.registers, self.values)}
+
+    def read(self, address):
+        """执行单个读事务，返回 (读数据, 是否错误)。"""
+        data, error = self.execute([address])
+        return int(data[0]), bool(error[0])
+
+    def write(self, address, data):
+        """执行单个写事务，返回是否错误。"""
+        _, error = self.execute([address], [data], [True])
+        return bool(error[0])
+
+    def lookup(self, addresses):
+        """
+        将地址数组转换为寄存器下标数组。
+
+        Args:
+            addresses (array-like): 地址数组。
+
+        Returns:
+            tuple: (寄存器下标数组, 是否命中数组)。未命中的地址对应的下标无意义。
+        """
+        addresses = np.asarray(addresses, dtype=np.uint64)
+        if len(self._addresses) == 0:
+            return np.zeros(len(addresses), dtype=np.int64), np.zeros(len(addresses), dtype=bool)
+        position = np.searchsorted(self._addresses, addresses)
+        position = np.minimum(position, len(self._addresses) - 1)
+        hit = self._addresses[position] == addresses
+        return self._address_order[position], hit
+
+    def execute(self, addresses, data=None, is_write=None):
+        """
+        按顺序批量执行读写事务，效果与逐个执行完全相同。
+
+        同一寄存器上的事务按原始顺序分组，读事务看到的是其之前最后一次写入的结果，
+        写 1 清零/置位位按之前所有写入的累积效果计算，因此不需要 Python 循环。
+
+        Args:
+            addresses (array-like): 事务地址。
+            data (array-like, optional): 写数据，读事务忽略。默认为全 0。
+            is_write (array-like, optional): 是否为写事务。默认为全部读事务。
+
+        Returns:
+            tuple: (读数据数组, 错误标志数组)。写事务和错误事务的读数据为 0。
+        """
+        addresses = np.asarray(addresses, dtype=np.uint64)
+        count = len(addresses)
+        data = np.zeros(count, dtype=np.uint64) if data is None else np.asarray(data, dtype=np.uint64) & np.uint64(self.data_mask)
+        is_write = np.zeros(count, dtype=bool) if is_write is None else np.asarray(is_write, dtype=bool)
+
+        reg, hit = self.lookup(addresses)
+        read_data = np.zeros(count, dtype=np.uint64)
+
+        # 命中的事务按寄存器稳定排序，同一寄存器的事务保持原始顺序
+        position = np.flatnonzero(hit)
+        if len(position) == 0:
+            return read_data, ~hit
+        order = np.argsort(reg[position], kind="stable")
+        position = position[order]
+        group = reg[position]
+        write = is_write[position]
+        wdata = data[position]
+
+        index = np.arange(len(position))
+        first = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+        last = np.r_[first[1:], len(position)] - 1
+        start = np.repeat(first, np.diff(np.r_[first, len(position)]))
+
+        # 每个事务之前同一寄存器上最后一次写入的位置
+        prev_write = _previous(np.where(write, index, -1))
+        has_write = prev_write >= start
+
+        initial = self.values[group]
+        write_mask = self.write_mask[group]
+        before = np.where(has_write, wdata[prev_write], initial)
+        before = (initial & ~write_mask) | (before & write_mask)
+
+        # 写 1 清零/置位位：该位在之前任意一次写入中为 1 即生效
+        clear_mask = self.clear_mask[group]
+        set_mask = self.set_mask[group]
+        for bit in self._special_bits:
+            bit_value = np.uint64(1 << bit)
+            prev_bit = _previous(np.where(write & ((wdata & bit_value) != 0), index, -1))
+            touched = np.where(prev_bit >= start, bit_value, np.uint64(0))
+            before &= ~(touched & clear_mask)
+            before |= touched & set_mask
+
+        # 读事务返回写入前的值，写事务更新后的值只用于计算最终状态
+        read_data[position] = np.where(write, np.uint64(0), before & self.read_mask[group])
+        after = np.where(write, (before & ~write_mask) | (wdata & write_mask), before)
+        after &= ~np.where(write, wdata & clear_mask, np.uint64(0))
+        after |= np.where(write, wdata & set_mask, np.uint64(0))
+        self.values[group[last]] = after[last]
+
+        return read_data, ~hit
+
+    def execute_scalar(self, addresses, data=None, is_write=None):
+        """
+        逐个执行读写事务的参考实现，与 execute() 的结果相同，用于校验向量化实现。
+
+        Args:
+            addresses (array-like): 事务地址。
+            data (array-like, optional): 写数据，默认为全 0。
+            is_write (array-like, optional): 是否为写事务，默认为全部读事务。
+
+        Returns:
+            tuple: (读数据数组, 错误标志数组)。
+        """
+        count = len(addresses)
+        data = [0] * count if data is None else data
+        is_write = [False] * count if is_write is None else is_write
+        by_address = {}
+        for i, register in enumerate(self.registers):
+            by_address.setdefault(register.address, i)
+
+        read_data = np.zeros(count, dtype=np.uint64)
+        error = np.zeros(count, dtype=bool)
+        for k in range(count):
+            i = by_address.get(int(addresses[k]))
+            if i is None:
+                error[k] = True
+                continue
+            value = int(self.values[i])
+            if is_write[k]:
+                wdata = int(data[k]) & self.data_mask
+                value = (value & ~int(self.write_mask[i])) | (wdata & int(self.write_mask[i]))
+                value &= ~(wdata & int(self.clear_mask[i]))
+                value |= wdata & int(self.set_mask[i])
+                self.values[i] = np.uint64(value)
+            else:
+                read_data[k] = np.uint64(value & int(self.read_mask[i]))
+        return read_data, error
+
+    def random_transactions(self, count, seed=None, write_ratio=0.5, miss_ratio=0.0):
+        """
+        生成随机读写事务。
+
+        Args:
+            count (int): 事务数量。
+            seed (int, optional): 随机数种子。
+            write_ratio (float): 写事务比例，默认为 0.5。
+            miss_ratio (float): 访问未映射地址的事务比例，默认为 0。
+
+        Returns:
+            tuple: (地址数组, 写数据数组, 写事务标志数组)。
+        """
+        rng = np.random.default_rng(seed)
+        register_addresses = np.array([register.address for register in self.registers], dtype=np.uint64)
+        addresses = register_addresses[rng.integers(0, len(register_addresses), count)]
+        if miss_ratio:
+            miss = rng.random(count) < miss_ratio
+            addresses = np.where(miss, addresses + np.uint64(1), addresses)
+        data = rng.integers(0, 1 << 63, count, dtype=np.uint64, endpoint=True) & np.uint64(self.data_mask)
+        is_write = rng.random(count) < write_ratio
+        return addresses, data, is_write
+
+    def _index_of(self, name):
+        if name not in self._by_name:
+            raise KeyError(f"寄存器 '{name}' 不存在")
+        return self._by_name[name]
+
+def _previous(marks):
+    """
+    对于每个位置，返回其之前（不含自身）最近一个被标记位置的下标，不存在时为 -1。
+
+    Args:
+        marks (ndarray): 被标记的位置为其下标，其余为 -1。
+
+    Returns:
+        ndarray: 之前最近一个被标记位置的下标。
+    """
+    latest = np.maximum.accumulate(marks)
+    return np.r_[-1, latest[:-1]]
+
+def run_random(json_file, count, seed=None, write_ratio=0.5, data_width=32, check=0, metrics=NULL_METRICS):
+    """
+    对 JSON 描述的寄存器块执行随机事务，报告吞吐量，并可选地与逐个执行的参考实现比对。
+
+    Args:
+        json_file (str): JSON 文件的路径。
+        count (int): 事务数量。
+        seed (int, optional): 随机数种子。
+        write_ratio (float): 写事务比例，默认为 0.5。
+        data_width (int): 数据宽度，默认为 32。
+        check (int): 与参考实现比对的事务数量，0 表示不比对。
+        metrics (Metrics): 指标记录器，默认不记录。
+
+    Returns:
+        bool: 比对是否一致（未比对时为 True）。
+    """
+    model = RegisterFileModel.from_json(json_file, data_width, metrics)
+    addresses, data, is_write = model.random_transactions(count, seed, write_ratio, miss_ratio=0.01)
+
+    start = time.perf_counter()
+    with metrics.phase("execute"):
+        model.execute(addresses, data, is_write)
+    elapsed = time.perf_counter() - start
+    metrics.count("transactions", count)
+    logging.info(f"{len(model.registers)} 个寄存器，{count} 个事务，耗时 {elapsed:.3f} 秒（{count / max(elapsed, 1e-9) / 1e6:.2f} M 事务/秒）")
+
+    if not check:
+        return True
+    model.reset()
+    reference = RegisterFileModel.from_json(json_file, data_width)
+    addresses, data, is_write = model.random_transactions(check, seed, write_ratio, miss_ratio=0.01)
+    with metrics.phase("check"):
+        vector_result = model.execute(addresses, data, is_write)
+        scalar_result = reference.execute_scalar(addresses, data, is_write)
+    same = all(np.array_equal(a, b) for a, b in zip(vector_result, scalar_result)) and np.array_equal(model.values, reference.values)
+    if same:
+        logging.info(f"{check} 个事务的向量化结果与参考实现一致")
+    else:
+        logging.error(f"错误：{check} 个事务的向量化结果与参考实现不一致")
+    return same
+
+if __name__ == "__main__":
+    # 创建命令行参数解析器
+    parser = argparse.ArgumentParser(description="使用寄存器块的事务级模型执行随机读写事务。")
+    parser.add_argument("json_file", help="JSON 文件的路径")
+    parser.add_argument("--transactions", type=int, help="随机事务数量，默认为 1000000", default=1000000)
+    parser.add_argument("--seed", type=int, help="随机数种子，默认为随机", default=None)
+    parser.add_argument("--write_ratio", type=float, help="写事务比例，默认为 0.5", default=0.5)
+    parser.add_argument("--data_width", type=int, help="数据宽度，默认为 32", default=32)
+    parser.add_argument("--check", type=int, help="与逐个执行的参考实现比对的事务数量，默认为 0（不比对）", default=0)
+    add_metrics_arguments(parser)
+
+    # 解析命令行参数
+    args = parser.parse_args()
+
+    metrics = metrics_from_args("reg_tlm", args)
+    try:
+        ok = run_random(args.json_file, args.transactions, args.seed, args.write_ratio, args.data_width, args.check, metrics)
+        metrics.finish()
+    except FileNotFoundError:
+        logging.error(f"错误：文件 '{args.json_file}' 未找到。")
+        ok = False
+    sys.exit(0 if ok else 1)
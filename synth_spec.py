@@ -0,0 +1,188 @@
+import json
+import logging
+import argparse
+import os
+import random
+
+# 配置日志记录
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# 生成的规格文件后缀
+SPEC_FORMATS = {"md": ".md", "xml": ".xml", "json": ".json"}
+
+def synthetic_registers(num_registers, num_fields, sparsity=0.0, seed=0, module_name="synth", address_step=4, ro_ratio=0.25):
+    """
+    生成包含 N 个寄存器、每个寄存器 M 个字段的寄存器数据，格式与 md2json_reg 生成的 JSON 相同。
+
+    Args:
+        num_registers (int): 寄存器数量。
+        num_fields (int): 每个寄存器的字段数量。
+        sparsity (float): 地址空间中空闲字地址所占的比例，0 表示地址连续，默认为 0。
+        seed (int): 随机数种子，相同参数和种子生成相同的数据，默认为 0。
+        module_name (str): 模块名称，默认为 "synth"。
+        address_step (int): 寄存器地址步进，默认为 4。
+        ro_ratio (float): RO 寄存器所占的比例，默认为 0.25。
+
+    Returns:
+        dict: 包含 MODULE_NAME 和 REGISTERS 的寄存器数据。
+    """
+    if not 0 <= sparsity < 1:
+        raise ValueError(f"稀疏度必须在 [0, 1) 之间：{sparsity}")
+    rng = random.Random(seed)
+
+    # 在 N / (1 - sparsity) 个字地址中随机选择 N 个作为寄存器地址
+    slot_count = max(num_registers, int(round(num_registers / (1 - sparsity))))
+    if slot_count == num_registers:
+        slots = range(num_registers)
+    else:
+        slots = sorted(rng.sample(range(slot_count), num_registers))
+
+    # 字段宽度：32 位平均分配给各字段，剩余位加到最后一个字段
+    width = max(32 // num_fields, 1)
+    widths = [width] * num_fields
+    widths[-1] += max(32 - width * num_fields, 0)
+
+    registers = []
+    for i, slot in enumerate(slots):
+        reg_type = "RO" if rng.random() < ro_ratio else "RW"
+        fields = [
+            {
+                "NAME": f"f{j}",
+                "WIDTH": widths[j],
+                "RESET": hex(rng.getrandbits(widths[j])),
+                "TYPE": reg_type,
+                "DESC": f"field {j} of reg{i}",
+            }
+            for j in range(num_fields)
+        ]
+        registers.append({
+            "REG_NAME": f"reg{i}",
+            "DESC": f"synthetic register {i}",
+            "REG_TYPE": reg_type,
+            "ADDRESS": hex(slot * address_step),
+            "FIELDS": fields,
+            "WIDTH": sum(widths),
+        })
+
+    return {"MODULE_NAME": module_name, "REGISTERS": registers}
+
+def write_markdown(data, markdown_file):
+    """
+    将寄存器数据写为 md2json_reg 可以解析的 Markdown 文件。
+
+    Markdown 格式中没有地址列，地址由 md2json_reg 按顺序分配，因此稀疏地址不会保留。
+
+    Args:
+        data (dict): 寄存器数据。
+        markdown_file (str): Markdown 文件的路径。
+    """
+    with open(markdown_file, 'w', encoding='utf-8') as f:
+        f.write(f"## MODULE_NAME: {data['MODULE_NAME']}\n\n")
+        for register in data["REGISTERS"]:
+            f.write(f"| REG_NAME: | {register['REG_NAME']} |\n")
+            f.write("| --------- | ---- |\n")
+            f.write(f"| DESC:     | {register['DESC']} |\n")
+            f.write(f"| REG_TYPE: | {register['REG_TYPE']} |\n\n")
+            f.write("| FIELDS: | WIDTH | RESET | TYPE | DESC |\n")
+            f.write("| ------- | ----- | ----- | ---- | ---- |\n")
+            for field in register["FIELDS"]:
+                f.write(f"| {field['NAME']} | {field['WIDTH']} | {field['RESET']} | {field['TYPE']} | {field['DESC']} |\n")
+            f.write("\n")
+
+def write_ipxact(data, xml_file):
+    """
+    将寄存器数据写为 IP-XACT（IEEE 1685-2014）格式的 XML 文件，包含寄存器地址和字段。
+
+    Args:
+        data (dict): 寄存器数据。
+        xml_file (str): XML 文件的路径。
+    """
+    access_types = {"RW": "read-write", "RO": "read-only", "WO": "write-only"}
+    module_name = data["MODULE_NAME"]
+    with open(xml_file, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write('<ipxact:component xmlns:ipxact="http://www.accellera.org/XMLSchema/IPXACT/1685-2014">\n')
+        f.write(f"  <ipxact:name>{module_name}</ipxact:name>\n")
+        f.write("  <ipxact:memoryMaps>\n")
+        f.write("    <ipxact:memoryMap>\n")
+        f.write(f"      <ipxact:name>{module_name}_RegisterMap</ipxact:name>\n")
+        f.write("      <ipxact:addressBlock>\n")
+        f.write("        <ipxact:name>MainBlock</ipxact:name>\n")
+        f.write("        <ipxact:baseAddress>0x0</ipxact:baseAddress>\n")
+        span = max((int(register["ADDRESS"], 16) for register in data["REGISTERS"]), default=0) + 4
+        f.write(f"        <ipxact:range>{hex(span)}</ipxact:range>\n")
+        f.write("        <ipxact:width>32</ipxact:width>\n")
+        for register in data["REGISTERS"]:
+            reset = 0
+            bit_offset = 0
+            for field in register["FIELDS"]:
+                reset |= int(field["RESET"], 16) << bit_offset
+                bit_offset += field["WIDTH"]
+            access = access_types.get(register["REG_TYPE"], "read-write")
+            f.write("        <ipxact:register>\n")
+            f.write(f"          <ipxact:name>{register['REG_NAME']}</ipxact:name>\n")
+            f.write(f"          <ipxact:description>{register['DESC']}</ipxact:description>\n")
+            f.write(f"          <ipxact:addressOffset>{register['ADDRESS']}</ipxact:addressOffset>\n")
+            f.write(f"          <ipxact:size>{register['WIDTH']}</ipxact:size>\n")
+            f.write(f"          <ipxact:access>{access}</ipxact:access>\n")
+            f.write(f"          <ipxact:reset><ipxact:value>{hex(reset)}</ipxact:value></ipxact:reset>\n")
+            bit_offset = 0
+            for field in register["FIELDS"]:
+                f.write("          <ipxact:field>\n")
+                f.write(f"            <ipxact:name>{field['NAME']}</ipxact:name>\n")
+                f.write(f"            <ipxact:description>{field['DESC']}</ipxact:description>\n")
+                f.write(f"            <ipxact:bitOffset>{bit_offset}</ipxact:bitOffset>\n")
+                f.write(f"            <ipxact:resets><ipxact:reset><ipxact:value>{field['RESET']}</ipxact:value></ipxact:reset></ipxact:resets>\n")
+                f.write(f"            <ipxact:bitWidth>{field['WIDTH']}</ipxact:bitWidth>\n")
+                f.write(f"            <ipxact:access>{access}</ipxact:access>\n")
+                f.write("          </ipxact:field>\n")
+                bit_offset += field["WIDTH"]
+            f.write("        </ipxact:register>\n")
+        f.write("      </ipxact:addressBlock>\n")
+        f.write("    </ipxact:memoryMap>\n")
+        f.write("  </ipxact:memoryMaps>\n")
+        f.write("</ipxact:component>\n")
+
+def write_json(data, json_file):
+    """将寄存器数据写为 JSON 文件。"""
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+
+def write_specs(data, output_prefix, formats=tuple(SPEC_FORMATS)):
+    """
+    将寄存器数据写为指定格式的规格文件。
+
+    Args:
+        data (dict): 寄存器数据。
+        output_prefix (str): 输出文件路径前缀，各格式在其后加上对应后缀。
+        formats (iterable): 需要写出的格式，取值见 SPEC_FORMATS，默认为全部。
+
+    Returns:
+        dict: 格式到文件路径的映射。
+    """
+    writers = {"md": write_markdown, "xml": write_ipxact, "json": write_json}
+    paths = {}
+    for spec_format in formats:
+        paths[spec_format] = output_prefix + SPEC_FORMATS[spec_format]
+        writers[spec_format](data, paths[spec_format])
+    return paths
+
+if __name__ == "__main__":
+    # 创建命令行参数解析器
+    parser = argparse.ArgumentParser(description="生成指定规模的合成寄存器规格文件（Markdown、IP-XACT、JSON）。")
+    parser.add_argument("--registers", type=int, help="寄存器数量，默认为 1000", default=1000)
+    parser.add_argument("--fields", type=int, help="每个寄存器的字段数量，默认为 8", default=8)
+    parser.add_argument("--sparsity", type=float, help="空闲字地址所占的比例（仅 IP-XACT 和 JSON 保留地址），默认为 0", default=0.0)
+    parser.add_argument("--seed", type=int, help="随机数种子，默认为 0", default=0)
+    parser.add_argument("--module_name", help="模块名称（不能包含下划线），默认为 synth", default="synth")
+    parser.add_argument("--formats", nargs="+", choices=list(SPEC_FORMATS), help="输出格式，默认为全部", default=list(SPEC_FORMATS))
+    parser.add_argument("--output_dir", help="输出目录，默认为当前目录", default=".")
+
+    # 解析命令行参数
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    data = synthetic_registers(args.registers, args.fields, args.sparsity, args.seed, args.module_name)
+    prefix = os.path.join(args.output_dir, f"{args.module_name}_{args.registers}x{args.fields}")
+    for path in write_specs(data, prefix, args.formats).values():
+        logging.info(f"已生成规格文件 '{path}'")
@@ -0,0 +1,40 @@
+{# C 语言头文件：寄存器结构体、偏移宏、字段位置和掩码宏，以及字段读写内联函数 #}
+{% args module_name, registers %}
+{% set MODULE = module_name.upper() %}
+
+#ifndef {{MODULE}}_H
+#define {{MODULE}}_H
+
+/*------------------------------- MODULE_NAME: {{MODULE}} -----------------------*/
+
+typedef struct
+{
+{% for register in registers %}
+    {{"__I" if register.type == "RO" else "__IO"}} uint32_t {{register.name.upper()}}; /* Offset: {{hex(register.address)}} ({{register.type}}) {{register.desc}} Register */
+{% endfor %}
+
+} {{MODULE}}_TypeDef;
+{% for register in registers %}
+#define {{MODULE}}_{{register.name.upper()}}_OFFSET (0x{{register.address:X}})
+{% endfor %}
+{% for register in registers %}
+{% set fields = header_fields(register) %}
+{% if fields %}
+
+{% for field in fields %}
+{% set prefix = f"{MODULE}_{register.name.upper()}_{field.name.upper()}" %}
+#define {{prefix}}_Pos ({{field.lsb}}U)
+#define {{prefix}}_Msk (0x{{(1 << field.width) - 1:X}}UL << {{prefix}}_Pos)
+#define {{prefix}}_Val(value) (((uint32_t)(value) << {{prefix}}_Pos) & {{prefix}}_Msk)
+{% endfor %}
+{% endif %}
+{% endfor %}
+
+#ifndef {{MODULE}}_NO_ACCESSORS
+{% for register in registers %}
+{% include "cheader_accessors.h.tpl" MODULE, register %}
+{% endfor %}
+
+#endif /* {{MODULE}}_NO_ACCESSORS */
+
+#endif /* {{MODULE}}_H */
@@ -0,0 +1,40 @@
+{# 一个寄存器的 static inline 字段读写函数：_Update 在一次读和一次写中更新 mask 选中的字段，
+   每个可读字段一个 _Get，每个可写字段一个 _Set。读-改-写时清除 W1C 字段的读回值，只写寄存器不读回。 #}
+{% args module_name, register %}
+{% set fields = header_fields(register) %}
+{% if fields %}
+{% set reg_name = register.name.upper() %}
+{% set reg_prefix = f"{module_name}_{reg_name}" %}
+{% set readable = register.type != "WO" %}
+{% set w1c_mask = sum(field.mask for field in register.fields if field.access == "W1C") & 0xFFFFFFFF %}
+{% set writable_fields = [field for field in fields if field.type != "RO" and field.access != "RO"] if register.type != "RO" else [] %}
+
+{% if writable_fields %}
+{% if not readable %}
+{% set value = "value & mask" %}
+{% elif w1c_mask %}
+{% set value = f"(regs->{reg_name} & ~(mask | 0x{w1c_mask:X}UL)) | (value & mask)" %}
+{% else %}
+{% set value = f"(regs->{reg_name} & ~mask) | (value & mask)" %}
+{% endif %}
+static inline void {{reg_prefix}}_Update({{module_name}}_TypeDef *regs, uint32_t mask, uint32_t value)
+{
+    regs->{{reg_name}} = {{value}};
+}
+{% endif %}
+{% for field in fields %}
+{% set field_prefix = f"{reg_prefix}_{field.name.upper()}" %}
+{% if readable and field.access != "WO" %}
+static inline uint32_t {{field_prefix}}_Get(const {{module_name}}_TypeDef *regs)
+{
+    return (regs->{{reg_name}} & {{field_prefix}}_Msk) >> {{field_prefix}}_Pos;
+}
+{% endif %}
+{% if field in writable_fields %}
+static inline void {{field_prefix}}_Set({{module_name}}_TypeDef *regs, uint32_t value)
+{
+    {{reg_prefix}}_Update(regs, {{field_prefix}}_Msk, {{field_prefix}}_Val(value));
+}
+{% endif %}
+{% endfor %}
+{% endif %}
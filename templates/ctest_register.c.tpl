@@ -0,0 +1,29 @@
+{# unrolled 风格测试代码中一个寄存器的读写测试，与 table 风格相同：RW 写随机值后读回比较 RW 字段，
+   RO 写随机值后读回比较复位值，WO 只写入。失败时 failures 加 1 #}
+{% args register %}
+{% set offset = hex(register.address) %}
+{% if register.type == "RW" %}
+{% set mask = rw_test_mask(register) %}
+{% set compare = "read_val != rand_val" if mask == 0xFFFFFFFF else f"(read_val ^ rand_val) & 0x{mask:X}" %}
+    rand_val = rand();
+    write_reg(base_addr + {{offset}}, rand_val);
+    read_val = read_reg(base_addr + {{offset}});
+    if ({{compare}}) {
+        printf("{{register.name}} RW test failed!\n");
+        failures++;
+    }
+
+{% elif register.type == "RO" %}
+    rand_val = rand();
+    write_reg(base_addr + {{offset}}, rand_val);
+    read_val = read_reg(base_addr + {{offset}});
+    if (read_val != {{hex(register.reset & 0xFFFFFFFF)}}) {
+        printf("{{register.name}} RO test failed!\n");
+        failures++;
+    }
+
+{% elif register.type == "WO" %}
+    write_reg(base_addr + {{offset}}, 0xDEADBEEF);
+    printf("{{register.name}} WO test passed\n");
+
+{% endif %}
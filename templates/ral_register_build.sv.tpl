@@ -0,0 +1,12 @@
+{# 寄存器块 build() 中一个寄存器的创建、配置和地址映射；提供 hdl_path 时每个字段映射到 register_data[slot] 的相应位 #}
+{% args register, ral_reg_name, slot, hdl_path %}
+
+        {{register.name}} = {{ral_reg_name}}::type_id::create("{{register.name}}",,get_full_name());
+        {{register.name}}.configure(this, null, "{{"" if hdl_path else register.name}}");
+        {{register.name}}.build();
+        this.default_map.add_reg(this.{{register.name}}, 32'h{{register.address:x}}, "{{register.access}}", 0);
+{% if hdl_path %}
+{% for position, field in enumerate(register.fields) %}
+        {{register.name}}.add_hdl_path_slice("register_data[{{slot}}]", {{field.lsb}}, {{field.width}}, {{1 if position == 0 else 0}});
+{% endfor %}
+{% endif %}
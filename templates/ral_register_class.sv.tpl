@@ -0,0 +1,25 @@
+{# 一个 uvm_reg 寄存器类及其字段配置；字段布局相同的寄存器共用该类 #}
+{% args reg_name, reg_width, fields %}
+
+class {{reg_name}} extends uvm_reg;
+    `uvm_object_utils({{reg_name}})
+
+    rand uvm_reg_field {{";\n    rand uvm_reg_field ".join([field.name for field in fields])}};
+
+    function new (string name = "{{reg_name}}");
+        super.new(name, {{reg_width}}, UVM_NO_COVERAGE);
+    endfunction
+
+    virtual function void build();
+        // 配置字段
+{% for field in fields %}
+        
+        this.{{field.name}} = uvm_reg_field::type_id::create("{{field.name}}");
+        this.{{field.name}}.configure(this, {{field.width}}, {{field.lsb}}, "{{field.access}}", 0, 'h{{field.reset:x}}, 1, 0, 0);
+{% endfor %}
+{% if not fields %}
+        
+{% endif %}
+    endfunction
+
+endclass
@@ -0,0 +1,9 @@
+{# 一个寄存器的字段赋值：RO 寄存器将输入端口赋给 register_data[slot] 的相应位，其余寄存器将相应位赋给输出端口 #}
+{% args slot, register %}
+{% for field in register.fields %}
+{% if register.type == "RO" %}
+ always @* begin register_data[{{slot}}][{{field.msb}}:{{field.lsb}}] = {{register.name}}_{{field.name}}_i; end
+{% else %}
+ assign {{register.name}}_{{field.name}}_o = register_data[{{slot}}][{{field.msb}}:{{field.lsb}}];
+{% endif %}
+{% endfor %}
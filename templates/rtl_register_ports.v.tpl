@@ -0,0 +1,4 @@
+{# 一个寄存器的字段端口，端口之间以逗号分隔，末尾不加逗号也不换行（本文件末尾没有换行）。RO 寄存器的字段为输入，其余为输出。 #}
+{% args register %}
+{% set direction, suffix = ("input", "i") if register.type == "RO" else ("output", "o") %}
+{{",\n".join([f"    {direction} wire [{field.width - 1}:0] {register.name}_{field.name}_{suffix}" for field in register.fields])}}
\ No newline at end of file
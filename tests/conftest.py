@@ -0,0 +1,8 @@
+import os
+import sys
+
+# 各脚本位于仓库根目录，测试直接导入
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT_DIR, "tests", "data")
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
@@ -0,0 +1,131 @@
+`ifndef REAL_BLK_RAL_MODEL_SV
+`define REAL_BLK_RAL_MODEL_SV
+
+import uvm_pkg::*;
+
+class ral_reg_my_reg1 extends uvm_reg;
+    `uvm_object_utils(ral_reg_my_reg1)
+
+    rand uvm_reg_field imu_trigger_en;
+    rand uvm_reg_field depth_trigger_en;
+    rand uvm_reg_field orb_trigger_en;
+    rand uvm_reg_field depth_pkt_word_num;
+    rand uvm_reg_field reserved;
+    rand uvm_reg_field ir_frame_sel;
+    rand uvm_reg_field pkt_corner_num;
+
+    function new (string name = "ral_reg_my_reg1");
+        super.new(name, 27, UVM_NO_COVERAGE);
+    endfunction
+
+    virtual function void build();
+        // 配置字段
+        
+        this.imu_trigger_en = uvm_reg_field::type_id::create("imu_trigger_en");
+        this.imu_trigger_en.configure(this, 1, 0, "RW", 0, 'h0, 1, 0, 0);
+        
+        this.depth_trigger_en = uvm_reg_field::type_id::create("depth_trigger_en");
+        this.depth_trigger_en.configure(this, 1, 1, "RW", 0, 'h0, 1, 0, 0);
+        
+        this.orb_trigger_en = uvm_reg_field::type_id::create("orb_trigger_en");
+        this.orb_trigger_en.configure(this, 1, 2, "RW", 0, 'h0, 1, 0, 0);
+        
+        this.depth_pkt_word_num = uvm_reg_field::type_id::create("depth_pkt_word_num");
+        this.depth_pkt_word_num.configure(this, 8, 3, "RW", 0, 'h0, 1, 0, 0);
+        
+        this.reserved = uvm_reg_field::type_id::create("reserved");
+        this.reserved.configure(this, 7, 11, "RW", 0, 'h0, 1, 0, 0);
+        
+        this.ir_frame_sel = uvm_reg_field::type_id::create("ir_frame_sel");
+        this.ir_frame_sel.configure(this, 1, 18, "RW", 0, 'h0, 1, 0, 0);
+        
+        this.pkt_corner_num = uvm_reg_field::type_id::create("pkt_corner_num");
+        this.pkt_corner_num.configure(this, 8, 19, "RW", 0, 'h0, 1, 0, 0);
+    endfunction
+
+endclass
+
+class ral_reg_my_reg2 extends uvm_reg;
+    `uvm_object_utils(ral_reg_my_reg2)
+
+    rand uvm_reg_field C2;
+    rand uvm_reg_field A2;
+    rand uvm_reg_field B2;
+
+    function new (string name = "ral_reg_my_reg2");
+        super.new(name, 32, UVM_NO_COVERAGE);
+    endfunction
+
+    virtual function void build();
+        // 配置字段
+        
+        this.C2 = uvm_reg_field::type_id::create("C2");
+        this.C2.configure(this, 2, 0, "RW", 0, 'h3, 1, 0, 0);
+        
+        this.A2 = uvm_reg_field::type_id::create("A2");
+        this.A2.configure(this, 10, 2, "RW", 0, 'h11, 1, 0, 0);
+        
+        this.B2 = uvm_reg_field::type_id::create("B2");
+        this.B2.configure(this, 20, 12, "RW", 0, 'hff, 1, 0, 0);
+    endfunction
+
+endclass
+
+class ral_reg_my_reg3 extends uvm_reg;
+    `uvm_object_utils(ral_reg_my_reg3)
+
+    rand uvm_reg_field gpif_read_pkt_length;
+
+    function new (string name = "ral_reg_my_reg3");
+        super.new(name, 16, UVM_NO_COVERAGE);
+    endfunction
+
+    virtual function void build();
+        // 配置字段
+        
+        this.gpif_read_pkt_length = uvm_reg_field::type_id::create("gpif_read_pkt_length");
+        this.gpif_read_pkt_length.configure(this, 16, 0, "RW", 0, 'hffff, 1, 0, 0);
+    endfunction
+
+endclass
+
+class ral_block_real_blk extends uvm_reg_block;
+
+    `uvm_object_utils(ral_block_real_blk)
+
+    // 寄存器句柄
+    rand ral_reg_my_reg1 my_reg1;
+    rand ral_reg_my_reg2 my_reg2;
+    rand ral_reg_my_reg3 my_reg3;
+
+
+    function new (string name = "ral_block_real_blk");
+        super.new(name, UVM_NO_COVERAGE);
+    endfunction
+
+    virtual function void build();
+
+        this.default_map = create_map("", 0, 4, UVM_LITTLE_ENDIAN, 0);
+        // 创建寄存器
+
+        my_reg1 = ral_reg_my_reg1::type_id::create("my_reg1",,get_full_name());
+        my_reg1.configure(this, null, "my_reg1");
+        my_reg1.build();
+        this.default_map.add_reg(this.my_reg1, 32'h0, "RW", 0);
+
+        my_reg2 = ral_reg_my_reg2::type_id::create("my_reg2",,get_full_name());
+        my_reg2.configure(this, null, "my_reg2");
+        my_reg2.build();
+        this.default_map.add_reg(this.my_reg2, 32'h4, "RW", 0);
+
+        my_reg3 = ral_reg_my_reg3::type_id::create("my_reg3",,get_full_name());
+        my_reg3.configure(this, null, "my_reg3");
+        my_reg3.build();
+        this.default_map.add_reg(this.my_reg3, 32'h8, "RW", 0);
+
+    endfunction
+
+endclass
+
+
+`endif
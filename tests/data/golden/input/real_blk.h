@@ -0,0 +1,134 @@
+
+#ifndef REAL_BLK_H
+#define REAL_BLK_H
+
+/*------------------------------- MODULE_NAME: REAL_BLK -----------------------*/
+
+typedef struct
+{
+    __IO uint32_t MY_REG1; /* Offset: 0x0 (RW) reg1 function desc Register */
+    __I uint32_t MY_REG2; /* Offset: 0x4 (RO) reg2 function desc Register */
+    __IO uint32_t MY_REG3; /* Offset: 0x8 (RW) reg3 function desc Register */
+
+} REAL_BLK_TypeDef;
+#define REAL_BLK_MY_REG1_OFFSET (0x0)
+#define REAL_BLK_MY_REG2_OFFSET (0x4)
+#define REAL_BLK_MY_REG3_OFFSET (0x8)
+
+#define REAL_BLK_MY_REG1_IMU_TRIGGER_EN_Pos (0U)
+#define REAL_BLK_MY_REG1_IMU_TRIGGER_EN_Msk (0x1UL << REAL_BLK_MY_REG1_IMU_TRIGGER_EN_Pos)
+#define REAL_BLK_MY_REG1_IMU_TRIGGER_EN_Val(value) (((uint32_t)(value) << REAL_BLK_MY_REG1_IMU_TRIGGER_EN_Pos) & REAL_BLK_MY_REG1_IMU_TRIGGER_EN_Msk)
+#define REAL_BLK_MY_REG1_DEPTH_TRIGGER_EN_Pos (1U)
+#define REAL_BLK_MY_REG1_DEPTH_TRIGGER_EN_Msk (0x1UL << REAL_BLK_MY_REG1_DEPTH_TRIGGER_EN_Pos)
+#define REAL_BLK_MY_REG1_DEPTH_TRIGGER_EN_Val(value) (((uint32_t)(value) << REAL_BLK_MY_REG1_DEPTH_TRIGGER_EN_Pos) & REAL_BLK_MY_REG1_DEPTH_TRIGGER_EN_Msk)
+#define REAL_BLK_MY_REG1_ORB_TRIGGER_EN_Pos (2U)
+#define REAL_BLK_MY_REG1_ORB_TRIGGER_EN_Msk (0x1UL << REAL_BLK_MY_REG1_ORB_TRIGGER_EN_Pos)
+#define REAL_BLK_MY_REG1_ORB_TRIGGER_EN_Val(value) (((uint32_t)(value) << REAL_BLK_MY_REG1_ORB_TRIGGER_EN_Pos) & REAL_BLK_MY_REG1_ORB_TRIGGER_EN_Msk)
+#define REAL_BLK_MY_REG1_DEPTH_PKT_WORD_NUM_Pos (3U)
+#define REAL_BLK_MY_REG1_DEPTH_PKT_WORD_NUM_Msk (0xFFUL << REAL_BLK_MY_REG1_DEPTH_PKT_WORD_NUM_Pos)
+#define REAL_BLK_MY_REG1_DEPTH_PKT_WORD_NUM_Val(value) (((uint32_t)(value) << REAL_BLK_MY_REG1_DEPTH_PKT_WORD_NUM_Pos) & REAL_BLK_MY_REG1_DEPTH_PKT_WORD_NUM_Msk)
+#define REAL_BLK_MY_REG1_IR_FRAME_SEL_Pos (18U)
+#define REAL_BLK_MY_REG1_IR_FRAME_SEL_Msk (0x1UL << REAL_BLK_MY_REG1_IR_FRAME_SEL_Pos)
+#define REAL_BLK_MY_REG1_IR_FRAME_SEL_Val(value) (((uint32_t)(value) << REAL_BLK_MY_REG1_IR_FRAME_SEL_Pos) & REAL_BLK_MY_REG1_IR_FRAME_SEL_Msk)
+#define REAL_BLK_MY_REG1_PKT_CORNER_NUM_Pos (19U)
+#define REAL_BLK_MY_REG1_PKT_CORNER_NUM_Msk (0xFFUL << REAL_BLK_MY_REG1_PKT_CORNER_NUM_Pos)
+#define REAL_BLK_MY_REG1_PKT_CORNER_NUM_Val(value) (((uint32_t)(value) << REAL_BLK_MY_REG1_PKT_CORNER_NUM_Pos) & REAL_BLK_MY_REG1_PKT_CORNER_NUM_Msk)
+
+#define REAL_BLK_MY_REG2_C2_Pos (0U)
+#define REAL_BLK_MY_REG2_C2_Msk (0x3UL << REAL_BLK_MY_REG2_C2_Pos)
+#define REAL_BLK_MY_REG2_C2_Val(value) (((uint32_t)(value) << REAL_BLK_MY_REG2_C2_Pos) & REAL_BLK_MY_REG2_C2_Msk)
+#define REAL_BLK_MY_REG2_A2_Pos (2U)
+#define REAL_BLK_MY_REG2_A2_Msk (0x3FFUL << REAL_BLK_MY_REG2_A2_Pos)
+#define REAL_BLK_MY_REG2_A2_Val(value) (((uint32_t)(value) << REAL_BLK_MY_REG2_A2_Pos) & REAL_BLK_MY_REG2_A2_Msk)
+#define REAL_BLK_MY_REG2_B2_Pos (12U)
+#define REAL_BLK_MY_REG2_B2_Msk (0xFFFFFUL << REAL_BLK_MY_REG2_B2_Pos)
+#define REAL_BLK_MY_REG2_B2_Val(value) (((uint32_t)(value) << REAL_BLK_MY_REG2_B2_Pos) & REAL_BLK_MY_REG2_B2_Msk)
+
+#define REAL_BLK_MY_REG3_GPIF_READ_PKT_LENGTH_Pos (0U)
+#define REAL_BLK_MY_REG3_GPIF_READ_PKT_LENGTH_Msk (0xFFFFUL << REAL_BLK_MY_REG3_GPIF_READ_PKT_LENGTH_Pos)
+#define REAL_BLK_MY_REG3_GPIF_READ_PKT_LENGTH_Val(value) (((uint32_t)(value) << REAL_BLK_MY_REG3_GPIF_READ_PKT_LENGTH_Pos) & REAL_BLK_MY_REG3_GPIF_READ_PKT_LENGTH_Msk)
+
+#ifndef REAL_BLK_NO_ACCESSORS
+
+static inline void REAL_BLK_MY_REG1_Update(REAL_BLK_TypeDef *regs, uint32_t mask, uint32_t value)
+{
+    regs->MY_REG1 = (regs->MY_REG1 & ~mask) | (value & mask);
+}
+static inline uint32_t REAL_BLK_MY_REG1_IMU_TRIGGER_EN_Get(const REAL_BLK_TypeDef *regs)
+{
+    return (regs->MY_REG1 & REAL_BLK_MY_REG1_IMU_TRIGGER_EN_Msk) >> REAL_BLK_MY_REG1_IMU_TRIGGER_EN_Pos;
+}
+static inline void REAL_BLK_MY_REG1_IMU_TRIGGER_EN_Set(REAL_BLK_TypeDef *regs, uint32_t value)
+{
+    REAL_BLK_MY_REG1_Update(regs, REAL_BLK_MY_REG1_IMU_TRIGGER_EN_Msk, REAL_BLK_MY_REG1_IMU_TRIGGER_EN_Val(value));
+}
+static inline uint32_t REAL_BLK_MY_REG1_DEPTH_TRIGGER_EN_Get(const REAL_BLK_TypeDef *regs)
+{
+    return (regs->MY_REG1 & REAL_BLK_MY_REG1_DEPTH_TRIGGER_EN_Msk) >> REAL_BLK_MY_REG1_DEPTH_TRIGGER_EN_Pos;
+}
+static inline void REAL_BLK_MY_REG1_DEPTH_TRIGGER_EN_Set(REAL_BLK_TypeDef *regs, uint32_t value)
+{
+    REAL_BLK_MY_REG1_Update(regs, REAL_BLK_MY_REG1_DEPTH_TRIGGER_EN_Msk, REAL_BLK_MY_REG1_DEPTH_TRIGGER_EN_Val(value));
+}
+static inline uint32_t REAL_BLK_MY_REG1_ORB_TRIGGER_EN_Get(const REAL_BLK_TypeDef *regs)
+{
+    return (regs->MY_REG1 & REAL_BLK_MY_REG1_ORB_TRIGGER_EN_Msk) >> REAL_BLK_MY_REG1_ORB_TRIGGER_EN_Pos;
+}
+static inline void REAL_BLK_MY_REG1_ORB_TRIGGER_EN_Set(REAL_BLK_TypeDef *regs, uint32_t value)
+{
+    REAL_BLK_MY_REG1_Update(regs, REAL_BLK_MY_REG1_ORB_TRIGGER_EN_Msk, REAL_BLK_MY_REG1_ORB_TRIGGER_EN_Val(value));
+}
+static inline uint32_t REAL_BLK_MY_REG1_DEPTH_PKT_WORD_NUM_Get(const REAL_BLK_TypeDef *regs)
+{
+    return (regs->MY_REG1 & REAL_BLK_MY_REG1_DEPTH_PKT_WORD_NUM_Msk) >> REAL_BLK_MY_REG1_DEPTH_PKT_WORD_NUM_Pos;
+}
+static inline void REAL_BLK_MY_REG1_DEPTH_PKT_WORD_NUM_Set(REAL_BLK_TypeDef *regs, uint32_t value)
+{
+    REAL_BLK_MY_REG1_Update(regs, REAL_BLK_MY_REG1_DEPTH_PKT_WORD_NUM_Msk, REAL_BLK_MY_REG1_DEPTH_PKT_WORD_NUM_Val(value));
+}
+static inline uint32_t REAL_BLK_MY_REG1_IR_FRAME_SEL_Get(const REAL_BLK_TypeDef *regs)
+{
+    return (regs->MY_REG1 & REAL_BLK_MY_REG1_IR_FRAME_SEL_Msk) >> REAL_BLK_MY_REG1_IR_FRAME_SEL_Pos;
+}
+static inline void REAL_BLK_MY_REG1_IR_FRAME_SEL_Set(REAL_BLK_TypeDef *regs, uint32_t value)
+{
+    REAL_BLK_MY_REG1_Update(regs, REAL_BLK_MY_REG1_IR_FRAME_SEL_Msk, REAL_BLK_MY_REG1_IR_FRAME_SEL_Val(value));
+}
+static inline uint32_t REAL_BLK_MY_REG1_PKT_CORNER_NUM_Get(const REAL_BLK_TypeDef *regs)
+{
+    return (regs->MY_REG1 & REAL_BLK_MY_REG1_PKT_CORNER_NUM_Msk) >> REAL_BLK_MY_REG1_PKT_CORNER_NUM_Pos;
+}
+static inline void REAL_BLK_MY_REG1_PKT_CORNER_NUM_Set(REAL_BLK_TypeDef *regs, uint32_t value)
+{
+    REAL_BLK_MY_REG1_Update(regs, REAL_BLK_MY_REG1_PKT_CORNER_NUM_Msk, REAL_BLK_MY_REG1_PKT_CORNER_NUM_Val(value));
+}
+
+static inline uint32_t REAL_BLK_MY_REG2_C2_Get(const REAL_BLK_TypeDef *regs)
+{
+    return (regs->MY_REG2 & REAL_BLK_MY_REG2_C2_Msk) >> REAL_BLK_MY_REG2_C2_Pos;
+}
+static inline uint32_t REAL_BLK_MY_REG2_A2_Get(const REAL_BLK_TypeDef *regs)
+{
+    return (regs->MY_REG2 & REAL_BLK_MY_REG2_A2_Msk) >> REAL_BLK_MY_REG2_A2_Pos;
+}
+static inline uint32_t REAL_BLK_MY_REG2_B2_Get(const REAL_BLK_TypeDef *regs)
+{
+    return (regs->MY_REG2 & REAL_BLK_MY_REG2_B2_Msk) >> REAL_BLK_MY_REG2_B2_Pos;
+}
+
+static inline void REAL_BLK_MY_REG3_Update(REAL_BLK_TypeDef *regs, uint32_t mask, uint32_t value)
+{
+    regs->MY_REG3 = (regs->MY_REG3 & ~mask) | (value & mask);
+}
+static inline uint32_t REAL_BLK_MY_REG3_GPIF_READ_PKT_LENGTH_Get(const REAL_BLK_TypeDef *regs)
+{
+    return (regs->MY_REG3 & REAL_BLK_MY_REG3_GPIF_READ_PKT_LENGTH_Msk) >> REAL_BLK_MY_REG3_GPIF_READ_PKT_LENGTH_Pos;
+}
+static inline void REAL_BLK_MY_REG3_GPIF_READ_PKT_LENGTH_Set(REAL_BLK_TypeDef *regs, uint32_t value)
+{
+    REAL_BLK_MY_REG3_Update(regs, REAL_BLK_MY_REG3_GPIF_READ_PKT_LENGTH_Msk, REAL_BLK_MY_REG3_GPIF_READ_PKT_LENGTH_Val(value));
+}
+
+#endif /* REAL_BLK_NO_ACCESSORS */
+
+#endif /* REAL_BLK_H */
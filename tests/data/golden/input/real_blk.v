@@ -0,0 +1,115 @@
+
+module real_blk #(
+    // 每次传输在流水延迟之外额外插入的等待周期数（0 到 253）
+    parameter integer WAIT_STATES = 0
+) (
+
+    input wire PCLK,
+    input wire PRESETn,
+    input wire PSEL,
+    input wire PENABLE,
+    input wire [31:0] PADDR,
+    input wire PWRITE,
+    input wire [32-1:0] PWDATA,
+    output wire [32-1:0] PRDATA,
+    output wire PREADY,
+    output wire PSLVERROR,
+        output wire [0:0] my_reg1_imu_trigger_en_o,
+    output wire [0:0] my_reg1_depth_trigger_en_o,
+    output wire [0:0] my_reg1_orb_trigger_en_o,
+    output wire [7:0] my_reg1_depth_pkt_word_num_o,
+    output wire [6:0] my_reg1_reserved_o,
+    output wire [0:0] my_reg1_ir_frame_sel_o,
+    output wire [7:0] my_reg1_pkt_corner_num_o,
+    input wire [1:0] my_reg2_C2_i,
+    input wire [9:0] my_reg2_A2_i,
+    input wire [19:0] my_reg2_B2_i,
+    output wire [15:0] my_reg3_gpif_read_pkt_length_o
+
+);
+    localparam ADDR_MY_REG1 = 32'h0;
+    localparam ADDR_MY_REG2 = 32'h4;
+    localparam ADDR_MY_REG3 = 32'h8;
+
+    reg [32-1:0] register_data [0:2];
+    
+    reg dec_hit;
+    reg [2-1:0] dec_index;
+    reg dec_writable;
+
+    // flat 译码：PADDR 与每个寄存器的完整地址比较
+    always @* begin
+        dec_hit = 1'b0;
+        dec_index = 2'd0;
+        dec_writable = 1'b0;
+        case (PADDR)
+            ADDR_MY_REG1: begin dec_hit = 1'b1; dec_index = 2'd0; dec_writable = 1'b1; end
+            ADDR_MY_REG2: begin dec_hit = 1'b1; dec_index = 2'd1; dec_writable = 1'b0; end
+            ADDR_MY_REG3: begin dec_hit = 1'b1; dec_index = 2'd2; dec_writable = 1'b1; end
+            default: ;
+        endcase
+    end
+
+    reg PREADY_reg;
+    reg [32-1:0] PRDATA_reg;
+
+    // APB 握手：setup 阶段锁存译码结果，access 阶段等待 READ_LATENCY（只对读）加 WAIT_STATES 个周期后拉高 PREADY
+    localparam [7:0] READ_LATENCY = 8'd0;
+    wire apb_setup = PSEL && !PENABLE;
+    wire apb_access = PSEL && PENABLE;
+    wire [7:0] access_latency = (PWRITE ? 8'd0 : READ_LATENCY) + WAIT_STATES[7:0];
+
+    reg dec_hit_q;
+    reg [2-1:0] dec_index_q;
+    reg dec_writable_q;
+    reg [7:0] wait_count;
+
+    always @(posedge PCLK) begin
+        if (!PRESETn) begin
+            PREADY_reg <= 1'b0;
+            PRDATA_reg <= 32'b0;
+            dec_hit_q <= 1'b0;
+            dec_index_q <= 2'd0;
+            dec_writable_q <= 1'b0;
+            wait_count <= 8'd0;
+            // 初始化寄存器
+            register_data[0] <= 32'h0;
+            register_data[1] <= 32'h0;
+            register_data[2] <= 32'h0;
+        end else begin
+            if (apb_setup) begin
+                dec_hit_q <= dec_hit;
+                dec_index_q <= dec_index;
+                dec_writable_q <= dec_writable;
+                wait_count <= 8'd0;
+                PREADY_reg <= (access_latency == 8'd0);
+                // none 流水：setup 阶段由组合译码结果直接选择读数据
+                PRDATA_reg <= dec_hit ? register_data[dec_index] : 32'b0;
+            end else if (apb_access && !PREADY_reg) begin
+                wait_count <= wait_count + 8'd1;
+                PREADY_reg <= (wait_count + 8'd1 == access_latency);
+            end else begin
+                PREADY_reg <= 1'b0;
+            end
+            // 写操作在传输完成的周期提交，只读寄存器忽略写入
+            if (apb_access && PREADY_reg && PWRITE && dec_hit_q && dec_writable_q)
+                register_data[dec_index_q] <= PWDATA;
+        end
+    end
+
+    assign PREADY = PREADY_reg;
+    assign PSLVERROR = PREADY_reg && !dec_hit_q;
+    assign PRDATA = PRDATA_reg;
+     assign my_reg1_imu_trigger_en_o = register_data[0][0:0];
+ assign my_reg1_depth_trigger_en_o = register_data[0][1:1];
+ assign my_reg1_orb_trigger_en_o = register_data[0][2:2];
+ assign my_reg1_depth_pkt_word_num_o = register_data[0][10:3];
+ assign my_reg1_reserved_o = register_data[0][17:11];
+ assign my_reg1_ir_frame_sel_o = register_data[0][18:18];
+ assign my_reg1_pkt_corner_num_o = register_data[0][26:19];
+ always @* begin register_data[1][1:0] = my_reg2_C2_i; end
+ always @* begin register_data[1][11:2] = my_reg2_A2_i; end
+ always @* begin register_data[1][31:12] = my_reg2_B2_i; end
+ assign my_reg3_gpif_read_pkt_length_o = register_data[2][15:0];
+
+endmodule
@@ -0,0 +1,142 @@
+#ifndef REAL_BLK_HOST_H
+#define REAL_BLK_HOST_H
+
+/* real_blk 寄存器块的主机仿真：只能被测试 C 代码包含一次，编译时定义 REG_HOST_EMULATION */
+
+#ifndef _DEFAULT_SOURCE
+#define _DEFAULT_SOURCE
+#endif
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+
+#ifndef __IO
+#define __IO volatile
+#endif
+#ifndef __I
+#define __I volatile const
+#endif
+#ifndef __O
+#define __O volatile
+#endif
+/* xml_to_struct_and_test 生成的结构体头文件使用的访问限定符 */
+#ifndef _IO
+#define _IO volatile
+#endif
+#ifndef _I
+#define _I volatile const
+#endif
+#ifndef _O
+#define _O volatile
+#endif
+
+#define REAL_BLK_HOST_BASE ((uint32_t)(0x10000000))
+#define REAL_BLK_HOST_SIZE 0xCu
+
+typedef struct {
+    uint32_t offset;
+    uint32_t reset;
+    uint32_t read_mask;
+    uint32_t write_mask;
+    uint32_t clear_mask;
+    uint32_t set_mask;
+} real_blk_host_desc_t;
+
+static const real_blk_host_desc_t real_blk_host_regs[] = {
+    {0x0, 0x0, 0x7FFFFFF, 0x7FFFFFF, 0x0, 0x0}, /* my_reg1 */
+    {0x4, 0xFF047, 0xFFFFFFFF, 0x0, 0x0, 0x0}, /* my_reg2 */
+    {0x8, 0xFFFF, 0xFFFF, 0xFFFF, 0x0, 0x0}, /* my_reg3 */
+};
+
+#define REAL_BLK_HOST_REG_COUNT 3u
+
+volatile uint32_t *real_blk_host_mem;
+unsigned long real_blk_host_bus_errors;
+
+/* 映射寄存器窗口并装入复位值。path 为 NULL 或空字符串时使用匿名映射，否则映射（必要时创建）该文件。 */
+int real_blk_host_init(const char *path) {
+    void *mem;
+    uint32_t i;
+    if (path == NULL || path[0] == '\0') {
+        mem = mmap(NULL, REAL_BLK_HOST_SIZE, PROT_READ | PROT_WRITE, MAP_SHARED | MAP_ANONYMOUS, -1, 0);
+    } else {
+        int fd = open(path, O_RDWR | O_CREAT, 0644);
+        if (fd < 0) {
+            perror(path);
+            return -1;
+        }
+        if (ftruncate(fd, REAL_BLK_HOST_SIZE) != 0) {
+            perror(path);
+            close(fd);
+            return -1;
+        }
+        mem = mmap(NULL, REAL_BLK_HOST_SIZE, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+        close(fd);
+    }
+    if (mem == MAP_FAILED) {
+        perror("mmap");
+        return -1;
+    }
+    real_blk_host_mem = (volatile uint32_t *)mem;
+    for (i = 0; i < REAL_BLK_HOST_REG_COUNT; i++) {
+        real_blk_host_mem[real_blk_host_regs[i].offset / 4] = real_blk_host_regs[i].reset;
+    }
+    return 0;
+}
+
+void real_blk_host_close(void) {
+    if (real_blk_host_mem != NULL) {
+        munmap((void *)real_blk_host_mem, REAL_BLK_HOST_SIZE);
+        real_blk_host_mem = NULL;
+    }
+}
+
+/* 查找地址对应的寄存器，首次访问时按环境变量 REG_HOST_FILE 映射寄存器窗口 */
+static const real_blk_host_desc_t *real_blk_host_find(uint32_t address) {
+    uint32_t offset = address - REAL_BLK_HOST_BASE;
+    uint32_t lo = 0;
+    uint32_t hi = REAL_BLK_HOST_REG_COUNT;
+    if (real_blk_host_mem == NULL && real_blk_host_init(getenv("REG_HOST_FILE")) != 0) {
+        exit(2);
+    }
+    while (lo < hi) {
+        uint32_t mid = lo + (hi - lo) / 2;
+        if (real_blk_host_regs[mid].offset < offset) {
+            lo = mid + 1;
+        } else {
+            hi = mid;
+        }
+    }
+    if (lo < REAL_BLK_HOST_REG_COUNT && real_blk_host_regs[lo].offset == offset) {
+        return &real_blk_host_regs[lo];
+    }
+    real_blk_host_bus_errors++;
+    fprintf(stderr, "real_blk: address 0x%08X is not mapped to any register\n", (unsigned)address);
+    return NULL;
+}
+
+uint32_t read_reg(uint32_t address) {
+    const real_blk_host_desc_t *reg = real_blk_host_find(address);
+    if (reg == NULL) {
+        return 0;
+    }
+    return real_blk_host_mem[reg->offset / 4] & reg->read_mask;
+}
+
+void write_reg(uint32_t address, uint32_t value) {
+    const real_blk_host_desc_t *reg = real_blk_host_find(address);
+    uint32_t current;
+    if (reg == NULL) {
+        return;
+    }
+    current = real_blk_host_mem[reg->offset / 4];
+    current = (current & ~reg->write_mask) | (value & reg->write_mask);
+    current &= ~(value & reg->clear_mask);
+    current |= value & reg->set_mask;
+    real_blk_host_mem[reg->offset / 4] = current;
+}
+
+#endif /* REAL_BLK_HOST_H */
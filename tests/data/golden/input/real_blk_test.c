@@ -0,0 +1,55 @@
+#ifdef REG_HOST_EMULATION
+#include "real_blk_host.h"
+#endif
+#include "real_blk.h"
+
+#ifndef REG_HOST_EMULATION
+uint32_t read_reg(uint32_t address) {
+    return *(volatile uint32_t*)address;
+}
+
+void write_reg(uint32_t address, uint32_t value) {
+    *(volatile uint32_t*)address = value;
+}
+#endif
+
+int test_reg_access() {
+    uint32_t base_addr = 0x10000000;
+    uint32_t rand_val;
+    uint32_t read_val;
+    int failures = 0;
+
+    rand_val = rand();
+    write_reg(base_addr + 0x0, rand_val);
+    read_val = read_reg(base_addr + 0x0);
+    if ((read_val ^ rand_val) & 0x7FFFFFF) {
+        printf("my_reg1 RW test failed!\n");
+        failures++;
+    }
+
+    rand_val = rand();
+    write_reg(base_addr + 0x4, rand_val);
+    read_val = read_reg(base_addr + 0x4);
+    if (read_val != 0xff047) {
+        printf("my_reg2 RO test failed!\n");
+        failures++;
+    }
+
+    rand_val = rand();
+    write_reg(base_addr + 0x8, rand_val);
+    read_val = read_reg(base_addr + 0x8);
+    if ((read_val ^ rand_val) & 0xFFFF) {
+        printf("my_reg3 RW test failed!\n");
+        failures++;
+    }
+
+    return failures;
+}
+
+#ifdef REG_HOST_EMULATION
+int main(void) {
+    int failures = test_reg_access();
+    printf("%d register test(s) failed, %lu bus error(s)\n", failures, real_blk_host_bus_errors);
+    return failures != 0 || real_blk_host_bus_errors != 0;
+}
+#endif
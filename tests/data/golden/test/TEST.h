@@ -0,0 +1,80 @@
+
+#ifndef TEST_H
+#define TEST_H
+
+/*------------------------------- MODULE_NAME: TEST -----------------------*/
+
+typedef struct
+{
+    __IO uint32_t CTRL; /* Offset: 0x0 (RW)  Register */
+    __I uint32_t STATUS; /* Offset: 0x4 (RO)  Register */
+    __IO uint32_t COMMAND; /* Offset: 0xa4 (WO)  Register */
+    __IO uint32_t CONFIG; /* Offset: 0x100 (RW)  Register */
+
+} TEST_TypeDef;
+#define TEST_CTRL_OFFSET (0x0)
+#define TEST_STATUS_OFFSET (0x4)
+#define TEST_COMMAND_OFFSET (0xA4)
+#define TEST_CONFIG_OFFSET (0x100)
+
+#define TEST_CTRL_DATA_Pos (0U)
+#define TEST_CTRL_DATA_Msk (0xFFFFFFFFUL << TEST_CTRL_DATA_Pos)
+#define TEST_CTRL_DATA_Val(value) (((uint32_t)(value) << TEST_CTRL_DATA_Pos) & TEST_CTRL_DATA_Msk)
+
+#define TEST_STATUS_DATA_Pos (0U)
+#define TEST_STATUS_DATA_Msk (0xFFFFFFFFUL << TEST_STATUS_DATA_Pos)
+#define TEST_STATUS_DATA_Val(value) (((uint32_t)(value) << TEST_STATUS_DATA_Pos) & TEST_STATUS_DATA_Msk)
+
+#define TEST_COMMAND_DATA_Pos (0U)
+#define TEST_COMMAND_DATA_Msk (0xFFFFFFFFUL << TEST_COMMAND_DATA_Pos)
+#define TEST_COMMAND_DATA_Val(value) (((uint32_t)(value) << TEST_COMMAND_DATA_Pos) & TEST_COMMAND_DATA_Msk)
+
+#define TEST_CONFIG_DATA_Pos (0U)
+#define TEST_CONFIG_DATA_Msk (0xFFFFFFFFUL << TEST_CONFIG_DATA_Pos)
+#define TEST_CONFIG_DATA_Val(value) (((uint32_t)(value) << TEST_CONFIG_DATA_Pos) & TEST_CONFIG_DATA_Msk)
+
+#ifndef TEST_NO_ACCESSORS
+
+static inline void TEST_CTRL_Update(TEST_TypeDef *regs, uint32_t mask, uint32_t value)
+{
+    regs->CTRL = (regs->CTRL & ~mask) | (value & mask);
+}
+static inline uint32_t TEST_CTRL_DATA_Get(const TEST_TypeDef *regs)
+{
+    return (regs->CTRL & TEST_CTRL_DATA_Msk) >> TEST_CTRL_DATA_Pos;
+}
+static inline void TEST_CTRL_DATA_Set(TEST_TypeDef *regs, uint32_t value)
+{
+    TEST_CTRL_Update(regs, TEST_CTRL_DATA_Msk, TEST_CTRL_DATA_Val(value));
+}
+
+static inline uint32_t TEST_STATUS_DATA_Get(const TEST_TypeDef *regs)
+{
+    return (regs->STATUS & TEST_STATUS_DATA_Msk) >> TEST_STATUS_DATA_Pos;
+}
+
+static inline void TEST_COMMAND_Update(TEST_TypeDef *regs, uint32_t mask, uint32_t value)
+{
+    regs->COMMAND = value & mask;
+}
+static inline void TEST_COMMAND_DATA_Set(TEST_TypeDef *regs, uint32_t value)
+{
+    TEST_COMMAND_Update(regs, TEST_COMMAND_DATA_Msk, TEST_COMMAND_DATA_Val(value));
+}
+
+static inline void TEST_CONFIG_Update(TEST_TypeDef *regs, uint32_t mask, uint32_t value)
+{
+    regs->CONFIG = (regs->CONFIG & ~mask) | (value & mask);
+}
+static inline uint32_t TEST_CONFIG_DATA_Get(const TEST_TypeDef *regs)
+{
+    return (regs->CONFIG & TEST_CONFIG_DATA_Msk) >> TEST_CONFIG_DATA_Pos;
+}
+static inline void TEST_CONFIG_DATA_Set(TEST_TypeDef *regs, uint32_t value)
+{
+    TEST_CONFIG_Update(regs, TEST_CONFIG_DATA_Msk, TEST_CONFIG_DATA_Val(value));
+}
+
+#endif /* TEST_NO_ACCESSORS */
+
+#endif /* TEST_H */
@@ -0,0 +1,104 @@
+
+module TEST #(
+    // 每次传输在流水延迟之外额外插入的等待周期数（0 到 253）
+    parameter integer WAIT_STATES = 0
+) (
+
+    input wire PCLK,
+    input wire PRESETn,
+    input wire PSEL,
+    input wire PENABLE,
+    input wire [31:0] PADDR,
+    input wire PWRITE,
+    input wire [32-1:0] PWDATA,
+    output wire [32-1:0] PRDATA,
+    output wire PREADY,
+    output wire PSLVERROR,
+        output wire [31:0] CTRL_DATA_o,
+    input wire [31:0] STATUS_DATA_i,
+    output wire [31:0] COMMAND_DATA_o,
+    output wire [31:0] CONFIG_DATA_o
+
+);
+    localparam ADDR_CTRL = 32'h0;
+    localparam ADDR_STATUS = 32'h4;
+    localparam ADDR_COMMAND = 32'ha4;
+    localparam ADDR_CONFIG = 32'h100;
+
+    reg [32-1:0] register_data [0:3];
+    
+    reg dec_hit;
+    reg [2-1:0] dec_index;
+    reg dec_writable;
+
+    // flat 译码：PADDR 与每个寄存器的完整地址比较
+    always @* begin
+        dec_hit = 1'b0;
+        dec_index = 2'd0;
+        dec_writable = 1'b0;
+        case (PADDR)
+            ADDR_CTRL: begin dec_hit = 1'b1; dec_index = 2'd0; dec_writable = 1'b1; end
+            ADDR_STATUS: begin dec_hit = 1'b1; dec_index = 2'd1; dec_writable = 1'b0; end
+            ADDR_COMMAND: begin dec_hit = 1'b1; dec_index = 2'd2; dec_writable = 1'b0; end
+            ADDR_CONFIG: begin dec_hit = 1'b1; dec_index = 2'd3; dec_writable = 1'b1; end
+            default: ;
+        endcase
+    end
+
+    reg PREADY_reg;
+    reg [32-1:0] PRDATA_reg;
+
+    // APB 握手：setup 阶段锁存译码结果，access 阶段等待 READ_LATENCY（只对读）加 WAIT_STATES 个周期后拉高 PREADY
+    localparam [7:0] READ_LATENCY = 8'd0;
+    wire apb_setup = PSEL && !PENABLE;
+    wire apb_access = PSEL && PENABLE;
+    wire [7:0] access_latency = (PWRITE ? 8'd0 : READ_LATENCY) + WAIT_STATES[7:0];
+
+    reg dec_hit_q;
+    reg [2-1:0] dec_index_q;
+    reg dec_writable_q;
+    reg [7:0] wait_count;
+
+    always @(posedge PCLK) begin
+        if (!PRESETn) begin
+            PREADY_reg <= 1'b0;
+            PRDATA_reg <= 32'b0;
+            dec_hit_q <= 1'b0;
+            dec_index_q <= 2'd0;
+            dec_writable_q <= 1'b0;
+            wait_count <= 8'd0;
+            // 初始化寄存器
+            register_data[0] <= 32'h0;
+            register_data[1] <= 32'h0;
+            register_data[2] <= 32'h0;
+            register_data[3] <= 32'h0;
+        end else begin
+            if (apb_setup) begin
+                dec_hit_q <= dec_hit;
+                dec_index_q <= dec_index;
+                dec_writable_q <= dec_writable;
+                wait_count <= 8'd0;
+                PREADY_reg <= (access_latency == 8'd0);
+                // none 流水：setup 阶段由组合译码结果直接选择读数据
+                PRDATA_reg <= dec_hit ? register_data[dec_index] : 32'b0;
+            end else if (apb_access && !PREADY_reg) begin
+                wait_count <= wait_count + 8'd1;
+                PREADY_reg <= (wait_count + 8'd1 == access_latency);
+            end else begin
+                PREADY_reg <= 1'b0;
+            end
+            // 写操作在传输完成的周期提交，只读寄存器忽略写入
+            if (apb_access && PREADY_reg && PWRITE && dec_hit_q && dec_writable_q)
+                register_data[dec_index_q] <= PWDATA;
+        end
+    end
+
+    assign PREADY = PREADY_reg;
+    assign PSLVERROR = PREADY_reg && !dec_hit_q;
+    assign PRDATA = PRDATA_reg;
+     assign CTRL_DATA_o = register_data[0][31:0];
+ always @* begin register_data[1][31:0] = STATUS_DATA_i; end
+ assign COMMAND_DATA_o = register_data[2][31:0];
+ assign CONFIG_DATA_o = register_data[3][31:0];
+
+endmodule
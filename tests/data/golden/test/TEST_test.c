@@ -0,0 +1,58 @@
+#ifdef REG_HOST_EMULATION
+#include "TEST_host.h"
+#endif
+#include "TEST.h"
+
+#ifndef REG_HOST_EMULATION
+uint32_t read_reg(uint32_t address) {
+    return *(volatile uint32_t*)address;
+}
+
+void write_reg(uint32_t address, uint32_t value) {
+    *(volatile uint32_t*)address = value;
+}
+#endif
+
+int test_reg_access() {
+    uint32_t base_addr = 0x10000000;
+    uint32_t rand_val;
+    uint32_t read_val;
+    int failures = 0;
+
+    rand_val = rand();
+    write_reg(base_addr + 0x0, rand_val);
+    read_val = read_reg(base_addr + 0x0);
+    if (read_val != rand_val) {
+        printf("CTRL RW test failed!\n");
+        failures++;
+    }
+
+    rand_val = rand();
+    write_reg(base_addr + 0x4, rand_val);
+    read_val = read_reg(base_addr + 0x4);
+    if (read_val != 0x0) {
+        printf("STATUS RO test failed!\n");
+        failures++;
+    }
+
+    write_reg(base_addr + 0xa4, 0xDEADBEEF);
+    printf("COMMAND WO test passed\n");
+
+    rand_val = rand();
+    write_reg(base_addr + 0x100, rand_val);
+    read_val = read_reg(base_addr + 0x100);
+    if (read_val != rand_val) {
+        printf("CONFIG RW test failed!\n");
+        failures++;
+    }
+
+    return failures;
+}
+
+#ifdef REG_HOST_EMULATION
+int main(void) {
+    int failures = test_reg_access();
+    printf("%d register test(s) failed, %lu bus error(s)\n", failures, TEST_host_bus_errors);
+    return failures != 0 || TEST_host_bus_errors != 0;
+}
+#endif
@@ -0,0 +1,107 @@
+`ifndef TEST_RAL_MODEL_SV
+`define TEST_RAL_MODEL_SV
+
+import uvm_pkg::*;
+
+class ral_reg_CTRL extends uvm_reg;
+    `uvm_object_utils(ral_reg_CTRL)
+
+    rand uvm_reg_field DATA;
+
+    function new (string name = "ral_reg_CTRL");
+        super.new(name, 32, UVM_NO_COVERAGE);
+    endfunction
+
+    virtual function void build();
+        // 配置字段
+        
+        this.DATA = uvm_reg_field::type_id::create("DATA");
+        this.DATA.configure(this, 32, 0, "RW", 0, 'h0, 1, 0, 0);
+    endfunction
+
+endclass
+
+class ral_reg_STATUS extends uvm_reg;
+    `uvm_object_utils(ral_reg_STATUS)
+
+    rand uvm_reg_field DATA;
+
+    function new (string name = "ral_reg_STATUS");
+        super.new(name, 32, UVM_NO_COVERAGE);
+    endfunction
+
+    virtual function void build();
+        // 配置字段
+        
+        this.DATA = uvm_reg_field::type_id::create("DATA");
+        this.DATA.configure(this, 32, 0, "RO", 0, 'h0, 1, 0, 0);
+    endfunction
+
+endclass
+
+class ral_reg_COMMAND extends uvm_reg;
+    `uvm_object_utils(ral_reg_COMMAND)
+
+    rand uvm_reg_field DATA;
+
+    function new (string name = "ral_reg_COMMAND");
+        super.new(name, 32, UVM_NO_COVERAGE);
+    endfunction
+
+    virtual function void build();
+        // 配置字段
+        
+        this.DATA = uvm_reg_field::type_id::create("DATA");
+        this.DATA.configure(this, 32, 0, "WO", 0, 'h0, 1, 0, 0);
+    endfunction
+
+endclass
+
+typedef ral_reg_CTRL ral_reg_CONFIG;
+
+class ral_block_TEST extends uvm_reg_block;
+
+    `uvm_object_utils(ral_block_TEST)
+
+    // 寄存器句柄
+    rand ral_reg_CTRL CTRL;
+    rand ral_reg_STATUS STATUS;
+    rand ral_reg_COMMAND COMMAND;
+    rand ral_reg_CTRL CONFIG;
+
+
+    function new (string name = "ral_block_TEST");
+        super.new(name, UVM_NO_COVERAGE);
+    endfunction
+
+    virtual function void build();
+
+        this.default_map = create_map("", 0, 4, UVM_LITTLE_ENDIAN, 0);
+        // 创建寄存器
+
+        CTRL = ral_reg_CTRL::type_id::create("CTRL",,get_full_name());
+        CTRL.configure(this, null, "CTRL");
+        CTRL.build();
+        this.default_map.add_reg(this.CTRL, 32'h0, "RW", 0);
+
+        STATUS = ral_reg_STATUS::type_id::create("STATUS",,get_full_name());
+        STATUS.configure(this, null, "STATUS");
+        STATUS.build();
+        this.default_map.add_reg(this.STATUS, 32'h4, "RW", 0);
+
+        COMMAND = ral_reg_COMMAND::type_id::create("COMMAND",,get_full_name());
+        COMMAND.configure(this, null, "COMMAND");
+        COMMAND.build();
+        this.default_map.add_reg(this.COMMAND, 32'ha4, "RW", 0);
+
+        CONFIG = ral_reg_CTRL::type_id::create("CONFIG",,get_full_name());
+        CONFIG.configure(this, null, "CONFIG");
+        CONFIG.build();
+        this.default_map.add_reg(this.CONFIG, 32'h100, "RW", 0);
+
+    endfunction
+
+endclass
+
+
+`endif
@@ -0,0 +1,65 @@
+import os
+import shutil
+import subprocess
+import pytest
+from conftest import ROOT_DIR
+from md2json_reg import parse_markdown
+from reg_model import RegisterMap
+from json2ctest_reg import TEST_STYLES, generate_ctest_code, generate_host_shim
+from json2cheader_reg import generate_cheader
+
+INPUT_MD = os.path.join(ROOT_DIR, "input.md")
+
+
+def ctest_code(style):
+    registers = RegisterMap.from_dict(parse_markdown(INPUT_MD))
+    return generate_ctest_code(registers.module_name, registers, "0x10000000", style)
+
+
+def run_host_test(tmp_path, style, shim_data):
+    """以 shim_data 生成主机仿真头文件，编译并运行 input.md 的测试代码，返回退出状态。"""
+    compiler = shutil.which("cc") or shutil.which("gcc")
+    if compiler is None:
+        pytest.skip("没有 C 编译器")
+    registers = RegisterMap.from_dict(parse_markdown(INPUT_MD))
+    module_name = registers.module_name
+    (tmp_path / f"{module_name}.h").write_text(generate_cheader(module_name, registers))
+    (tmp_path / f"{module_name}_host.h").write_text(generate_host_shim(module_name, RegisterMap.from_dict(shim_data), "0x10000000"))
+    (tmp_path / "test.c").write_text(generate_ctest_code(module_name, registers, "0x10000000", style))
+    subprocess.run([compiler, "-DREG_HOST_EMULATION", "-o", str(tmp_path / "host_test"), str(tmp_path / "test.c")], check=True)
+    return subprocess.run([str(tmp_path / "host_test")], stdout=subprocess.DEVNULL).returncode
+
+
+@pytest.mark.parametrize("style", TEST_STYLES)
+def test_host_test_exit_status(style, tmp_path):
+    """主机仿真测试全部通过时退出状态为 0，有寄存器测试失败时不为 0。"""
+    data = parse_markdown(INPUT_MD)
+    assert run_host_test(tmp_path, style, data) == 0
+
+    # 仿真头文件中 RO 寄存器的复位值与测试代码不一致
+    ro_register = next(register for register in data["REGISTERS"] if register["REG_TYPE"] == "RO")
+    ro_register["RESET_VALUE"] = "0x5a5a"
+    assert run_host_test(tmp_path, style, data) != 0
+
+
+@pytest.mark.parametrize("style", TEST_STYLES)
+def test_styles_share_signature(style):
+    """两种风格的 test_reg_access 都返回失败的寄存器数。"""
+    code = ctest_code(style)
+    assert "int test_reg_access() {" in code
+    assert "return failures" in code
+
+
+def test_unrolled_ro_writes_before_reset_check():
+    """unrolled 风格与 table 风格相同，RO 寄存器先写随机值再比较复位值。"""
+    code = ctest_code("unrolled")
+    ro_test = code[:code.index("RO test failed")]
+    ro_test = ro_test[ro_test.rindex("rand_val = rand();"):]
+    assert "write_reg(" in ro_test and "read_reg(" in ro_test
+
+
+def test_table_count_macro_upper_case():
+    """描述符表的寄存器数量宏使用大写模块名前缀。"""
+    code = ctest_code("table")
+    assert "#define REAL_BLK_REG_TEST_COUNT " in code
+    assert "real_blk_REG_TEST_COUNT" not in code
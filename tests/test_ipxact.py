@@ -0,0 +1,49 @@
+import os
+import pytest
+import xml_to_struct_and_test
+from conftest import DATA_DIR
+from ipxact_reg import import_ipxact, iter_ipxact_registers
+from xml_to_struct_and_test import parse_xml, generate_struct_code
+
+# 两个地址块的 baseAddress 分别为 0x40000000 和 0x40000010
+BASE_XML = os.path.join(DATA_DIR, "ipxact_base.xml")
+
+
+def test_registers_keep_block_base():
+    """IpxactRegister 保留地址块基地址和存储映射中的地址。"""
+    data = [(reg.name, reg.base_address, reg.offset, reg.address) for reg in iter_ipxact_registers(BASE_XML)]
+    assert data == [
+        ("REG0", 0x40000000, 0x0, 0x40000000),
+        ("STATUS", 0x40000000, 0x4, 0x40000004),
+        ("DATA", 0x40000010, 0x0, 0x40000010),
+    ]
+
+
+def test_import_ipxact_offsets():
+    """导入的寄存器地址相对于最低的 baseAddress。"""
+    data = import_ipxact(BASE_XML, jobs=1)
+    assert data["MODULE_NAME"] == "UART"
+    assert [(reg["REG_NAME"], reg["ADDRESS"]) for reg in data["REGISTERS"]] == [("REG0", "0x0"), ("STATUS", "0x4"), ("DATA", "0x10")]
+
+
+def test_parse_xml_offsets():
+    """xml_to_struct_and_test 的结构体按偏移排列，不为基地址生成保留数组。"""
+    registers, module_name = parse_xml(BASE_XML)
+    assert [reg.address for reg in registers] == [0x0, 0x4, 0x10]
+    code = generate_struct_code(registers, module_name)
+    assert "uint32_t RESERVED0[2]; /* Offset: 0x00000008 - 0x0000000F (reserved) */" in code
+    assert "#define UART_DATA_OFFSET (0x10)" in code
+
+
+def test_main_reports_layout_errors(tmp_path, monkeypatch, caplog):
+    """寄存器布局错误时输出错误列表并以状态 1 退出，不写出任何文件。"""
+    xml_file = tmp_path / "bad.xml"
+    with open(BASE_XML, encoding="utf-8") as f:
+        xml_file.write_text(f.read().replace("<ipxact:addressOffset>0x4<", "<ipxact:addressOffset>0x2<"), encoding="utf-8")
+    output_dir = tmp_path / "out"
+    monkeypatch.setattr("sys.argv", ["xml_to_struct_and_test.py", str(xml_file), "--base_address", "0x0", "--output_dir", str(output_dir)])
+    with pytest.raises(SystemExit) as exc:
+        xml_to_struct_and_test.main()
+    assert exc.value.code == 1
+    assert "寄存器 STATUS 的偏移 0x2 未按 4 字节对齐" in caplog.messages
+    assert not output_dir.exists()
@@ -0,0 +1,38 @@
+import json
+import os
+import pytest
+from conftest import ROOT_DIR, DATA_DIR
+from md2json_reg import parse_markdown, markdown_to_json, verify_html
+
+# (Markdown 文件, 由原来的 markdown + BeautifulSoup 解析方式生成的 JSON)
+GOLDEN_SPECS = [
+    (os.path.join(ROOT_DIR, "input.md"), os.path.join(DATA_DIR, "input.json")),
+    (os.path.join(DATA_DIR, "tricky_cells.md"), os.path.join(DATA_DIR, "tricky_cells.json")),
+]
+
+
+@pytest.mark.parametrize("markdown_file, golden_file", GOLDEN_SPECS)
+def test_json_matches_html_parser(markdown_file, golden_file, tmp_path):
+    """直接解析写出的 JSON 与 HTML 解析方式的 JSON 逐字节相同。"""
+    json_file = tmp_path / "output.json"
+    markdown_to_json(markdown_file, str(json_file))
+    with open(golden_file, 'rb') as f:
+        assert json_file.read_bytes() == f.read()
+
+
+@pytest.mark.parametrize("markdown_file, golden_file", GOLDEN_SPECS)
+def test_cells_match_rendered_html(markdown_file, golden_file):
+    """每个表格单元格与 markdown 库渲染后用 BeautifulSoup 提取的文本相同。"""
+    pytest.importorskip("markdown")
+    pytest.importorskip("bs4")
+    assert verify_html(markdown_file) == []
+
+
+def test_tricky_cells():
+    """强调、链接、行内代码、HTML 标签和连续空白的转换结果。"""
+    register = parse_markdown(os.path.join(DATA_DIR, "tricky_cells.md"))["REGISTERS"][0]
+    descs = {field["NAME"]: field["DESC"] for field in register["FIELDS"]}
+    assert register["DESC"] == "size 6404002 bytes, see spec"
+    assert descs["bit_0_en"] == "bit_0_en and note"
+    assert descs["mode"] == "u http://q.com"
+    assert descs["html"] == "bold  it"
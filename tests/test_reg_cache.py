@@ -0,0 +1,18 @@
+import os
+from ipxact_reg import import_ipxact
+from md2json_reg import parse_markdown
+from reg_cache import parser_source_files
+
+
+def test_parser_source_files_follow_imports():
+    """解析器使用的同目录模块都参与缓存键的计算。"""
+    names = [os.path.basename(path) for path in parser_source_files(import_ipxact)]
+    assert "ipxact_reg.py" in names
+    assert "reg_model.py" in names
+
+
+def test_parser_source_files_skip_unused_modules():
+    """解析器没有引用的模块不会使其缓存失效。"""
+    names = [os.path.basename(path) for path in parser_source_files(parse_markdown)]
+    assert "md2json_reg.py" in names
+    assert "ipxact_reg.py" not in names
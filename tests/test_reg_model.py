@@ -0,0 +1,49 @@
+import pytest
+from reg_model import RegisterMap, field_access
+from json2ctest_reg import host_register_masks
+
+# Markdown 规格转换出的寄存器：字段只有 TYPE，ACCESS 取默认值 RW
+SPEC = {
+    "MODULE_NAME": "acc",
+    "REGISTERS": [
+        {"REG_NAME": "CTRL", "REG_TYPE": "RW", "ADDRESS": "0x0",
+         "FIELDS": [{"NAME": "en", "WIDTH": 1, "RESET": "0x0", "TYPE": "RW"},
+                    {"NAME": "busy", "WIDTH": 1, "RESET": "0x0", "TYPE": "RO"},
+                    {"NAME": "irq", "WIDTH": 1, "RESET": "0x0", "TYPE": "RW", "ACCESS": "W1C"}]},
+        {"REG_NAME": "STATUS", "REG_TYPE": "RO", "ADDRESS": "0x4",
+         "FIELDS": [{"NAME": "state", "WIDTH": 4, "RESET": "0x3", "TYPE": "RW"}]},
+        {"REG_NAME": "KEY", "REG_TYPE": "WO", "ADDRESS": "0x8",
+         "FIELDS": [{"NAME": "key", "WIDTH": 8, "RESET": "0x0", "TYPE": "RW"}]},
+    ],
+}
+
+
+def test_field_access():
+    """寄存器类型 RO/WO 优先，其次为非默认的字段 ACCESS，最后为字段 TYPE。"""
+    registers = RegisterMap.from_dict(SPEC)
+    ctrl, status, key = registers
+    assert [field_access(ctrl, field) for field in ctrl.fields] == ["RW", "RO", "W1C"]
+    assert field_access(status, status.fields[0]) == "RO"
+    assert field_access(key, key.fields[0]) == "WO"
+
+
+def test_host_register_masks_write_only():
+    """WO 寄存器可写但读回 0。"""
+    key = RegisterMap.from_dict(SPEC).find("KEY")
+    assert host_register_masks(key) == (0, 0xFF, 0, 0)
+
+
+def test_tlm_write_only():
+    """事务级模型与主机仿真的访问类型一致。"""
+    pytest.importorskip("numpy")
+    from reg_tlm import RegisterFileModel
+
+    model = RegisterFileModel(RegisterMap.from_dict(SPEC))
+    assert not model.write(0x8, 0x5A)
+    assert model.peek("KEY") == 0x5A
+    assert model.read(0x8) == (0, False)
+
+    model.write(0x0, 0x7)
+    assert model.peek("CTRL") == 0x1
+    model.write(0x4, 0xF)
+    assert model.read(0x4) == (0x3, False)
@@ -0,0 +1,68 @@
+import os
+import shutil
+import pytest
+import reg_emit
+import reg_template
+import gen_all_reg
+from conftest import ROOT_DIR, DATA_DIR
+from reg_template import TEMPLATE_DIR, CACHE_DIR_NAME, template_names
+
+# (规格文件, tests/data/golden 下的期望输出目录)
+GOLDEN_SPECS = [
+    (os.path.join(ROOT_DIR, "input.md"), "input"),
+    (os.path.join(ROOT_DIR, "test.xml"), "test"),
+]
+BACKENDS = ["cheader", "ral", "rtl", "ctest", "host"]
+
+# 各后端线程中创建工作进程时 Python 3.12 对 fork 给出的警告
+pytestmark = pytest.mark.filterwarnings("ignore:This process .* is multi-threaded:DeprecationWarning")
+
+
+@pytest.fixture
+def template_dir(tmp_path, monkeypatch):
+    """内置模板的副本，其 __pycache__ 编译缓存为空；同时清空进程内的编译缓存。"""
+    directory = tmp_path / "templates"
+    directory.mkdir()
+    for name in template_names():
+        shutil.copyfile(os.path.join(TEMPLATE_DIR, name), directory / name)
+    monkeypatch.setattr(reg_template, "_compiled", {})
+    return str(directory)
+
+
+def generate(spec_file, output_dir, template_dir, emit_jobs):
+    gen_all_reg.main([spec_file, "--output_dir", output_dir, "--backends", *BACKENDS, "--template_dir", template_dir,
+                      "--emit_jobs", str(emit_jobs)])
+
+
+def assert_matches_golden(output_dir, golden):
+    golden_dir = os.path.join(DATA_DIR, "golden", golden)
+    assert sorted(os.listdir(output_dir)) == sorted(os.listdir(golden_dir))
+    for name in os.listdir(golden_dir):
+        with open(os.path.join(output_dir, name), 'rb') as f, open(os.path.join(golden_dir, name), 'rb') as g:
+            assert f.read() == g.read(), name
+
+
+@pytest.mark.parametrize("spec_file, golden", GOLDEN_SPECS)
+@pytest.mark.parametrize("emit_jobs", [1, 2])
+@pytest.mark.parametrize("cache", ["cold", "warm"])
+def test_backends_match_golden(spec_file, golden, emit_jobs, cache, template_dir, tmp_path, monkeypatch):
+    """全部后端的输出与期望文件逐字节相同，与并行生成和模板编译缓存的状态无关。"""
+    # 小规格也按 emit_jobs 拆分到工作进程中生成
+    monkeypatch.setattr(reg_emit, "PARALLEL_MIN_ITEMS", 1)
+    cache_dir = os.path.join(template_dir, CACHE_DIR_NAME)
+    if cache == "warm":
+        generate(spec_file, str(tmp_path / "first"), template_dir, 1)
+        assert sorted(os.listdir(cache_dir))
+        # 只保留磁盘上的编译缓存，再次生成时不应重新编译任何模板
+        monkeypatch.setattr(reg_template, "_compiled", {})
+
+        def compile_template(source, name="<template>"):
+            raise AssertionError(f"模板 '{name}' 未命中编译缓存")
+        monkeypatch.setattr(reg_template, "compile_template", compile_template)
+    else:
+        assert not os.path.exists(cache_dir)
+
+    output_dir = str(tmp_path / "output")
+    generate(spec_file, output_dir, template_dir, emit_jobs)
+    assert sorted(os.listdir(cache_dir))
+    assert_matches_golden(output_dir, golden)
@@ -1,68 +1,110 @@
-import xml.etree.ElementTree as ET
 import random
+import logging
+import argparse
+import sys
 import os
+from reg_model import Register, RegisterMap
+from ipxact_reg import iter_ipxact_registers
+from json2ctest_reg import TEST_STYLES, iter_test_table, iter_host_shim
+from reg_metrics import NULL_METRICS, add_metrics_arguments, metrics_from_args
+
+# 配置日志记录
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# IPXACT 访问类型 -> md2json 寄存器类型
+XML_ACCESS_TYPES = {"read-write": "RW", "read-only": "RO", "write-only": "WO"}
 
 
 # 解析 IPXACT 格式的 XML 文件
+# 使用 ipxact_reg 流式解析所有 memoryMap 和 addressBlock
+# 寄存器地址为相对于最低 baseAddress 的偏移（与 ipxact_reg.import_ipxact 相同），基地址由 --base_address 给出
 def parse_xml(xml_file):
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
-    registers = []
-    namespace = {'ipxact': 'http://www.accellera.org/XMLSchema/IPXACT/1685-2014'}
-    address_blocks = root.findall('.//ipxact:addressBlock', namespace)
-
-    # 检查 addressBlock 数量
-    if len(address_blocks) == 0:
+    ipxact_registers = list(iter_ipxact_registers(xml_file))
+    if not ipxact_registers:
         print("错误：未找到任何 addressBlock。")
         return [], ""
-    elif len(address_blocks) > 1:
-        print(f"警告：检测到 {len(address_blocks)} 个 addressBlock，仅解析第一个。")
-
-    # 解析第一个 addressBlock
-    address_block = address_blocks[0]
-    register_elements = address_block.findall('.//ipxact:register', namespace)
-    for register in register_elements:
-        name = register.find('ipxact:name', namespace).text
 
-        offset_elem = register.find('ipxact:addressOffset', namespace)
-        offset = offset_elem.text if offset_elem is not None else "0x0"
+    memory_map_name = next((reg.memory_map for reg in ipxact_registers if reg.memory_map), None)
+    base_address = min(reg.base_address for reg in ipxact_registers)
+    registers = [
+        Register(reg.name, reg.address - base_address, type=XML_ACCESS_TYPES.get(reg.access, reg.access), access=reg.access,
+                 desc=reg.desc, reset=reg.reset)
+        for reg in ipxact_registers
+    ]
 
-        access_elem = register.find('ipxact:access', namespace)
-        access = access_elem.text if access_elem is not None else "unknown"
+    module_name = (memory_map_name or "").split('_')[0]
 
-        desc_elem = register.find('ipxact:description', namespace)
-        desc = desc_elem.text if desc_elem is not None else ""
+    return RegisterMap(module_name, registers), module_name
 
-        reset_value_elem = register.find('.//ipxact:reset/ipxact:value', namespace)
-        reset_value = reset_value_elem.text if reset_value_elem is not None else "0x0"
 
-        registers.append((name, offset, access, desc, reset_value))
-
-    memory_map_name = root.find('.//ipxact:memoryMap/ipxact:name', namespace).text
-    module_name = memory_map_name.split('_')[0]
-
-    return registers, module_name
+# 将 parse_xml 的结果转换为可缓存的规范化模型
+def parse_xml_model(xml_file):
+    registers, module_name = parse_xml(xml_file)
+    return {
+        "MODULE_NAME": module_name,
+        "REGISTERS": [
+            {"REG_NAME": reg.name, "OFFSET": reg.address, "ACCESS": reg.access, "DESC": reg.desc, "RESET_VALUE": reg.reset}
+            for reg in registers
+        ],
+    }
+
+
+# 解析 XML 文件，提供缓存时优先从缓存读取，返回值与 parse_xml 相同
+def load_xml(xml_file, cache=None):
+    if cache is None:
+        return parse_xml(xml_file)
+
+    model = cache.load(xml_file, parse_xml_model)
+    registers = [
+        Register(reg["REG_NAME"], reg["OFFSET"], type=XML_ACCESS_TYPES.get(reg["ACCESS"], reg["ACCESS"]),
+                 access=reg["ACCESS"], desc=reg["DESC"], reset=reg["RESET_VALUE"])
+        for reg in model["REGISTERS"]
+    ]
+    return RegisterMap(model["MODULE_NAME"], registers), model["MODULE_NAME"]
+
+
+# 检查按地址排序后的寄存器布局，返回未按 4 字节对齐、地址重叠和名称重复的错误信息列表
+def check_register_layout(registers):
+    errors = []
+    names = {}
+    prev = None
+    for reg in registers:
+        if reg.address % 4:
+            errors.append(f"寄存器 {reg.name} 的偏移 0x{reg.address:X} 未按 4 字节对齐")
+        if prev is not None and reg.address < prev.address + 4:
+            errors.append(f"寄存器 {reg.name}（偏移 0x{reg.address:X}）与 {prev.name}（偏移 0x{prev.address:X}）重叠")
+        if reg.name in names:
+            errors.append(f"寄存器名称 {reg.name} 重复（偏移 0x{names[reg.name]:X} 和 0x{reg.address:X}）")
+        names.setdefault(reg.name, reg.address)
+        prev = reg
+    return errors
 
 
 # 生成寄存器结构体 C 代码
+# 地址空洞生成一个 uint32_t RESERVEDn[N] 数组，并用 _Static_assert 检查每个成员的偏移和结构体大小
 def generate_struct_code(registers, module_name):
-    # 按偏移量排序寄存器
-    registers.sort(key=lambda x: int(x[1], 16))
+    # 按偏移量排序寄存器，排序后一次遍历检查对齐和重叠
+    registers = sorted(registers, key=lambda reg: reg.address)
+    errors = check_register_layout(registers)
+    if errors:
+        raise ValueError("寄存器布局错误：\n" + "\n".join(errors))
 
     code = f"#ifndef {module_name}_H\n"
     code += f"#define {module_name}_H\n\n"
+    code += "#include <stddef.h>\n\n"
     code += f"/*------------------------------- MODULE_NAME: {module_name} -----------------------*/\n\n"
     code += "typedef struct\n{\n"
 
-    prev_offset = 0
-    for i, (name, offset, access, _, _) in enumerate(registers):
-        current_offset = int(offset, 16)
-        if i > 0 and current_offset > prev_offset + 4:
-            # 计算需要插入的保留寄存器数量
-            num_reserved = (current_offset - prev_offset - 4) // 4
-            for j in range(num_reserved):
-                reserved_name = f"RESERVED_{prev_offset + 4 + j * 4:08X}"
-                code += f"    uint32_t {reserved_name}; /* Offset: 0x{prev_offset + 4 + j * 4:08X} (reserved) */\n"
+    next_offset = 0
+    reserved_index = 0
+    for reg in registers:
+        name, access = reg.name, reg.access
+        offset = f"0x{reg.address:X}"
+        if reg.address > next_offset:
+            # 地址空洞（包括第一个寄存器之前的空洞）用一个保留数组填充
+            num_reserved = (reg.address - next_offset) // 4
+            code += f"    uint32_t RESERVED{reserved_index}[{num_reserved}]; /* Offset: 0x{next_offset:08X} - 0x{reg.address - 1:08X} (reserved) */\n"
+            reserved_index += 1
 
         if access == "read-write":
             access_type = "_IO"
@@ -80,25 +122,38 @@ def generate_struct_code(registers, module_name):
         else:
             code += f"    uint32_t {name}; /* Offset: {offset} ({access}) */\n"
 
-        prev_offset = current_offset
+        next_offset = reg.address + 4
 
     code += f"}} {module_name}_TypeDef;\n\n"
 
-    for name, offset, _, _, _ in registers:
-        code += f"#define {module_name}_{name}_OFFSET ({offset})\n"
+    # 编译期检查结构体布局与寄存器偏移一致（C11 及以上）
+    code += "#if defined(__STDC_VERSION__) && __STDC_VERSION__ >= 201112L\n"
+    for reg in registers:
+        code += f"_Static_assert(offsetof({module_name}_TypeDef, {reg.name}) == 0x{reg.address:X}, \"{module_name}_TypeDef.{reg.name} offset\");\n"
+    code += f"_Static_assert(sizeof({module_name}_TypeDef) == 0x{next_offset:X}, \"{module_name}_TypeDef size\");\n"
+    code += "#endif\n\n"
+
+    for reg in registers:
+        code += f"#define {module_name}_{reg.name}_OFFSET (0x{reg.address:X})\n"
 
     code += f"\n#endif /* {module_name}_H */\n"
     return code
 
 
 # 生成寄存器读写属性测试 C 代码
-def generate_test_code(registers, module_name, base_address):
-    code = "#include <stdio.h>\n"
+# style 为 unrolled 时逐个寄存器展开测试代码，为 table 时生成 const 描述符表和一个测试循环
+# 定义 REG_HOST_EMULATION 编译时改用 {module_name}_host.h 中的 read_reg/write_reg，可以直接在主机上运行
+def generate_test_code(registers, module_name, base_address, style="unrolled"):
+    code = "#ifdef REG_HOST_EMULATION\n"
+    code += f"#include \"{module_name}_host.h\"\n"
+    code += "#endif\n"
+    code += "#include <stdio.h>\n"
     code += "#include <stdlib.h>\n"
     code += "#include <time.h>\n"
     code += f"#include \"{module_name}.h\"\n\n"
 
     # 定义 read_ahb32 和 write_ahb32 函数
+    code += "#ifndef REG_HOST_EMULATION\n"
     code += "unsigned long read_ahb32(unsigned long ahb_addr) {\n"
     code += "    volatile unsigned long retval;\n"
     code += "    retval = *(volatile unsigned long *)ahb_addr;\n"
@@ -114,38 +169,53 @@ def generate_test_code(registers, module_name, base_address):
     code += "}\n\n"
     code += "void write_reg(uint32_t address, uint32_t value) {\n"
     code += "    write_ahb32((unsigned long)address, (volatile unsigned long)value);\n"
-    code += "}\n\n"
-
-    code += "void test_register_access(uint32_t base_addr) {\n"
-    code += "    srand(time(NULL));\n"
-    for name, offset, access, _, reset_value in registers:
-        if access == "read-only":
-            code += f"    uint32_t rand_val = rand();\n"
-            code += f"    uint32_t reg_addr = base_addr + {offset};\n"
-            code += f"    write_reg(reg_addr, rand_val);\n"
-            code += f"    uint32_t read_val = read_reg(reg_addr);\n"
-            code += f"    if (read_val != {reset_value}) {{\n"
-            code += f"        printf(\"Error: Read - only register {name} write test failed!\\n\");\n"
-            code += "    }\n"
-        elif access == "read-write":
-            code += f"    uint32_t rand_val = rand();\n"
-            code += f"    uint32_t reg_addr = base_addr + {offset};\n"
-            code += f"    write_reg(reg_addr, rand_val);\n"
-            code += f"    uint32_t read_val = read_reg(reg_addr);\n"
-            code += f"    if (read_val != rand_val) {{\n"
-            code += f"        printf(\"Error: Read - write register {name} read - write test failed!\\n\");\n"
-            code += "    }\n"
-        elif access == "write-only":
-            code += f"    uint32_t rand_val = rand();\n"
-            code += f"    uint32_t reg_addr = base_addr + {offset};\n"
-            code += f"    write_reg(reg_addr, rand_val);\n"
-            code += f"    printf(\"Write - only register {name} written with value 0x%08X.\\n\", rand_val);\n"
-        elif access == "reserved":
-            code += f"    uint32_t reg_addr = base_addr + {offset};\n"
-            code += f"    uint32_t read_val = read_reg(reg_addr);\n"
-            code += f"    if (read_val != 0) {{\n"
-            code += f"        printf(\"Error: Reserved register {name} read test failed!\\n\");\n"
-            code += "    }\n"
+    code += "}\n"
+    code += "#endif\n\n"
+
+    if style == "table":
+        # 描述符表和测试循环与 json2ctest_reg 共用，代码大小与寄存器数量无关
+        code += "".join(iter_test_table(module_name, registers))
+        code += "void test_register_access(uint32_t base_addr) {\n"
+        code += "    srand(time(NULL));\n"
+        code += f"    {module_name}_run_reg_tests(base_addr);\n"
+    else:
+        code += "void test_register_access(uint32_t base_addr) {\n"
+        code += "    srand(time(NULL));\n"
+        # 变量在函数开头声明一次，每个寄存器只赋值，避免同一作用域内重复定义
+        code += "    uint32_t rand_val;\n"
+        code += "    uint32_t reg_addr;\n"
+        code += "    uint32_t read_val;\n"
+        for reg in registers:
+            name, access = reg.name, reg.access
+            offset = f"0x{reg.address:X}"
+            reset_value = f"0x{reg.reset:X}"
+            if access == "read-only":
+                code += f"    rand_val = rand();\n"
+                code += f"    reg_addr = base_addr + {offset};\n"
+                code += f"    write_reg(reg_addr, rand_val);\n"
+                code += f"    read_val = read_reg(reg_addr);\n"
+                code += f"    if (read_val != {reset_value}) {{\n"
+                code += f"        printf(\"Error: Read - only register {name} write test failed!\\n\");\n"
+                code += "    }\n"
+            elif access == "read-write":
+                code += f"    rand_val = rand();\n"
+                code += f"    reg_addr = base_addr + {offset};\n"
+                code += f"    write_reg(reg_addr, rand_val);\n"
+                code += f"    read_val = read_reg(reg_addr);\n"
+                code += f"    if (read_val != rand_val) {{\n"
+                code += f"        printf(\"Error: Read - write register {name} read - write test failed!\\n\");\n"
+                code += "    }\n"
+            elif access == "write-only":
+                code += f"    rand_val = rand();\n"
+                code += f"    reg_addr = base_addr + {offset};\n"
+                code += f"    write_reg(reg_addr, rand_val);\n"
+                code += f"    printf(\"Write - only register {name} written with value 0x%08X.\\n\", rand_val);\n"
+            elif access == "reserved":
+                code += f"    reg_addr = base_addr + {offset};\n"
+                code += f"    read_val = read_reg(reg_addr);\n"
+                code += f"    if (read_val != 0) {{\n"
+                code += f"        printf(\"Error: Reserved register {name} read test failed!\\n\");\n"
+                code += "    }\n"
     code += "    printf(\"All register access tests completed.\\n\");\n"
     code += "}\n\n"
     code += "int main() {\n"
@@ -156,29 +226,76 @@ def generate_test_code(registers, module_name, base_address):
     return code
 
 
+# 解析 XML 文件并写出结构体头文件和测试 C 代码，返回写出的文件路径
+# host_shim 为 True 时同时写出主机仿真头文件 {module_name}_host.h
+def xml_to_c(xml_file, base_address, output_dir=".", cache=None, metrics=NULL_METRICS, style="unrolled", host_shim=False):
+    with metrics.phase("parse"):
+        registers, module_name = load_xml(xml_file, cache)
+    metrics.count_registers(registers)
+
+    with metrics.phase("emit"):
+        struct_code = generate_struct_code(registers, module_name)
+        test_code = generate_test_code(registers, module_name, base_address, style)
+        host_code = "".join(iter_host_shim(module_name, registers, base_address)) if host_shim else None
+
+    outputs = [
+        (os.path.join(output_dir, f"{module_name}.h"), struct_code),
+        (os.path.join(output_dir, f"{module_name}_test.c"), test_code),
+    ]
+    if host_code is not None:
+        outputs.append((os.path.join(output_dir, f"{module_name}_host.h"), host_code))
+
+    os.makedirs(output_dir, exist_ok=True)
+    with metrics.phase("write"):
+        for path, code in outputs:
+            with open(path, "w") as f:
+                f.write(code)
+                metrics.count("bytes_written", f.tell())
+    metrics.count("files_written", len(outputs))
+
+    return tuple(path for path, _ in outputs)
+
+
 # 主函数
 def main():
-    xml_file = input("请输入 XML 文件的路径（若不输入，将使用脚本运行目录下的 XML 文件）: ")
+    parser = argparse.ArgumentParser(description="将 IPXACT 格式的 XML 文件转换为寄存器结构体头文件和测试 C 代码。")
+    parser.add_argument("xml_file", nargs="?", help="XML 文件的路径。如果省略，则交互输入或使用脚本运行目录下的 XML 文件。", default=None)
+    parser.add_argument("--base_address", help="寄存器基地址（十六进制，如 0x10000000）。如果省略，则交互输入。", default=None)
+    parser.add_argument("--output_dir", help="输出目录，默认为当前目录", default=".")
+    parser.add_argument("--test_style", choices=TEST_STYLES, help="测试代码风格：unrolled 逐个寄存器展开，table 生成描述符表和测试循环，默认为 unrolled", default="unrolled")
+    parser.add_argument("--host_shim", action="store_true", help="同时生成主机仿真头文件 MODULE_NAME_host.h，测试代码以 -DREG_HOST_EMULATION 编译后可在 Linux 主机上运行")
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+    metrics = metrics_from_args("xml_to_struct_and_test", args)
+
+    # 仅在终端中运行且缺少参数时才提示输入，脚本和批处理调用不会阻塞
+    interactive = sys.stdin.isatty()
+
+    xml_file = args.xml_file
+    if xml_file is None and interactive:
+        xml_file = input("请输入 XML 文件的路径（若不输入，将使用脚本运行目录下的 XML 文件）: ")
     if not xml_file:
         current_dir = os.getcwd()
-        xml_files = [f for f in os.listdir(current_dir) if f.endswith('.xml')]
+        xml_files = sorted(f for f in os.listdir(current_dir) if f.endswith('.xml'))
         if not xml_files:
             print("脚本运行目录下未找到 XML 文件，请手动指定文件路径。")
             return
         xml_file = os.path.join(current_dir, xml_files[0])
 
-    base_address = input("请输入寄存器基地址（十六进制，如 0x10000000）: ")
-
-    registers, module_name = parse_xml(xml_file)
-
-    struct_code = generate_struct_code(registers, module_name)
-    test_code = generate_test_code(registers, module_name, base_address)
-
-    with open(f"{module_name}.h", "w") as f:
-        f.write(struct_code)
-
-    with open(f"{module_name}_test.c", "w") as f:
-        f.write(test_code)
+    base_address = args.base_address
+    if base_address is None and interactive:
+        base_address = input("请输入寄存器基地址（十六进制，如 0x10000000）: ")
+    if not base_address:
+        base_address = "0x10000000"
+
+    try:
+        xml_to_c(xml_file, base_address, args.output_dir, metrics=metrics, style=args.test_style, host_shim=args.host_shim)
+    except ValueError as e:
+        # 寄存器重叠、未对齐或名称重复时逐条输出错误信息
+        for line in str(e).splitlines():
+            logging.error(line)
+        sys.exit(1)
+    metrics.finish()
 
 
 if __name__ == "__main__":